@@ -0,0 +1,68 @@
+"""
+Compare the strptime/strftime timestamp round-trip
+used before with the integer-millisecond codec.
+
+Run from the project home directory:
+
+    python -m benchmarks.bench_timestamp
+"""
+
+import datetime
+import timeit
+
+from sublib import timestamp
+
+
+SRT = "01:02:03,045"
+DELTA = datetime.timedelta(hours=1, minutes=2, seconds=3, milliseconds=45)
+
+
+def strptime_parse(text: str) -> datetime.timedelta:
+    time = datetime.datetime.strptime(text, "%H:%M:%S,%f")
+    return datetime.timedelta(
+        hours=time.hour,
+        minutes=time.minute,
+        seconds=time.second,
+        microseconds=time.microsecond
+    )
+
+
+def strftime_format(delta: datetime.timedelta) -> str:
+    text = str(delta)
+    if len(text) == 7:
+        text = text + "." + "".zfill(6)
+    time = datetime.datetime.strptime(text, "%H:%M:%S.%f")
+    text = time.strftime("%H:%M:%S.%f").replace(".", ",")
+    return text[:len(text) - 3]
+
+
+def codec_parse(text: str) -> datetime.timedelta:
+    return timestamp.from_ms(timestamp.parse_srt(text))
+
+
+def codec_format(delta: datetime.timedelta) -> str:
+    return timestamp.format_srt(timestamp.to_ms(delta))
+
+
+def measure(func, arg, number: int) -> float:
+    return min(timeit.repeat(lambda: func(arg), number=number, repeat=5))
+
+
+def main(number: int = 100000) -> None:
+    assert strptime_parse(SRT) == codec_parse(SRT)
+    assert strftime_format(DELTA) == codec_format(DELTA)
+    for name, old, new, arg in (
+        ("parse", strptime_parse, codec_parse, SRT),
+        ("format", strftime_format, codec_format, DELTA),
+    ):
+        old_time = measure(old, arg, number)
+        new_time = measure(new, arg, number)
+        print(
+            f"{name:<7}strptime {old_time / number * 1e6:7.3f} us  "
+            f"codec {new_time / number * 1e6:7.3f} us  "
+            f"speedup {old_time / new_time:5.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Synthetic subtitle files of every format,
+with styling tags and multi-line lines.
+"""
+
+import random
+
+import sublib
+
+
+STYLES = {
+    "mpl": ("/{}", "{}"),
+    "srt": ("<i>{}</i>", "<b>{}</b>", "{{\\an8}}{}", "{}"),
+    "sub": ("{{y:i}}{}", "{{c:$0000FF}}{}", "{}"),
+    "tmp": ("{}",)
+}
+
+WORDS = (
+    "where", "were", "you", "last", "night", "home", "sweet", "again",
+    "never", "always", "tomorrow", "why", "because", "listen", "look"
+)
+
+
+def iter_lines(fmt: str, count: int, seed: int = 0):
+    """
+    Yield lines in general format, in milliseconds.
+
+    Parameters
+    ----------
+    fmt
+        Format name, styling tags depend on it.
+    count
+        Number of lines.
+    seed
+        Seed of the random generator.
+
+    Returns
+    ----------
+    Iterator of (start ms, end ms, text) tuples.
+    """
+    generator = random.Random(seed)
+    styles = STYLES[fmt]
+    start = 0
+    for _ in range(count):
+        start += generator.randrange(1000, 4000)
+        parts = [
+            generator.choice(styles).format(
+                " ".join(generator.choices(WORDS, k=generator.randint(2, 7)))
+            )
+            for _ in range(generator.randint(1, 2))
+        ]
+        yield start, start + generator.randrange(800, 3000), "|".join(parts)
+
+
+def write(path: str, fmt: str, count: int, seed: int = 0) -> None:
+    """
+    Write a synthetic subtitle file.
+
+    Parameters
+    ----------
+    path
+        Path of the file to write.
+    fmt
+        Format name, e.g. "srt".
+    count
+        Number of lines.
+    seed
+        Seed of the random generator.
+
+    Returns
+    ----------
+    None
+    """
+    writer = sublib.FORMATS[fmt](encoding="utf-8")
+    writer.write_cues(iter_lines(fmt, count, seed), path)
@@ -0,0 +1,180 @@
+"""
+Throughput and peak memory of detection,
+parsing, writing and conversion.
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import sublib
+
+from benchmarks import generate
+
+
+def _stages(fmt: str, source: str, directory: str) -> dict:
+    """
+    Get functions of every measured stage.
+
+    Parameters
+    ----------
+    fmt
+        Format name of the source file.
+    source
+        Path to the source file.
+    directory
+        Directory for written files.
+
+    Returns
+    ----------
+    Stage names mapped to functions returning
+    the number of processed lines.
+    """
+    cls = sublib.FORMATS[fmt]
+    target = "sub" if fmt == "srt" else "srt"
+    general = cls(source, "utf-8").get_general_format()
+
+    def detect():
+        assert sublib.detect(source, "utf-8") == fmt
+        return 0
+
+    def parse():
+        return len(cls(source, "utf-8").get_general_format())
+
+    def write():
+        subtitle = cls(encoding="utf-8")
+        subtitle.set_from_general_format(general)
+        subtitle.save(os.path.join(directory, "write" + cls.extension))
+        return len(general)
+
+    def convert():
+        return sublib.convert(
+            source, os.path.join(directory, "convert"), target, "utf-8"
+        )
+
+    return {
+        "detect": detect,
+        "parse": parse,
+        "write": write,
+        "convert": convert
+    }
+
+
+def measure(func, repeat: int) -> dict:
+    """
+    Measure the best wall time of a function
+    and its peak traced memory.
+
+    Parameters
+    ----------
+    func
+        Function returning the number of processed lines.
+    repeat
+        Number of timed runs.
+
+    Returns
+    ----------
+    Seconds, lines per second and peak bytes.
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        lines = func()
+        best = min(best, time.perf_counter() - started)
+    tracemalloc.start()
+    try:
+        func()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return {
+        "seconds": best,
+        "lines_per_second": lines / best if lines else None,
+        "peak_bytes": peak
+    }
+
+
+def run(formats: list, counts: list, repeat: int = 3) -> dict:
+    """
+    Run the suite on synthetic files.
+
+    Parameters
+    ----------
+    formats
+        Format names.
+    counts
+        Numbers of lines of generated files.
+    repeat
+        Number of timed runs of every stage.
+
+    Returns
+    ----------
+    Machine-readable results.
+    """
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        for fmt in formats:
+            for count in counts:
+                source = os.path.join(
+                    directory, f"{count}{sublib.FORMATS[fmt].extension}"
+                )
+                generate.write(source, fmt, count)
+                size = os.path.getsize(source)
+                for stage, func in _stages(fmt, source, directory).items():
+                    result = measure(func, repeat)
+                    result.update(
+                        format=fmt, lines=count, bytes=size, stage=stage,
+                        bytes_per_second=size / result["seconds"]
+                    )
+                    results.append(result)
+                os.remove(source)
+    return {
+        "sublib": sublib.__version__,
+        "python": sys.version.split()[0],
+        "repeat": repeat,
+        "results": results
+    }
+
+
+def main(argv: list = None) -> int:
+    """
+    Run the suite from the command line.
+
+    Parameters
+    ----------
+    argv
+        Command line arguments, sys.argv when omitted.
+
+    Returns
+    ----------
+    Exit status.
+    """
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks",
+        description="Measure sublib throughput and peak memory."
+    )
+    parser.add_argument(
+        "--formats", nargs="+", default=list(sublib.FORMATS),
+        choices=list(sublib.FORMATS)
+    )
+    parser.add_argument(
+        "--cues", nargs="+", type=int, default=[1000, 10000],
+        help="lines of generated files (default: %(default)s)"
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument(
+        "--output", help="JSON file to write, stdout when omitted"
+    )
+    args = parser.parse_args(argv)
+    report = run(args.formats, args.cues, args.repeat)
+    if args.output:
+        with open(args.output, "wt", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    return 0
@@ -9,11 +9,72 @@ VARIABLES
     __version__
         Contains the package version.
 
+    FORMATS
+        Maps format names to their classes.
+
+MODULES
+
+    timestamp
+        Integer-millisecond timestamp codec.
+
+    aio
+        Asyncio file conversion helpers.
+
+    binary
+        Versioned binary track format:
+        dump, dumps, load.
+
+    charset
+        Encoding detection: sniff, decode.
+
+    cache
+        On-disk parse cache: ParseCache.
+
+    markup
+        Styling markup tokenizer:
+        strip, spans, Span.
+
+    metrics
+        Per-stage timing and counters:
+        collect, add_hook, remove_hook, Metrics.
+
+    mapped
+        Memory-mapped reader: MappedTrack.
+
+    snapshot
+        Immutable copy-on-write lines:
+        TrackSnapshot.
+
+    search
+        Full-text index of lines: TextIndex,
+        MappedTextIndex, Hit, tokenize.
+
+    fingerprint
+        Duplicate track detection: fingerprint,
+        similarity, DuplicateIndex.
+
+    merge
+        K-way merge of tracks: merge, merge_to.
+
+    cli
+        Command line interface, also run by
+        "python -m sublib" and "sublib-convert".
+
 FUNCTONS
 
-    detect(path, encoding)
+    detect(path, encoding, size)
         Specifies the subtitle format.
 
+    detect_scores(path, encoding, size)
+        Score every known format.
+
+    convert(source, target, to, encoding, target_encoding, source_format)
+        Convert a subtitle file to another format.
+
+    load(path, encoding, fmt, **kwargs)
+        Read a subtitle file once, detecting
+        its encoding and format.
+
 CLASSES
 
     Subtitle(builtins.object)
@@ -30,8 +91,19 @@ CLASSES
 
     TMPlayer(Subtitle)
         Represent TMPlayer subtitle format.
+
+    CueTable(builtins.object)
+        Compact storage of lines in general format.
+
+    CueIndex(builtins.object)
+        Time-interval index of lines.
 """
 
-from sublib.sublib import detect, Subtitle, MPlayer2, SubRip, MicroDVD, TMPlayer
+from sublib.cuetable import CueTable
+from sublib.intervals import CueIndex
+from sublib.sublib import (
+    FORMATS, detect, detect_scores, convert, load,
+    Subtitle, MPlayer2, SubRip, MicroDVD, TMPlayer
+)
 
 __version__ = "1.2.1"
@@ -0,0 +1,89 @@
+"""
+Asyncio helpers offloading file
+conversion to executors.
+"""
+
+import asyncio
+import functools
+
+from sublib.sublib import convert
+
+
+async def aconvert(source: str, target: str, to, encoding: str = "utf-8",
+                   target_encoding: str = "", source_format=None,
+                   executor=None) -> int:
+    """
+    Convert a subtitle file to another format
+    in an executor, without blocking the event loop.
+
+    Parameters
+    ----------
+    source
+        Path to a textual subtitle file.
+    target
+        Path of the file to write.
+    to
+        Target format name, class or instance.
+    encoding
+        Representation of source encoding type.
+    target_encoding
+        Representation of target encoding type.
+    source_format
+        Source format name, class or instance,
+        detected when omitted.
+    executor
+        concurrent.futures executor, e.g. a process
+        pool for CPU-bound work, default one of the
+        loop when omitted.
+
+    Returns
+    ----------
+    Number of converted lines.
+    """
+    loop = asyncio.get_event_loop()
+    return await loop.run_in_executor(executor, functools.partial(
+        convert, source, target, to, encoding, target_encoding, source_format
+    ))
+
+
+async def aconvert_all(pairs, to, encoding: str = "utf-8",
+                       target_encoding: str = "", concurrency: int = 4,
+                       executor=None) -> list:
+    """
+    Convert many files, running at most
+    a given number of conversions at once.
+
+    Parameters
+    ----------
+    pairs
+        Iterable of (source, target) paths.
+    to
+        Target format name, class or instance.
+    encoding
+        Representation of source encoding type.
+    target_encoding
+        Representation of target encoding type.
+    concurrency
+        Maximum number of running conversions.
+    executor
+        concurrent.futures executor,
+        default one of the loop when omitted.
+
+    Returns
+    ----------
+    Number of converted lines or the raised
+    exception, for every pair in order.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def bounded(source, target):
+        async with semaphore:
+            return await aconvert(
+                source, target, to, encoding, target_encoding,
+                executor=executor
+            )
+
+    return await asyncio.gather(
+        *(bounded(source, target) for source, target in pairs),
+        return_exceptions=True
+    )
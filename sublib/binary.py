@@ -0,0 +1,317 @@
+"""
+Versioned binary format of parsed tracks,
+loadable without copying through mmap.
+
+Layout, little-endian:
+
+    magic      4 bytes   b"SLBT"
+    version    uint16
+    reserved   uint16
+    count      uint64    number of lines
+    starts     int64 * count, milliseconds
+    ends       int64 * count, milliseconds
+    offsets    int64 * (count + 1), into the text blob
+    texts      UTF-8 blob
+"""
+
+import mmap
+import struct
+import sys
+from array import array
+
+from sublib.cuetable import CueTable
+
+
+VERSION = 1
+
+_MAGIC = b"SLBT"
+
+_HEADER = struct.Struct("<4sHH")
+
+_COUNT = struct.Struct("<Q")
+
+_OFFSET = struct.Struct("<q")
+
+
+def dumps(lines) -> bytes:
+    """
+    Serialize lines to the binary format.
+
+    Parameters
+    ----------
+    lines
+        Lines in general format or a CueTable.
+
+    Returns
+    ----------
+    Serialized track.
+    """
+    if not isinstance(lines, CueTable):
+        lines = CueTable(lines)
+    return _HEADER.pack(_MAGIC, VERSION, 0) + lines.to_bytes()
+
+
+def dump(lines, target) -> None:
+    """
+    Write lines in the binary format.
+
+    Parameters
+    ----------
+    lines
+        Lines in general format or a CueTable.
+    target
+        Path or binary file open for writing.
+
+    Returns
+    ----------
+    None
+    """
+    data = dumps(lines)
+    if hasattr(target, "write"):
+        target.write(data)
+    else:
+        with open(target, "wb") as f:
+            f.write(data)
+
+
+def load(source, copy: bool = False) -> CueTable:
+    """
+    Read lines in the binary format.
+
+    Parameters
+    ----------
+    source
+        Path, binary file or bytes-like object.
+    copy
+        Whether to copy columns into memory,
+        otherwise they are views of the source
+        and texts are decoded on access.
+
+    Returns
+    ----------
+    Lines in general format as a CueTable, or a
+    MappedTable when a path is mapped without
+    copying, to be closed when no longer needed.
+    """
+    if isinstance(source, (bytes, bytearray, memoryview, mmap.mmap)):
+        return _table(memoryview(source), copy)
+    if hasattr(source, "read"):
+        return _table(memoryview(source.read()), copy)
+    with open(source, "rb") as f:
+        if copy:
+            return _table(memoryview(f.read()), True)
+        try:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            return _table(memoryview(b""), True)
+    table = MappedTable()
+    table._map = mapped
+    table._views = [memoryview(mapped)]
+    try:
+        _table(table._views[0], False, table)
+    except Exception:
+        table.close()
+        raise
+    return table
+
+
+def _table(data: memoryview, copy: bool, table=None) -> CueTable:
+    """
+    Check a serialized track and build its table.
+
+    Parameters
+    ----------
+    data
+        Whole serialized track.
+    copy
+        Whether to copy columns into memory,
+        then all text offsets are checked too.
+    table
+        Empty MappedTable to fill, a new CueTable
+        when omitted; views of data are kept
+        in its _views list.
+
+    Returns
+    ----------
+    Lines in general format as a CueTable.
+    """
+    if len(data) < _HEADER.size + _COUNT.size:
+        raise ValueError("Not a sublib binary track")
+    magic, version, _ = _HEADER.unpack_from(data)
+    if magic != _MAGIC:
+        raise ValueError("Not a sublib binary track")
+    if version > VERSION:
+        raise ValueError(f"Unsupported binary track version: {version}")
+    count = _COUNT.unpack_from(data, _HEADER.size)[0]
+    columns = _HEADER.size + _COUNT.size
+    blob = columns + (3 * count + 1) * 8
+    if blob > len(data):
+        raise ValueError(f"Truncated binary track: {count} lines expected")
+    first = _OFFSET.unpack_from(data, blob - 8 * (count + 1))[0]
+    last = _OFFSET.unpack_from(data, blob - 8)[0]
+    if first != 0 or last < 0 or blob + last > len(data):
+        raise ValueError("Truncated binary track: text offsets out of range")
+    if copy or sys.byteorder != "little":
+        offsets = array("q")
+        offsets.frombytes(data[blob - 8 * (count + 1):blob])
+        if sys.byteorder == "big":
+            offsets.byteswap()
+        if any(end < start for start, end in zip(offsets, offsets[1:])):
+            raise ValueError(
+                "Truncated binary track: text offsets out of range"
+            )
+        return CueTable.from_bytes(data[_HEADER.size:])
+    ints = data[columns:blob].cast("q")
+    if table is None:
+        table = CueTable()
+    table.starts = ints[:count]
+    table.ends = ints[count:2 * count]
+    table.texts = TextColumn(data[blob:], ints[2 * count:])
+    if isinstance(table, MappedTable):
+        table._views.extend((
+            ints, table.starts, table.ends,
+            table.texts.blob, table.texts.offsets
+        ))
+    return table
+
+
+class MappedTable(CueTable):
+    """
+    CueTable whose columns are views
+    of a memory-mapped binary track.
+
+    Note
+    ----------
+    The file stays open, and locked on Windows,
+    until close() is called or the "with" block
+    is left; the table must not be used then.
+    """
+
+    __slots__ = ("_map", "_views")
+
+    def __enter__(self) -> "MappedTable":
+        """
+        Specifies "with" statement behavior.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        ----------
+        Itself.
+        """
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        """
+        Release the mapped file
+        when leaving "with" block.
+
+        Parameters
+        ----------
+        exc_info
+            Exception details, if raised.
+
+        Returns
+        ----------
+        None
+        """
+        self.close()
+
+    def close(self) -> None:
+        """
+        Release the mapped file, columns
+        copied by a change stay usable.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        ----------
+        None
+        """
+        for view in reversed(getattr(self, "_views", ())):
+            view.release()
+        self._views = []
+        mapped = getattr(self, "_map", None)
+        if mapped is not None:
+            mapped.close()
+            self._map = None
+
+
+class TextColumn:
+    """
+    Read-only sequence of texts decoded
+    from a UTF-8 blob on access.
+    """
+
+    __slots__ = ("blob", "offsets")
+
+    def __init__(self, blob: memoryview, offsets) -> None:
+        """
+        Construct a class instance.
+
+        Parameters
+        ----------
+        blob
+            UTF-8 encoded texts, one after another.
+        offsets
+            Start of every text in the blob,
+            followed by the end of the last one.
+
+        Returns
+        ----------
+        None
+        """
+        self.blob = blob
+        self.offsets = offsets
+
+    def __len__(self) -> int:
+        """
+        Specifies what len() return.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        ----------
+        Number of texts.
+        """
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index):
+        """
+        Get a text or a list of texts.
+
+        Parameters
+        ----------
+        index
+            Text number or slice.
+
+        Returns
+        ----------
+        Decoded text or list of them.
+        """
+        if isinstance(index, slice):
+            return [self[number] for number in range(len(self))[index]]
+        index = range(len(self))[index]
+        start, end = self.offsets[index], self.offsets[index + 1]
+        return str(self.blob[start:end], "utf-8")
+
+    def __iter__(self):
+        """
+        Iterate over decoded texts.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        ----------
+        Iterator of texts.
+        """
+        for number in range(len(self)):
+            yield self[number]
@@ -0,0 +1,235 @@
+"""
+Opt-in on-disk cache of detected
+formats and parsed lines.
+"""
+
+import contextlib
+import hashlib
+import os
+import struct
+import tempfile
+
+from sublib.cuetable import CueTable
+from sublib.sublib import FORMATS, detect
+
+
+_MAGIC = b"SLC1"
+
+_SUFFIX = ".slc"
+
+
+class ParseCache:
+    """
+    Cache parsed subtitle files in a directory.
+
+    Note
+    ----------
+    Entries are keyed by absolute path, size,
+    modification time and encoding, so a changed
+    file is parsed again. The least recently used
+    entries are removed when the directory grows
+    over its size limit.
+    """
+
+    def __init__(self, directory: str,
+                 max_bytes: int = 256 * 1024 * 1024) -> None:
+        """
+        Construct a class instance.
+
+        Parameters
+        ----------
+        directory
+            Cache directory, created when missing.
+        max_bytes
+            Size limit of all entries.
+
+        Returns
+        ----------
+        None
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+
+    def __repr__(self) -> str:
+        """
+        Specifies how repr() is displayed.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        ----------
+        ParseCache(directory="directory", max_bytes=max_bytes)
+        """
+        return f'{self.__class__.__name__}'\
+               f'(directory="{self.directory}", max_bytes={self.max_bytes})'
+
+    def load(self, path: str, encoding: str = "utf-8") -> tuple:
+        """
+        Get the format and lines of a file,
+        parsing it only when not cached.
+
+        Parameters
+        ----------
+        path
+            Path to a textual subtitle file.
+        encoding
+            Representation of encoding type.
+
+        Returns
+        ----------
+        (format name, CueTable) tuple.
+        """
+        entry = self._entry(path, encoding)
+        cached = self._read(entry)
+        if cached is not None:
+            return cached
+        fmt = detect(path, encoding)
+        if fmt not in FORMATS:
+            raise ValueError(f"Unsupported subtitle format: '{fmt}'")
+        table = FORMATS[fmt](path, encoding).get_general_format()
+        self._store(entry, _MAGIC + fmt.encode("ascii") + table.to_bytes())
+        return fmt, table
+
+    def clear(self) -> None:
+        """
+        Remove all entries.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        ----------
+        None
+        """
+        for entry in self._entries():
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(entry.path)
+
+    def size(self) -> int:
+        """
+        Get the size of all entries.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        ----------
+        Number of bytes.
+        """
+        return sum(entry.stat().st_size for entry in self._entries())
+
+    def _entry(self, path: str, encoding: str) -> str:
+        """
+        Get the entry path of a file.
+
+        Parameters
+        ----------
+        path
+            Path to a textual subtitle file.
+        encoding
+            Representation of encoding type.
+
+        Returns
+        ----------
+        Path of the cache entry.
+        """
+        path = os.path.abspath(path)
+        stat = os.stat(path)
+        key = f"{path}\0{stat.st_size}\0{stat.st_mtime_ns}\0{encoding}"
+        digest = hashlib.sha1(key.encode("utf-8", "surrogatepass"))
+        return os.path.join(self.directory, digest.hexdigest() + _SUFFIX)
+
+    def _entries(self) -> list:
+        """
+        Get all entries of the directory.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        ----------
+        os.DirEntry objects.
+        """
+        with os.scandir(self.directory) as entries:
+            return [
+                entry for entry in entries
+                if entry.name.endswith(_SUFFIX) and entry.is_file()
+            ]
+
+    def _read(self, entry: str):
+        """
+        Decode an entry, removing it when corrupt.
+
+        Parameters
+        ----------
+        entry
+            Path of the cache entry.
+
+        Returns
+        ----------
+        (format name, CueTable) tuple,
+        None when missing or corrupt.
+        """
+        try:
+            with open(entry, "rb") as f:
+                data = f.read()
+        except FileNotFoundError:
+            return None
+        try:
+            if data[:4] != _MAGIC:
+                raise ValueError("Invalid cache entry")
+            fmt = data[4:7].decode("ascii")
+            if fmt not in FORMATS:
+                raise ValueError(f"Unsupported subtitle format: '{fmt}'")
+            table = CueTable.from_bytes(memoryview(data)[7:])
+        except (ValueError, struct.error, UnicodeDecodeError):
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(entry)
+            return None
+        os.utime(entry)
+        return fmt, table
+
+    def _store(self, entry: str, data: bytes) -> None:
+        """
+        Write an entry atomically and
+        evict the least recently used ones.
+
+        Parameters
+        ----------
+        entry
+            Path of the cache entry.
+        data
+            Entry content.
+
+        Returns
+        ----------
+        None
+        """
+        if len(data) > self.max_bytes:
+            return
+        handle, temporary = tempfile.mkstemp(dir=self.directory)
+        try:
+            with os.fdopen(handle, "wb") as f:
+                f.write(data)
+            os.replace(temporary, entry)
+        except BaseException:
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(temporary)
+            raise
+        entries = sorted(
+            self._entries(), key=lambda item: item.stat().st_mtime_ns
+        )
+        total = sum(item.stat().st_size for item in entries)
+        for item in entries:
+            if total <= self.max_bytes:
+                break
+            if item.path != entry:
+                total -= item.stat().st_size
+                with contextlib.suppress(FileNotFoundError):
+                    os.remove(item.path)
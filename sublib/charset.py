@@ -0,0 +1,154 @@
+"""
+Encoding detection from a bounded
+sample of raw bytes.
+"""
+
+import codecs
+import collections
+import functools
+import unicodedata
+
+
+CANDIDATES = ("utf-8", "cp1250", "cp1252", "iso-8859-2", "cp1251")
+
+SNIFF_SIZE = 64 * 1024
+
+_BOMS = (
+    (codecs.BOM_UTF32_LE, "utf-32"),
+    (codecs.BOM_UTF32_BE, "utf-32"),
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16")
+)
+
+_PROBES = (b"\xc3\xa9", b"\x83\x41", b"\xa4\xa2", b"\x81\x40")
+
+_HIGH_BYTES = bytes(range(128, 256))
+
+
+def sniff(data, candidates=CANDIDATES, size: int = SNIFF_SIZE) -> str:
+    """
+    Guess the encoding of raw bytes.
+
+    Parameters
+    ----------
+    data
+        Bytes-like object, only its
+        first "size" bytes are inspected.
+    candidates
+        Encodings tried in order.
+    size
+        Maximum number of bytes to inspect.
+
+    Returns
+    ----------
+    Encoding name.
+
+    Note
+    ----------
+    A byte order mark decides first. Otherwise the
+    first candidate decoding the sample strictly is
+    taken, unless it is a single-byte codepage: all
+    such codepages decoding the sample are ranked by
+    the frequency of bytes above 127 which they map
+    to letters rather than symbols or controls.
+    The first candidate is returned when none fits.
+    """
+    sample = bytes(data[:size])
+    for bom, name in _BOMS:
+        if sample.startswith(bom):
+            return name
+    final = len(sample) < size
+    counts = None
+    best, best_score = None, None
+    for name in candidates:
+        try:
+            codecs.getincrementaldecoder(name)().decode(sample, final)
+        except UnicodeDecodeError:
+            continue
+        if not _single_byte(name):
+            return name
+        if counts is None:
+            counts = collections.Counter(
+                byte for byte in sample if byte > 127
+            )
+        score = sum(
+            count * _weights(name)[byte - 128]
+            for byte, count in counts.items()
+        )
+        if best is None or score > best_score:
+            best, best_score = name, score
+    return best or candidates[0]
+
+
+def decode(data, encoding: str) -> str:
+    """
+    Decode raw bytes, marking undecodable
+    ones instead of dropping them.
+
+    Parameters
+    ----------
+    data
+        Bytes-like object.
+    encoding
+        Encoding name, "auto" to sniff it.
+
+    Returns
+    ----------
+    Decoded text.
+    """
+    if encoding == "auto":
+        encoding = sniff(data)
+    return str(data, encoding, "replace")
+
+
+@functools.lru_cache(maxsize=None)
+def _single_byte(name: str) -> bool:
+    """
+    Check whether an encoding maps every
+    byte to at most one character.
+
+    Parameters
+    ----------
+    name
+        Encoding name.
+
+    Returns
+    ----------
+    Whether it is a single-byte codepage.
+    """
+    return all(
+        len(probe.decode(name, "replace")) == len(probe)
+        for probe in _PROBES
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def _weights(name: str) -> tuple:
+    """
+    Score characters of bytes above 127
+    in a single-byte codepage.
+
+    Parameters
+    ----------
+    name
+        Encoding name.
+
+    Returns
+    ----------
+    128 weights: letters 1, punctuation 0,
+    other symbols -1, controls and
+    undefined bytes -3.
+    """
+    weights = []
+    for char in _HIGH_BYTES.decode(name, "replace"):
+        category = unicodedata.category(char)[0]
+        if char == "\ufffd" or category == "C":
+            weights.append(-3)
+        elif category == "L":
+            weights.append(1)
+        elif category == "P":
+            weights.append(0)
+        else:
+            weights.append(-1)
+    return tuple(weights)
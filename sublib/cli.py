@@ -0,0 +1,185 @@
+"""
+Command line interface converting
+whole directories of subtitle files.
+"""
+
+import argparse
+import concurrent.futures
+import os
+import sys
+import time
+
+from sublib.sublib import FORMATS, convert
+
+
+def find_files(paths: list) -> list:
+    """
+    Collect subtitle files from given
+    files and directories, recursively.
+
+    Parameters
+    ----------
+    paths
+        Paths to files or directories.
+
+    Returns
+    ----------
+    (root directory, file path) pairs.
+    """
+    extensions = {cls.extension for cls in FORMATS.values()}
+    found = []
+    for path in paths:
+        if not os.path.isdir(path):
+            found.append((os.path.dirname(path), path))
+            continue
+        for directory, _, names in os.walk(path):
+            found.extend(
+                (path, os.path.join(directory, name))
+                for name in sorted(names)
+                if os.path.splitext(name)[1].lower() in extensions
+            )
+    return found
+
+
+def convert_file(task: tuple) -> tuple:
+    """
+    Convert a single file, catching errors.
+
+    Parameters
+    ----------
+    task
+        (source, target, to, encoding, target_encoding) tuple.
+
+    Returns
+    ----------
+    (source, number of lines, error message or None) tuple.
+    """
+    source, target, to, encoding, target_encoding = task
+    try:
+        os.makedirs(os.path.dirname(target) or ".", exist_ok=True)
+        count = convert(source, target, to, encoding, target_encoding)
+    except Exception as error:
+        return source, 0, f"{error.__class__.__name__}: {error}"
+    return source, count, None
+
+
+def _tasks(args: argparse.Namespace) -> tuple:
+    """
+    Build conversion tasks from parsed arguments.
+
+    Parameters
+    ----------
+    args
+        Parsed command line arguments.
+
+    Returns
+    ----------
+    (tasks for convert_file(), failed results) tuple,
+    a source whose target is already the target of
+    an earlier one fails instead of overwriting it.
+    """
+    extension = FORMATS[args.to].extension
+    tasks = []
+    failed = []
+    targets = {}
+    for root, source in find_files(args.paths):
+        name = os.path.splitext(os.path.relpath(source, root or "."))[0]
+        target = os.path.join(args.output, name + extension)
+        key = os.path.normcase(os.path.abspath(target))
+        if key in targets:
+            failed.append((source, 0, (
+                f"ValueError: target {target} is already "
+                f"written from {targets[key]}"
+            )))
+            continue
+        targets[key] = source
+        tasks.append(
+            (source, target, args.to, args.encoding, args.target_encoding)
+        )
+    return tasks, failed
+
+
+def _parser() -> argparse.ArgumentParser:
+    """
+    Build the command line parser.
+
+    Parameters
+    ----------
+    None
+
+    Returns
+    ----------
+    Argument parser.
+    """
+    parser = argparse.ArgumentParser(
+        prog="sublib-convert",
+        description="Convert subtitle files, detecting their formats."
+    )
+    parser.add_argument(
+        "paths", nargs="+",
+        help="subtitle files or directories searched recursively"
+    )
+    parser.add_argument(
+        "-t", "--to", required=True, choices=sorted(FORMATS),
+        help="target format"
+    )
+    parser.add_argument(
+        "-o", "--output", required=True,
+        help="directory of converted files, keeps the source layout"
+    )
+    parser.add_argument(
+        "-e", "--encoding", default="utf-8",
+        help="source encoding, \"auto\" to detect it (default: %(default)s)"
+    )
+    parser.add_argument(
+        "--target-encoding", default="",
+        help="target encoding (default: same as source)"
+    )
+    parser.add_argument(
+        "-j", "--jobs", type=int, default=os.cpu_count() or 1,
+        help="worker processes, 1 converts in this process "
+             "(default: %(default)s)"
+    )
+    parser.add_argument(
+        "--chunksize", type=int, default=64,
+        help="files sent to a worker at once (default: %(default)s)"
+    )
+    return parser
+
+
+def main(argv: list = None) -> int:
+    """
+    Run the command line interface.
+
+    Parameters
+    ----------
+    argv
+        Command line arguments, sys.argv when omitted.
+
+    Returns
+    ----------
+    Exit status, 1 if any file failed.
+    """
+    args = _parser().parse_args(argv)
+    tasks, collisions = _tasks(args)
+    started = time.perf_counter()
+    if args.jobs > 1 and len(tasks) > 1:
+        with concurrent.futures.ProcessPoolExecutor(args.jobs) as executor:
+            results = list(executor.map(
+                convert_file, tasks, chunksize=max(args.chunksize, 1)
+            ))
+    else:
+        results = [convert_file(task) for task in tasks]
+    results.extend(collisions)
+    elapsed = max(time.perf_counter() - started, 1e-9)
+    failed = [(source, error) for source, _, error in results if error]
+    for source, error in failed:
+        print(f"{source}: {error}", file=sys.stderr)
+    cues = sum(count for _, count, _ in results)
+    converted = len(results) - len(failed)
+    print(
+        f"{converted} converted, {len(failed)} failed, {cues} lines "
+        f"in {elapsed:.2f} s ({converted / elapsed:.1f} files/s, "
+        f"{cues / elapsed:.1f} lines/s)"
+    )
+    return 1 if failed else 0
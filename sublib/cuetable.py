@@ -0,0 +1,664 @@
+"""
+Compact, column-oriented storage
+of lines in general format.
+"""
+
+import collections
+import struct
+import sys
+from array import array
+
+from sublib.timestamp import to_ms, from_ms
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+_COUNT = struct.Struct("<Q")
+
+Fit = collections.namedtuple("Fit", ["factor", "offset", "score"])
+
+FRAMERATE_RATIOS = tuple(sorted({
+    source / target
+    for source in (23.976, 24.0, 25.0, 29.97)
+    for target in (23.976, 24.0, 25.0, 29.97)
+}))
+
+
+def iter_ms(lines):
+    """
+    Yield lines in general format
+    with times in milliseconds.
+
+    Parameters
+    ----------
+    lines
+        Lines in general format, a CueTable
+        or a TrackSnapshot.
+
+    Returns
+    ----------
+    Iterator of (start ms, end ms, text) tuples.
+    """
+    if hasattr(lines, "iter_ms"):
+        yield from lines.iter_ms()
+    else:
+        for line in lines:
+            yield to_ms(line[0]), to_ms(line[1]), line[2]
+
+
+class CueTable:
+    """
+    Store lines in general format as two
+    int64 millisecond columns and a text column.
+
+    Note
+    ----------
+    Items are returned as new lists
+    [timedelta, timedelta, str], so changing
+    them in place does not change the table,
+    assign them back with table[index] = line.
+    Columns may be read-only sequences, e.g.
+    after sublib.binary.load(); they are copied
+    on the first change.
+    """
+
+    __slots__ = ("starts", "ends", "texts")
+
+    def __init__(self, lines=()) -> None:
+        """
+        Construct a class instance.
+
+        Parameters
+        ----------
+        lines
+            Lines in general format.
+
+        Returns
+        ----------
+        None
+        """
+        self.starts = array("q")
+        self.ends = array("q")
+        self.texts = []
+        self.extend(lines)
+
+    @classmethod
+    def from_ms(cls, rows) -> "CueTable":
+        """
+        Construct a table from times in milliseconds.
+
+        Parameters
+        ----------
+        rows
+            Iterable of (start ms, end ms, text) tuples.
+
+        Returns
+        ----------
+        New table.
+        """
+        table = cls()
+        starts, ends, texts = table.starts, table.ends, table.texts
+        for start, end, text in rows:
+            starts.append(start)
+            ends.append(end)
+            texts.append(text)
+        return table
+
+    def __repr__(self) -> str:
+        """
+        Specifies how repr() is displayed.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        ----------
+        CueTable(<number> lines)
+        """
+        return f"{self.__class__.__name__}({len(self)} lines)"
+
+    def __len__(self) -> int:
+        """
+        Specifies what len() return.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        ----------
+        Number of lines.
+        """
+        return len(self.texts)
+
+    def __getitem__(self, index):
+        """
+        Get a line or a slice of lines.
+
+        Parameters
+        ----------
+        index
+            Line number or slice.
+
+        Returns
+        ----------
+        Line in general format or a new table.
+        """
+        if isinstance(index, slice):
+            return self.from_ms(zip(
+                self.starts[index], self.ends[index], self.texts[index]
+            ))
+        return [
+            from_ms(self.starts[index]),
+            from_ms(self.ends[index]),
+            self.texts[index]
+        ]
+
+    def __setitem__(self, index: int, line) -> None:
+        """
+        Replace a line.
+
+        Parameters
+        ----------
+        index
+            Line number.
+        line
+            Line in general format.
+
+        Returns
+        ----------
+        None
+        """
+        self._own()
+        self.starts[index] = to_ms(line[0])
+        self.ends[index] = to_ms(line[1])
+        self.texts[index] = line[2]
+
+    def __delitem__(self, index) -> None:
+        """
+        Remove a line or a slice of lines.
+
+        Parameters
+        ----------
+        index
+            Line number or slice.
+
+        Returns
+        ----------
+        None
+        """
+        self._own()
+        del self.starts[index]
+        del self.ends[index]
+        del self.texts[index]
+
+    def __iter__(self):
+        """
+        Iterate over lines in general format.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        ----------
+        Iterator of lines in general format.
+        """
+        for start, end, text in self.iter_ms():
+            yield [from_ms(start), from_ms(end), text]
+
+    def __eq__(self, other) -> bool:
+        """
+        Specifies whether tables are equal,
+        lists in general format are accepted too.
+
+        Parameters
+        ----------
+        other
+            Object to compare.
+
+        Returns
+        ----------
+        Whether all lines are equal.
+        """
+        if isinstance(other, CueTable):
+            return (
+                self.starts == other.starts
+                and self.ends == other.ends
+                and list(self.texts) == list(other.texts)
+            )
+        try:
+            if len(other) != len(self):
+                return False
+            return all(
+                list(mine) == list(theirs)
+                for mine, theirs in zip(self.iter_ms(), iter_ms(other))
+            )
+        except (TypeError, ValueError, IndexError, AttributeError):
+            return NotImplemented
+
+    __hash__ = None
+
+    def iter_ms(self):
+        """
+        Iterate over lines with
+        times in milliseconds.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        ----------
+        Iterator of (start ms, end ms, text) tuples.
+        """
+        return zip(self.starts, self.ends, self.texts)
+
+    def append(self, line) -> None:
+        """
+        Add a line at the end.
+
+        Parameters
+        ----------
+        line
+            Line in general format.
+
+        Returns
+        ----------
+        None
+        """
+        self._own()
+        self.starts.append(to_ms(line[0]))
+        self.ends.append(to_ms(line[1]))
+        self.texts.append(line[2])
+
+    def extend(self, lines) -> None:
+        """
+        Add lines at the end.
+
+        Parameters
+        ----------
+        lines
+            Lines in general format or a CueTable.
+
+        Returns
+        ----------
+        None
+        """
+        self._own()
+        for start, end, text in iter_ms(lines):
+            self.starts.append(start)
+            self.ends.append(end)
+            self.texts.append(text)
+
+    def copy(self) -> "CueTable":
+        """
+        Get an independent copy.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        ----------
+        New table.
+        """
+        return self.from_ms(self.iter_ms())
+
+    def _own(self) -> None:
+        """
+        Replace read-only columns, e.g. views of
+        a mapped file, with editable copies.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        ----------
+        None
+        """
+        if not isinstance(self.starts, array):
+            self.starts = array("q", self.starts)
+        if not isinstance(self.ends, array):
+            self.ends = array("q", self.ends)
+        if not isinstance(self.texts, list):
+            self.texts = list(self.texts)
+
+    def to_bytes(self) -> bytes:
+        """
+        Serialize the table: number of lines, start,
+        end and text offset int64 columns, then texts
+        as one UTF-8 blob, all little-endian.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        ----------
+        Serialized table.
+        """
+        texts = [text.encode("utf-8") for text in self.texts]
+        offsets = array("q", [0])
+        for text in texts:
+            offsets.append(offsets[-1] + len(text))
+        columns = [array("q", self.starts), array("q", self.ends), offsets]
+        if sys.byteorder == "big":
+            for column in columns:
+                column.byteswap()
+        return b"".join(
+            [_COUNT.pack(len(texts))]
+            + [column.tobytes() for column in columns]
+            + texts
+        )
+
+    @classmethod
+    def from_bytes(cls, data) -> "CueTable":
+        """
+        Deserialize a table made by to_bytes().
+
+        Parameters
+        ----------
+        data
+            Bytes-like object.
+
+        Returns
+        ----------
+        New table.
+        """
+        data = memoryview(data)
+        count = _COUNT.unpack_from(data)[0]
+        position = _COUNT.size
+        if count < 0 or len(data) < position + (3 * count + 1) * 8:
+            raise ValueError("Truncated cue table")
+        columns = []
+        for size in (count, count, count + 1):
+            column = array("q")
+            column.frombytes(data[position:position + size * 8])
+            if sys.byteorder == "big":
+                column.byteswap()
+            columns.append(column)
+            position += size * 8
+        table = cls()
+        table.starts, table.ends, offsets = columns
+        blob = data[position:]
+        if offsets[0] != 0 or offsets[-1] > len(blob):
+            raise ValueError("Truncated cue table")
+        table.texts = [
+            str(blob[start:end], "utf-8")
+            for start, end in zip(offsets, offsets[1:])
+        ]
+        return table
+
+    def to_list(self) -> list:
+        """
+        Get lines as plain lists.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        ----------
+        Lines in general format.
+        """
+        return list(self)
+
+    def as_numpy(self) -> tuple:
+        """
+        Get the time columns as NumPy arrays
+        sharing memory with the table.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        ----------
+        (starts, ends) int64 arrays in milliseconds.
+
+        Note
+        ----------
+        The table cannot grow or shrink
+        while the arrays are referenced.
+        """
+        if numpy is None:
+            raise ImportError("as_numpy() requires the numpy package")
+        return (
+            numpy.frombuffer(self.starts, dtype=numpy.int64),
+            numpy.frombuffer(self.ends, dtype=numpy.int64)
+        )
+
+    def shift(self, offset) -> "CueTable":
+        """
+        Move all lines in time.
+
+        Parameters
+        ----------
+        offset
+            Timedelta or milliseconds, may be negative.
+
+        Returns
+        ----------
+        New table, times are clamped at zero.
+        """
+        return self._transform(1, to_ms(offset))
+
+    def scale(self, factor: float, origin=0) -> "CueTable":
+        """
+        Stretch all lines in time.
+
+        Parameters
+        ----------
+        factor
+            Multiplier of the distance from origin.
+        origin
+            Timedelta or milliseconds left in place.
+
+        Returns
+        ----------
+        New table, times are clamped at zero.
+        """
+        origin = to_ms(origin)
+        return self._transform(factor, origin - origin * factor)
+
+    def sync(self, first, first_target, second,
+             second_target) -> "CueTable":
+        """
+        Fit lines linearly, so two given
+        moments land on their target times.
+
+        Parameters
+        ----------
+        first, second
+            Timedelta or milliseconds in the table.
+        first_target, second_target
+            Where they should be after the sync.
+
+        Returns
+        ----------
+        New table, times are clamped at zero.
+        """
+        first, second = to_ms(first), to_ms(second)
+        first_target = to_ms(first_target)
+        second_target = to_ms(second_target)
+        if first == second:
+            raise ValueError("sync() requires two different moments")
+        factor = (second_target - first_target) / (second - first)
+        return self._transform(factor, first_target - first * factor)
+
+    def retime(self, source_fps: float, target_fps: float) -> "CueTable":
+        """
+        Convert timing made for one framerate
+        to another, e.g. 25 to 23.976 fps.
+
+        Parameters
+        ----------
+        source_fps
+            Framerate the lines are timed for.
+        target_fps
+            Framerate of the target video.
+
+        Returns
+        ----------
+        New table, times are clamped at zero.
+        """
+        return self._transform(source_fps / target_fps, 0)
+
+    def sync_to(self, reference, max_offset=None, ratios=(1.0,),
+                resolution: int = 100) -> tuple:
+        """
+        Align lines with a reference track, finding
+        the offset and framerate ratio under which
+        displayed lines overlap the most.
+
+        Parameters
+        ----------
+        reference
+            Lines in general format or a CueTable,
+            timed correctly.
+        max_offset
+            Timedelta or milliseconds, the largest
+            shift considered, any when omitted.
+        ratios
+            Candidate time multipliers, e.g.
+            FRAMERATE_RATIOS; only 1 when omitted.
+        resolution
+            Milliseconds per timeline sample.
+
+        Returns
+        ----------
+        (new table, Fit) tuple; Fit(factor, offset,
+        score) maps t to round(t * factor + offset),
+        score is from 0 to 1.
+
+        Note
+        ----------
+        Both tracks are turned into on/off timelines
+        and cross-correlated by FFT, O(n log n) per
+        ratio instead of testing every offset.
+        Requires the numpy package.
+        """
+        if numpy is None:
+            raise ImportError("sync_to() requires the numpy package")
+        if not isinstance(reference, CueTable):
+            reference = CueTable(reference)
+        if not len(self) or not len(reference):
+            raise ValueError("sync_to() requires non-empty tracks")
+        target = _timeline(*reference.as_numpy(), 1.0, resolution)
+        limit = None if max_offset is None \
+            else to_ms(max_offset) // resolution
+        best = None
+        for ratio in ratios:
+            source = _timeline(*self.as_numpy(), ratio, resolution)
+            lag, score = _best_lag(source, target, limit)
+            if best is None or score > best.score:
+                best = Fit(ratio, round(lag * resolution), score)
+        return self._transform(best.factor, best.offset), best
+
+    def _transform(self, factor, offset) -> "CueTable":
+        """
+        Map every time t to round(t * factor + offset)
+        in one batch per column.
+
+        Parameters
+        ----------
+        factor
+            Multiplier.
+        offset
+            Milliseconds to add.
+
+        Returns
+        ----------
+        New table, times are clamped at zero.
+        """
+        table = self.__class__()
+        table.texts = list(self.texts)
+        for name in ("starts", "ends"):
+            column = getattr(self, name)
+            if numpy is not None and len(column):
+                values = numpy.frombuffer(column, dtype=numpy.int64)
+                values = numpy.rint(values * float(factor) + float(offset))
+                getattr(table, name).frombytes(
+                    numpy.maximum(values, 0).astype(numpy.int64).tobytes()
+                )
+            elif factor == 1 and isinstance(offset, int):
+                getattr(table, name).extend(
+                    [max(t + offset, 0) for t in column]
+                )
+            else:
+                getattr(table, name).extend(
+                    [max(round(t * factor + offset), 0) for t in column]
+                )
+        return table
+
+
+def _timeline(starts, ends, factor: float, resolution: int):
+    """
+    Sample when any line is displayed.
+
+    Parameters
+    ----------
+    starts, ends
+        int64 arrays in milliseconds.
+    factor
+        Multiplier applied to times first.
+    resolution
+        Milliseconds per sample.
+
+    Returns
+    ----------
+    float64 array, 1.0 while a line is displayed.
+    """
+    starts = numpy.rint(starts * factor).astype(numpy.int64) // resolution
+    ends = numpy.rint(ends * factor).astype(numpy.int64) // resolution
+    starts, ends = numpy.maximum(starts, 0), numpy.maximum(ends, 0)
+    length = int(ends.max()) + 1
+    changes = numpy.bincount(starts, minlength=length + 1)[:length + 1] \
+        - numpy.bincount(ends, minlength=length + 1)[:length + 1]
+    return (numpy.cumsum(changes[:length]) > 0).astype(numpy.float64)
+
+
+def _best_lag(source, target, limit) -> tuple:
+    """
+    Find the shift of the source timeline
+    most similar to the target one.
+
+    Parameters
+    ----------
+    source, target
+        Timelines made by _timeline().
+    limit
+        Largest shift in samples, or None.
+
+    Returns
+    ----------
+    (shift in samples, score from 0 to 1) tuple,
+    the shift is refined between samples
+    by fitting a parabola to the peak.
+    """
+    size = 1 << (len(source) + len(target) - 1).bit_length()
+    correlation = numpy.fft.irfft(
+        numpy.fft.rfft(target, size)
+        * numpy.conj(numpy.fft.rfft(source, size)),
+        size
+    )
+    lags = numpy.arange(size)
+    lags[lags > size - len(source)] -= size
+    valid = (lags < len(target)) & (lags > -len(source))
+    if limit is not None:
+        valid &= numpy.abs(lags) <= limit
+    correlation[~valid] = -numpy.inf
+    best = int(numpy.argmax(correlation))
+    peak = correlation[best]
+    before, after = correlation[best - 1], correlation[(best + 1) % size]
+    lag = float(lags[best])
+    if numpy.isfinite(before) and numpy.isfinite(after) \
+            and before + after < 2 * peak:
+        lag += (before - after) / (2 * (before + after - 2 * peak))
+    norm = numpy.sqrt(source.sum() * target.sum())
+    return lag, float(peak / norm) if norm else 0.0
@@ -0,0 +1,338 @@
+"""
+Fingerprints of whole tracks and an index
+finding exact and near-duplicate tracks,
+whatever their format.
+"""
+
+import collections
+import hashlib
+import random
+import zlib
+from array import array
+from itertools import combinations
+
+from sublib.cuetable import iter_ms
+from sublib.search import tokenize
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+Fingerprint = collections.namedtuple("Fingerprint", ["digest", "signature"])
+
+Duplicate = collections.namedtuple(
+    "Duplicate", ["first", "second", "similarity", "exact"]
+)
+
+NUM_PERM = 128
+
+_PRIME = (1 << 61) - 1
+
+_MASK64 = (1 << 64) - 1
+
+_MASK32 = (1 << 32) - 1
+
+_RANDOM = random.Random(1729)
+
+_PERMUTATIONS = tuple(
+    (_RANDOM.randrange(1, _PRIME), _RANDOM.randrange(_PRIME))
+    for _ in range(NUM_PERM)
+)
+
+
+def fingerprint(lines, resolution: int = 1000,
+                shingle: int = 3) -> Fingerprint:
+    """
+    Summarize lines of a track.
+
+    Parameters
+    ----------
+    lines
+        Lines in general format or a CueTable.
+    resolution
+        Milliseconds to which gaps between
+        line starts are rounded down.
+    shingle
+        Number of consecutive words per text shingle.
+
+    Returns
+    ----------
+    Fingerprint(digest, signature): 16 bytes equal
+    for tracks with the same words in the same
+    lines, and NUM_PERM int64 MinHash values.
+
+    Note
+    ----------
+    Texts are casefolded and reduced to words, so
+    punctuation, "|" line breaks and styling do not
+    matter. The signature covers shingles of the word
+    stream and words of every line paired with the
+    gap until the next line starts, so a shifted track
+    stays similar to the original while a retimed one
+    does not. Times are left out
+    of the digest, as formats store them with
+    different precision.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    words, starts, texts = [], [], []
+    for start, _, text in iter_ms(lines):
+        line = tokenize(text)
+        if not line:
+            continue
+        text = " ".join(line)
+        digest.update(f"{text}\x1e".encode("utf-8"))
+        words.extend(line)
+        starts.append(start)
+        texts.append(text)
+    tokens = {
+        " ".join(words[number:number + shingle])
+        for number in range(max(len(words) - shingle + 1, 1))
+    }
+    tokens.update(
+        f"\x00{(second - first) // resolution}\x00{text}"
+        for first, second, text in zip(starts, starts[1:], texts)
+    )
+    tokens.discard("")
+    return Fingerprint(digest.digest(), _minhash(tokens))
+
+
+def similarity(first: Fingerprint, second: Fingerprint) -> float:
+    """
+    Estimate how similar two tracks are.
+
+    Parameters
+    ----------
+    first, second
+        Fingerprints of the tracks.
+
+    Returns
+    ----------
+    Estimated Jaccard similarity from 0 to 1.
+    """
+    same = sum(a == b for a, b in zip(first.signature, second.signature))
+    return same / len(first.signature)
+
+
+def _minhash(tokens: set) -> array:
+    """
+    Compute MinHash values of a set of tokens.
+
+    Parameters
+    ----------
+    tokens
+        Strings.
+
+    Returns
+    ----------
+    NUM_PERM int64 values, all _MASK32 + 1
+    for no tokens.
+
+    Note
+    ----------
+    Token hashes are permuted by (a * x + b) % _PRIME
+    with 64-bit wraparound, as numpy computes it, and
+    cut to 32 bits.
+    """
+    hashes = [zlib.crc32(token.encode("utf-8")) for token in tokens]
+    if not hashes:
+        return array("q", [_MASK32 + 1] * NUM_PERM)
+    if numpy is not None:
+        values = numpy.array(hashes, dtype=numpy.uint64)
+        factors = numpy.array(_PERMUTATIONS, dtype=numpy.uint64)
+        hashed = (factors[:, :1] * values + factors[:, 1:]) \
+            % numpy.uint64(_PRIME) & numpy.uint64(_MASK32)
+        return array("q", hashed.min(axis=1).astype(numpy.int64).tobytes())
+    return array("q", [
+        min(
+            ((factor * value + offset) & _MASK64) % _PRIME & _MASK32
+            for value in hashes
+        )
+        for factor, offset in _PERMUTATIONS
+    ])
+
+
+class DuplicateIndex:
+    """
+    Find tracks with equal or similar
+    fingerprints in roughly linear time.
+
+    Note
+    ----------
+    Signatures are cut into bands, tracks sharing
+    any whole band are candidates, and only those
+    are compared. With 16 bands of 8 values, tracks
+    of similarity 0.9 are found with 99.99%, 0.8 with
+    95% and 0.5 with 6% probability. Tracks with
+    equal digests, i.e. the same text, are always
+    compared.
+    """
+
+    def __init__(self, threshold: float = 0.8, bands: int = 16) -> None:
+        """
+        Construct an empty index.
+
+        Parameters
+        ----------
+        threshold
+            Lowest reported similarity.
+        bands
+            Number of signature bands, dividing
+            NUM_PERM; more find less similar tracks.
+
+        Returns
+        ----------
+        None
+        """
+        if NUM_PERM % bands:
+            raise ValueError(f"bands must divide {NUM_PERM}")
+        self.threshold = threshold
+        self.bands = bands
+        self.tracks = []
+        self.fingerprints = []
+        self._exact = {}
+        self._buckets = [{} for _ in range(bands)]
+
+    def __len__(self) -> int:
+        """
+        Specifies what len() return.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        ----------
+        Number of indexed tracks.
+        """
+        return len(self.tracks)
+
+    def add_subtitle(self, subtitle, track: str = None) -> int:
+        """
+        Index a subtitle by its cached fingerprint.
+
+        Parameters
+        ----------
+        subtitle
+            Subtitle object of a specific format.
+        track
+            Track name, subtitle path when omitted.
+
+        Returns
+        ----------
+        Track number.
+        """
+        if track is None:
+            track = subtitle.path
+        return self.add(subtitle.fingerprint(), track)
+
+    def add(self, fingerprint: Fingerprint, track: str) -> int:
+        """
+        Index a fingerprint.
+
+        Parameters
+        ----------
+        fingerprint
+            Fingerprint of the track.
+        track
+            Track name.
+
+        Returns
+        ----------
+        Track number.
+        """
+        number = len(self.tracks)
+        self.tracks.append(track)
+        self.fingerprints.append(fingerprint)
+        self._exact.setdefault(fingerprint.digest, []).append(number)
+        for buckets, key in zip(self._buckets, self._keys(fingerprint)):
+            buckets.setdefault(key, []).append(number)
+        return number
+
+    def similar(self, fingerprint: Fingerprint,
+                threshold: float = None) -> list:
+        """
+        Find indexed tracks similar to a fingerprint.
+
+        Parameters
+        ----------
+        fingerprint
+            Fingerprint of any track.
+        threshold
+            Lowest reported similarity,
+            the index one when omitted;
+            tracks of the same text are
+            reported anyway.
+
+        Returns
+        ----------
+        (track, similarity) tuples, most similar first.
+        """
+        if threshold is None:
+            threshold = self.threshold
+        numbers = set(self._exact.get(fingerprint.digest, ()))
+        for buckets, key in zip(self._buckets, self._keys(fingerprint)):
+            numbers.update(buckets.get(key, ()))
+        found = []
+        for number in sorted(numbers):
+            other = self.fingerprints[number]
+            score = similarity(fingerprint, other)
+            if score >= threshold or other.digest == fingerprint.digest:
+                found.append((self.tracks[number], score))
+        found.sort(key=lambda item: -item[1])
+        return found
+
+    def duplicates(self, threshold: float = None) -> list:
+        """
+        Find all pairs of equal or similar tracks.
+
+        Parameters
+        ----------
+        threshold
+            Lowest reported similarity,
+            the index one when omitted;
+            tracks of the same text are
+            reported anyway.
+
+        Returns
+        ----------
+        Duplicate(first, second, similarity, exact)
+        tuples, sorted by track numbers.
+        """
+        if threshold is None:
+            threshold = self.threshold
+        pairs = set()
+        for numbers in self._exact.values():
+            pairs.update(combinations(numbers, 2))
+        for buckets in self._buckets:
+            for numbers in buckets.values():
+                pairs.update(combinations(numbers, 2))
+        found = []
+        for first, second in sorted(pairs):
+            a, b = self.fingerprints[first], self.fingerprints[second]
+            score, exact = similarity(a, b), a.digest == b.digest
+            if score >= threshold or exact:
+                found.append(Duplicate(
+                    self.tracks[first], self.tracks[second], score, exact
+                ))
+        return found
+
+    def _keys(self, fingerprint: Fingerprint) -> list:
+        """
+        Cut a signature into band keys.
+
+        Parameters
+        ----------
+        fingerprint
+            Fingerprint of any track.
+
+        Returns
+        ----------
+        One bytes key per band.
+        """
+        data = fingerprint.signature.tobytes()
+        size = len(data) // self.bands
+        return [
+            data[start:start + size] for start in range(0, len(data), size)
+        ]
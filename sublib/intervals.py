@@ -0,0 +1,190 @@
+"""
+Time-interval index answering which
+lines are displayed at a given time.
+"""
+
+from array import array
+from bisect import bisect_left, bisect_right
+
+from sublib.cuetable import CueTable
+from sublib.timestamp import to_ms
+
+
+class CueIndex:
+    """
+    Index lines in general format by time.
+
+    Note
+    ----------
+    Lines are kept sorted by start time, and those
+    lasting longer than zero in a centered interval
+    tree: every node keeps the lines containing its
+    center time, sorted by start and by end, and
+    passes earlier and later lines to its children.
+    A query walks one path of O(log n) nodes and
+    stops scanning a node at its first line which
+    does not match, so it costs O(log n + k) for
+    k found lines, however long the lines are.
+    """
+
+    def __init__(self, lines) -> None:
+        """
+        Construct a class instance.
+
+        Parameters
+        ----------
+        lines
+            Lines in general format or a CueTable.
+
+        Returns
+        ----------
+        None
+        """
+        if not isinstance(lines, CueTable):
+            lines = CueTable(lines)
+        order = sorted(range(len(lines)), key=lines.starts.__getitem__)
+        self.order = array("q", order)
+        self.starts = array("q", [lines.starts[i] for i in order])
+        self.ends = array("q", [lines.ends[i] for i in order])
+        self._nodes = array("q")
+        self._by_start = array("q")
+        self._by_end = array("q")
+        self._build()
+
+    def __len__(self) -> int:
+        """
+        Specifies what len() return.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        ----------
+        Number of indexed lines.
+        """
+        return len(self.order)
+
+    def at(self, time) -> list:
+        """
+        Find lines displayed at a given time.
+
+        Parameters
+        ----------
+        time
+            Timedelta or milliseconds.
+
+        Returns
+        ----------
+        Sorted line numbers, start <= time < end.
+        """
+        found = [self.order[position] for position in self._stab(to_ms(time))]
+        found.sort()
+        return found
+
+    def between(self, start, end) -> list:
+        """
+        Find lines displayed at any
+        moment of a given time range.
+
+        Parameters
+        ----------
+        start
+            Timedelta or milliseconds, inclusive.
+        end
+            Timedelta or milliseconds, exclusive.
+
+        Returns
+        ----------
+        Sorted line numbers.
+        """
+        start, end = to_ms(start), to_ms(end)
+        starts = self.starts
+        found = [
+            self.order[position] for position in self._stab(start)
+            if starts[position] < end
+        ]
+        first = bisect_right(starts, start)
+        last = bisect_left(starts, end)
+        if last > first:
+            found.extend(self.order[first:last])
+        found.sort()
+        return found
+
+    def _build(self) -> None:
+        """
+        Build the interval tree of lines lasting
+        longer than zero, every node being five
+        values of _nodes: center, left child,
+        right child, offset and number of its
+        lines in _by_start and _by_end.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        ----------
+        None
+        """
+        starts, ends, nodes = self.starts, self.ends, self._nodes
+        pending = [(
+            [p for p in range(len(starts)) if ends[p] > starts[p]], -1
+        )]
+        while pending:
+            positions, link = pending.pop()
+            if not positions:
+                continue
+            node = len(nodes)
+            if link >= 0:
+                nodes[link] = node
+            center = starts[positions[len(positions) // 2]]
+            here, left, right = [], [], []
+            for position in positions:
+                if ends[position] <= center:
+                    left.append(position)
+                elif starts[position] > center:
+                    right.append(position)
+                else:
+                    here.append(position)
+            nodes.extend((center, -1, -1, len(self._by_start), len(here)))
+            self._by_start.extend(here)
+            self._by_end.extend(
+                sorted(here, key=ends.__getitem__, reverse=True)
+            )
+            pending.append((left, node + 1))
+            pending.append((right, node + 2))
+
+    def _stab(self, time: int) -> list:
+        """
+        Collect lines containing a time.
+
+        Parameters
+        ----------
+        time
+            Milliseconds.
+
+        Returns
+        ----------
+        Positions in start order of lines
+        with start <= time < end, unsorted.
+        """
+        starts, ends, nodes = self.starts, self.ends, self._nodes
+        by_start, by_end = self._by_start, self._by_end
+        found = []
+        node = 0 if nodes else -1
+        while node >= 0:
+            center, left, right, offset, count = nodes[node:node + 5]
+            if time < center:
+                for index in range(offset, offset + count):
+                    if starts[by_start[index]] > time:
+                        break
+                    found.append(by_start[index])
+                node = left
+            else:
+                for index in range(offset, offset + count):
+                    if ends[by_end[index]] <= time:
+                        break
+                    found.append(by_end[index])
+                node = right
+        return found
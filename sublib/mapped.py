@@ -0,0 +1,342 @@
+"""
+Memory-mapped reader locating lines on raw bytes,
+decoding text only when it is accessed.
+"""
+
+import mmap
+import re
+from array import array
+from fractions import Fraction
+
+from sublib import charset
+from sublib.cuetable import CueTable
+from sublib.sublib import FORMATS, MicroDVD, detect
+from sublib.timestamp import (
+    from_ms, parse_srt, parse_hms, frames_to_ms, deciseconds_to_ms
+)
+
+
+_BOM = rb"^(?:\xef\xbb\xbf)?"
+
+_PATTERNS = {
+    "mpl": re.compile(
+        _BOM + rb"\[([0-9]+)\]\[([0-9]+)\][ \t]*([^\r\n]*)", re.MULTILINE
+    ),
+    "srt": re.compile(
+        _BOM + rb"[0-9]+[ \t]*\r?\n"
+        rb"([0-9]+:[0-9]+:[0-9]+[,.][0-9]+) --> "
+        rb"([0-9]+:[0-9]+:[0-9]+[,.][0-9]+)[^\r\n]*\r?\n"
+        rb"((?:[^\r\n]+(?:\r?\n|\Z))*)", re.MULTILINE
+    ),
+    "sub": re.compile(
+        _BOM + rb"{([0-9]+)}{([0-9]*)}([^\r\n]*)", re.MULTILINE
+    ),
+    "tmp": re.compile(
+        _BOM + rb"([0-9]+:[0-9]+:[0-9]+):([^\r\n]*)", re.MULTILINE
+    )
+}
+
+_SUB_HEADER = re.compile(MicroDVD._header_pattern.pattern.encode("ascii"))
+
+_LINE_BREAK = re.compile(r"\r?\n")
+
+
+class MappedTrack:
+    """
+    Represent a subtitle file mapped into memory.
+
+    Note
+    ----------
+    Only times and byte offsets of lines are kept,
+    32 bytes per line; text stays in the file until
+    requested. The encoding must be ASCII compatible,
+    e.g. UTF-8 or a single-byte codepage.
+    """
+
+    def __init__(self, path: str, encoding: str = "utf-8",
+                 fmt: str = None, fps=None) -> None:
+        """
+        Construct a class instance.
+
+        Parameters
+        ----------
+        path
+            Path to a textual subtitle file.
+        encoding
+            Representation of encoding type,
+            "auto" to detect it.
+        fmt
+            Format name, detected when omitted.
+        fps
+            MicroDVD frames per second, taken from
+            the header or 23.976 when omitted.
+
+        Returns
+        ----------
+        None
+        """
+        self.path = path
+        self.encoding = encoding
+        with open(path, "rb") as f:
+            try:
+                self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                self._map = b""
+        self._view = memoryview(self._map)
+        if encoding == "auto":
+            self.encoding = encoding = charset.sniff(self._view)
+        self.format = fmt or detect(self._view, encoding)
+        if self.format not in _PATTERNS:
+            self.close()
+            raise ValueError(f"Unsupported subtitle format: '{self.format}'")
+        self.fixed_fps = fps is not None
+        self.fps = MicroDVD.default_fps if fps is None else Fraction(str(fps))
+        self.starts = array("q")
+        self.ends = array("q")
+        self.offsets = array("q")
+        getattr(self, "_index_" + self.format)()
+
+    def __enter__(self) -> "MappedTrack":
+        """
+        Specifies "with" statement behavior.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        ----------
+        Itself.
+        """
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        """
+        Release the mapped file
+        when leaving "with" block.
+
+        Parameters
+        ----------
+        exc_info
+            Exception details, if raised.
+
+        Returns
+        ----------
+        None
+        """
+        self.close()
+
+    def __repr__(self) -> str:
+        """
+        Specifies how repr() is displayed.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        ----------
+        MappedTrack(path="path", encoding="encoding")
+        """
+        return f'{self.__class__.__name__}'\
+               f'(path="{self.path}", encoding="{self.encoding}")'
+
+    def __len__(self) -> int:
+        """
+        Specifies what len() return.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        ----------
+        Number of lines.
+        """
+        return len(self.starts)
+
+    def __getitem__(self, index: int) -> list:
+        """
+        Get a line, decoding its text.
+
+        Parameters
+        ----------
+        index
+            Line number.
+
+        Returns
+        ----------
+        Line in general format.
+        """
+        return [
+            from_ms(self.starts[index]),
+            from_ms(self.ends[index]),
+            self.text(index)
+        ]
+
+    def close(self) -> None:
+        """
+        Release the mapped file.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        ----------
+        None
+        """
+        self._view.release()
+        if isinstance(self._map, mmap.mmap):
+            self._map.close()
+
+    def raw(self, index: int) -> memoryview:
+        """
+        Get undecoded text of a line,
+        without copying it.
+
+        Parameters
+        ----------
+        index
+            Line number.
+
+        Returns
+        ----------
+        Slice of the mapped file.
+        """
+        index = range(len(self))[index]
+        return self._view[
+            self.offsets[2 * index]:self.offsets[2 * index + 1]
+        ]
+
+    def text(self, index: int) -> str:
+        """
+        Get decoded text of a line,
+        without styling tags.
+
+        Parameters
+        ----------
+        index
+            Line number.
+
+        Returns
+        ----------
+        Line text, "|" separated.
+        """
+        text = str(self.raw(index), self.encoding, "ignore")
+        text = _LINE_BREAK.sub("|", text)
+        return FORMATS[self.format]._strip_styles(text)
+
+    def table(self) -> CueTable:
+        """
+        Decode all lines.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        ----------
+        Lines in general format as a CueTable.
+        """
+        table = CueTable()
+        table.starts = array("q", self.starts)
+        table.ends = array("q", self.ends)
+        table.texts = [self.text(index) for index in range(len(self))]
+        return table
+
+    def stats(self) -> dict:
+        """
+        Get timing statistics, without
+        decoding any text.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        ----------
+        Number of lines, first start, last end,
+        total, shortest, longest and mean display
+        time in milliseconds.
+        """
+        durations = [end - start for start, end in zip(self.starts, self.ends)]
+        return {
+            "lines": len(durations),
+            "first_start": min(self.starts, default=0),
+            "last_end": max(self.ends, default=0),
+            "total_duration": sum(durations),
+            "min_duration": min(durations, default=0),
+            "max_duration": max(durations, default=0),
+            "mean_duration": sum(durations) / len(durations)
+            if durations else 0.0
+        }
+
+    def _add(self, start: int, end: int, span: tuple) -> None:
+        """
+        Record a located line.
+        """
+        self.starts.append(start)
+        self.ends.append(end)
+        self.offsets.extend(span)
+
+    def _index_mpl(self) -> None:
+        """
+        Locate MPlayer2 lines.
+        """
+        for match in _PATTERNS["mpl"].finditer(self._map):
+            self._add(
+                deciseconds_to_ms(int(match.group(1))),
+                deciseconds_to_ms(int(match.group(2))),
+                match.span(3)
+            )
+
+    def _index_srt(self) -> None:
+        """
+        Locate SubRip blocks, text spans
+        exclude the trailing line break.
+        """
+        data = self._map
+        for match in _PATTERNS["srt"].finditer(data):
+            start, end = match.span(3)
+            while end > start and data[end - 1] in b"\r\n":
+                end -= 1
+            self._add(
+                parse_srt(match.group(1).decode("ascii")),
+                parse_srt(match.group(2).decode("ascii")),
+                (start, end)
+            )
+
+    def _index_sub(self) -> None:
+        """
+        Locate MicroDVD lines, the header
+        line sets the framerate.
+        """
+        first = True
+        for match in _PATTERNS["sub"].finditer(self._map):
+            if first:
+                first = False
+                header = _SUB_HEADER.fullmatch(
+                    match.group(0).lstrip(b"\xef\xbb\xbf")
+                )
+                if header:
+                    if not self.fixed_fps:
+                        self.fps = Fraction(
+                            header.group(1).replace(b",", b".").decode()
+                        )
+                    continue
+            start = frames_to_ms(int(match.group(1)), self.fps)
+            if match.group(2):
+                end = frames_to_ms(int(match.group(2)), self.fps)
+            else:
+                end = start + MicroDVD.default_duration
+            self._add(start, end, match.span(3))
+
+    def _index_tmp(self) -> None:
+        """
+        Locate TMPlayer lines, every
+        line lasts one second.
+        """
+        for match in _PATTERNS["tmp"].finditer(self._map):
+            start = parse_hms(match.group(1).decode("ascii"))
+            self._add(start, start + 1000, match.span(2))
@@ -0,0 +1,126 @@
+"""
+Single-pass tokenizer of styling markup:
+SubRip tags, {\\an8} style overrides
+and MicroDVD control codes.
+"""
+
+import collections
+import re
+
+
+Span = collections.namedtuple("Span", ["start", "end", "tag", "value"])
+
+_TOKENS = {
+    "srt": re.compile(
+        r"<(/?)([a-zA-Z][a-zA-Z0-9]*)([^<>]*)>|{\\([^{}]*)}"
+    ),
+    "sub": re.compile(r"{(?:([a-zA-Z]):([^{}]*)|[^{}]*)}")
+}
+
+_MARKERS = {"srt": ("<", "{"), "sub": ("{",)}
+
+
+def strip(text: str, dialect: str) -> str:
+    """
+    Remove styling markup from line text.
+
+    Parameters
+    ----------
+    text
+        Line text, "|" separated.
+    dialect
+        Format name, "srt" or "sub";
+        other texts are returned as they are.
+
+    Returns
+    ----------
+    Text without markup.
+    """
+    markers = _MARKERS.get(dialect, ())
+    if not any(marker in text for marker in markers):
+        return text
+    return _TOKENS[dialect].sub("", text)
+
+
+def spans(text: str, dialect: str) -> tuple:
+    """
+    Split line text into plain text
+    and spans of styling applied to it.
+
+    Parameters
+    ----------
+    text
+        Line text, "|" separated.
+    dialect
+        Format name, "srt" or "sub";
+        other texts have no spans.
+
+    Returns
+    ----------
+    (plain text, spans) tuple, spans are sorted
+    and index the plain text.
+
+    Note
+    ----------
+    Unclosed SubRip tags and {\\...} overrides last
+    until the end of the text, as do uppercase
+    MicroDVD codes; lowercase ones last until the
+    end of their "|" separated line.
+    """
+    if dialect not in _TOKENS:
+        return text, []
+    parts = []
+    pending = []
+    found = []
+    position = length = 0
+    for match in _TOKENS[dialect].finditer(text):
+        parts.append(text[position:match.start()])
+        length += match.start() - position
+        position = match.end()
+        if dialect == "srt":
+            _srt_token(match, length, pending, found)
+        elif match.group(1):
+            pending.append((
+                length, match.group(1).lower(), match.group(2).strip(),
+                match.group(1).islower()
+            ))
+    parts.append(text[position:])
+    plain = "".join(parts)
+    for start, tag, value, line in pending:
+        end = plain.find("|", start) if line else -1
+        found.append(Span(start, len(plain) if end < 0 else end, tag, value))
+    found.sort()
+    return plain, found
+
+
+def _srt_token(match, length: int, pending: list, found: list) -> None:
+    """
+    Open or close a SubRip span.
+
+    Parameters
+    ----------
+    match
+        Matched tag or override.
+    length
+        Length of plain text before the match.
+    pending
+        Open spans as (start, tag, value, False).
+    found
+        Closed spans.
+
+    Returns
+    ----------
+    None
+    """
+    if match.group(4) is not None:
+        pending.append((length, "override", match.group(4), False))
+        return
+    tag = match.group(2).lower()
+    if not match.group(1):
+        pending.append((length, tag, match.group(3).strip(), False))
+        return
+    for number in range(len(pending) - 1, -1, -1):
+        if pending[number][1] == tag:
+            start, _, value, _ = pending.pop(number)
+            found.append(Span(start, length, tag, value))
+            return
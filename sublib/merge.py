@@ -0,0 +1,176 @@
+"""
+Streaming k-way merge of several tracks,
+e.g. two languages or speakers, into one.
+"""
+
+import heapq
+
+from sublib import charset
+from sublib.cuetable import iter_ms
+from sublib.sublib import FORMATS, detect, _format_instance
+from sublib.timestamp import from_ms
+
+
+def merge(*tracks, fuse: bool = False):
+    """
+    Combine lines of several tracks by time.
+
+    Parameters
+    ----------
+    tracks
+        Subtitle objects, paths to subtitle files,
+        lines in general format or CueTable objects,
+        each sorted by start time; encodings and
+        formats of files are detected.
+    fuse
+        Whether to join overlapping lines into
+        a single line of several "|" separated ones.
+
+    Returns
+    ----------
+    Iterator of lines in general format.
+
+    Note
+    ----------
+    Tracks are read lazily and merged through a heap,
+    O(n log k) for n lines of k tracks. Lines starting
+    at the same time keep the order of their tracks,
+    and so do texts of a fused line, which lasts from
+    the first start to the last end of a chain of
+    overlapping lines. ValueError is raised when
+    a track is not sorted.
+    """
+    for start, end, text in _merged(tracks, fuse):
+        yield [from_ms(start), from_ms(end), text]
+
+
+def merge_to(tracks, target, to, encoding: str = "utf-8",
+             fuse: bool = False) -> int:
+    """
+    Merge tracks and write the result
+    line by line in a given format.
+
+    Parameters
+    ----------
+    tracks
+        Iterable of tracks accepted by merge().
+    target
+        Path or file open for writing.
+    to
+        Target format name, class or instance,
+        e.g. "srt", SubRip or MicroDVD(fps=25).
+    encoding
+        Representation of target encoding type.
+    fuse
+        Whether to join overlapping lines.
+
+    Returns
+    ----------
+    Number of written lines.
+    """
+    writer = _format_instance(to, encoding)
+    return writer.write_cues(_merged(tracks, fuse), target, encoding)
+
+
+def _merged(tracks, fuse: bool):
+    """
+    Merge tracks with times in milliseconds.
+
+    Parameters
+    ----------
+    tracks
+        Tracks accepted by merge().
+    fuse
+        Whether to join overlapping lines.
+
+    Returns
+    ----------
+    Iterator of (start ms, end ms, text) tuples.
+    """
+    merged = heapq.merge(*(
+        _keyed(track, number) for number, track in enumerate(tracks)
+    ))
+    if not fuse:
+        for start, _, end, text in merged:
+            yield start, end, text
+        return
+    group = None
+    for start, number, end, text in merged:
+        if group is not None and start < group[1]:
+            group[1] = max(group[1], end)
+            group[2].append((number, text))
+            continue
+        if group is not None:
+            yield _fused(group)
+        group = [start, end, [(number, text)]]
+    if group is not None:
+        yield _fused(group)
+
+
+def _keyed(track, number: int):
+    """
+    Yield lines of a track as heap entries.
+
+    Parameters
+    ----------
+    track
+        Track accepted by merge().
+    number
+        Position of the track, breaking ties.
+
+    Returns
+    ----------
+    Iterator of (start ms, number, end ms, text) tuples.
+    """
+    if isinstance(track, str):
+        track = _reader(track).iter_cues(track)
+    elif hasattr(track, "iter_cues"):
+        track = track.iter_cues()
+    previous = 0
+    for start, end, text in iter_ms(track):
+        if start < previous:
+            raise ValueError(f"Track {number} is not sorted by start time")
+        previous = start
+        yield start, number, end, text
+
+
+def _reader(path: str):
+    """
+    Get an object parsing a file, detecting its
+    encoding and format from a bounded prefix.
+
+    Parameters
+    ----------
+    path
+        Path to a textual subtitle file.
+
+    Returns
+    ----------
+    Empty subtitle object of the format.
+    """
+    with open(path, "rb") as f:
+        sample = f.read(charset.SNIFF_SIZE)
+    encoding = charset.sniff(sample)
+    fmt = detect(sample, encoding)
+    if fmt not in FORMATS:
+        raise ValueError(f"Unsupported subtitle format: '{fmt}'")
+    return FORMATS[fmt](encoding=encoding)
+
+
+def _fused(group: list) -> tuple:
+    """
+    Join texts of overlapping lines.
+
+    Parameters
+    ----------
+    group
+        [start ms, end ms, [(track number, text), ...]]
+
+    Returns
+    ----------
+    (start ms, end ms, text) tuple, texts
+    ordered by track, then by time.
+    """
+    start, end, texts = group
+    texts.sort(key=lambda item: item[0])
+    return start, end, "|".join(text for _, text in texts)
@@ -0,0 +1,367 @@
+"""
+Optional instrumentation of library stages:
+wall time, lines, bytes and errors per stage
+and format class.
+"""
+
+import contextlib
+import threading
+import time
+
+
+_hooks = []
+
+_local = threading.local()
+
+
+def add_hook(hook) -> None:
+    """
+    Register a function called after every
+    instrumented stage.
+
+    Parameters
+    ----------
+    hook
+        Callable taking stage name, format name,
+        seconds, lines, bytes and errors.
+
+    Returns
+    ----------
+    None
+    """
+    _hooks.append(hook)
+
+
+def remove_hook(hook) -> None:
+    """
+    Unregister a function added by add_hook().
+
+    Parameters
+    ----------
+    hook
+        Registered callable.
+
+    Returns
+    ----------
+    None
+    """
+    _hooks.remove(hook)
+
+
+@contextlib.contextmanager
+def collect():
+    """
+    Collect stages run inside "with" block.
+
+    Parameters
+    ----------
+    None
+
+    Returns
+    ----------
+    Context manager giving a Metrics object.
+    """
+    metrics = Metrics()
+    add_hook(metrics)
+    try:
+        yield metrics
+    finally:
+        remove_hook(metrics)
+
+
+def stage(name: str, fmt: str = ""):
+    """
+    Measure a block of code as a stage.
+
+    Parameters
+    ----------
+    name
+        Stage name, e.g. "parse".
+    fmt
+        Format class name, if any.
+
+    Returns
+    ----------
+    Context manager giving an object with
+    add(cues, bytes, errors) method.
+
+    Note
+    ----------
+    Without registered hooks a shared no-op
+    object is returned and nothing is measured.
+    """
+    if not _hooks:
+        return _DISABLED
+    return _Stage(name, fmt)
+
+
+def iterate(name: str, fmt: str, iterable):
+    """
+    Measure time spent producing items
+    of an iterable as a stage.
+
+    Parameters
+    ----------
+    name
+        Stage name, e.g. "parse".
+    fmt
+        Format class name, if any.
+    iterable
+        Lazily produced items, counted as lines.
+
+    Returns
+    ----------
+    The iterable itself without registered
+    hooks, otherwise an iterator of its items.
+    """
+    if not _hooks:
+        return iterable
+    return _metered(_Stage(name, fmt), iterable)
+
+
+def _metered(record: "_Stage", iterable):
+    """
+    Yield items of an iterable, measuring
+    only the time spent inside next().
+    """
+    iterator = iter(iterable)
+    try:
+        while True:
+            record._resume()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                record._pause()
+                return
+            except BaseException:
+                record._pause()
+                record.errors += 1
+                raise
+            record._pause()
+            record.cues += 1
+            yield item
+    finally:
+        record._finish()
+
+
+class Metrics:
+    """
+    Hook summing reported stages
+    per stage name and format.
+
+    Note
+    ----------
+    Times are exclusive: a stage nested in another,
+    e.g. parsing pulled by writing, is not counted
+    twice. Stages run in worker processes are not
+    reported to the parent process.
+    """
+
+    _fields = ("calls", "seconds", "cues", "bytes", "errors")
+
+    _help = {
+        "calls": "Number of stage runs.",
+        "seconds": "Wall time spent in the stage.",
+        "cues": "Number of lines processed.",
+        "bytes": "Number of bytes read.",
+        "errors": "Number of failed stage runs."
+    }
+
+    def __init__(self) -> None:
+        """
+        Construct an empty collector.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        ----------
+        None
+        """
+        self._lock = threading.Lock()
+        self.stages = {}
+
+    def __call__(self, name: str, fmt: str, seconds: float,
+                 cues: int, size: int, errors: int) -> None:
+        """
+        Add a finished stage.
+
+        Parameters
+        ----------
+        name
+            Stage name.
+        fmt
+            Format class name.
+        seconds
+            Wall time.
+        cues
+            Number of lines.
+        size
+            Number of bytes.
+        errors
+            Number of errors.
+
+        Returns
+        ----------
+        None
+        """
+        with self._lock:
+            totals = self.stages.setdefault(name, {}).get(fmt)
+            if totals is None:
+                totals = self.stages[name][fmt] = dict.fromkeys(
+                    self._fields, 0
+                )
+            totals["calls"] += 1
+            totals["seconds"] += seconds
+            totals["cues"] += cues
+            totals["bytes"] += size
+            totals["errors"] += errors
+
+    def reset(self) -> None:
+        """
+        Forget all collected stages.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        ----------
+        None
+        """
+        with self._lock:
+            self.stages = {}
+
+    def as_dict(self) -> dict:
+        """
+        Get collected totals.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        ----------
+        {stage: {format: {calls, seconds, cues, bytes, errors}}}
+        """
+        with self._lock:
+            return {
+                name: {fmt: dict(totals) for fmt, totals in formats.items()}
+                for name, formats in self.stages.items()
+            }
+
+    def to_prometheus(self, prefix: str = "sublib") -> str:
+        """
+        Get collected totals in Prometheus
+        text exposition format.
+
+        Parameters
+        ----------
+        prefix
+            Prefix of metric names.
+
+        Returns
+        ----------
+        Counters labelled by stage and format.
+        """
+        stages = self.as_dict()
+        lines = []
+        for field in self._fields:
+            metric = f"{prefix}_stage_{field}_total"
+            lines.append(f"# HELP {metric} {self._help[field]}")
+            lines.append(f"# TYPE {metric} counter")
+            for name in sorted(stages):
+                for fmt in sorted(stages[name]):
+                    lines.append(
+                        f'{metric}{{stage="{name}",format="{fmt}"}} '
+                        f'{stages[name][fmt][field]}'
+                    )
+        return "\n".join(lines) + "\n"
+
+
+class _Stage:
+    """
+    Running stage, measured in segments.
+    """
+
+    __slots__ = ("name", "format", "seconds", "cues", "bytes",
+                 "errors", "_started")
+
+    def __init__(self, name: str, fmt: str) -> None:
+        self.name = name
+        self.format = fmt
+        self.seconds = 0.0
+        self.cues = 0
+        self.bytes = 0
+        self.errors = 0
+        self._started = 0.0
+
+    def __enter__(self) -> "_Stage":
+        self._resume()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> bool:
+        self._pause()
+        if exc_type is not None and exc_type is not GeneratorExit:
+            self.errors += 1
+        self._finish()
+        return False
+
+    def add(self, cues: int = 0, bytes: int = 0, errors: int = 0) -> None:
+        """
+        Count processed lines, read bytes or errors.
+        """
+        self.cues += cues
+        self.bytes += bytes
+        self.errors += errors
+
+    def _resume(self) -> None:
+        """
+        Start a measured segment.
+        """
+        stack = getattr(_local, "stack", None)
+        if stack is None:
+            stack = _local.stack = []
+        stack.append(self)
+        self._started = time.perf_counter()
+
+    def _pause(self) -> None:
+        """
+        End a measured segment, taking
+        its time out of the enclosing stage.
+        """
+        elapsed = time.perf_counter() - self._started
+        stack = _local.stack
+        stack.pop()
+        self.seconds += elapsed
+        if stack:
+            stack[-1].seconds -= elapsed
+
+    def _finish(self) -> None:
+        """
+        Report the stage to all hooks.
+        """
+        for hook in list(_hooks):
+            hook(self.name, self.format, self.seconds,
+                 self.cues, self.bytes, self.errors)
+
+
+class _Disabled:
+    """
+    Shared stage used when nothing is collected.
+    """
+
+    __slots__ = ()
+
+    def __enter__(self) -> "_Disabled":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> bool:
+        return False
+
+    def add(self, cues: int = 0, bytes: int = 0, errors: int = 0) -> None:
+        pass
+
+
+_DISABLED = _Disabled()
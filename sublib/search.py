@@ -0,0 +1,534 @@
+"""
+Inverted full-text index of lines,
+for single tracks and whole libraries.
+"""
+
+import collections
+import mmap
+import re
+import struct
+import sys
+from array import array
+from bisect import bisect_left
+
+from sublib.cuetable import CueTable
+from sublib.timestamp import from_ms
+
+
+Hit = collections.namedtuple("Hit", ["track", "line", "start"])
+
+_WORD = re.compile(r"\w+")
+
+_MAGIC = b"SLTX"
+
+_VERSION = 1
+
+_HEADER = struct.Struct("<4sHHQQ")
+
+_BYTE_ORDER = {"little": 1, "big": 2}[sys.byteorder]
+
+
+def tokenize(text: str) -> list:
+    """
+    Split text into lowercase words.
+
+    Parameters
+    ----------
+    text
+        Line text, "|" separated lines included.
+
+    Returns
+    ----------
+    Words in order.
+    """
+    return _WORD.findall(text.casefold())
+
+
+def _terms(text: str) -> set:
+    """
+    Get indexed terms of a text:
+    words and pairs of adjacent words.
+
+    Parameters
+    ----------
+    text
+        Line text.
+
+    Returns
+    ----------
+    Unique terms.
+    """
+    words = tokenize(text)
+    terms = set(words)
+    terms.update(" ".join(pair) for pair in zip(words, words[1:]))
+    return terms
+
+
+def _query_terms(query: str) -> list:
+    """
+    Get terms that must all be present
+    for a line to match the query.
+
+    Parameters
+    ----------
+    query
+        Searched words or phrase.
+
+    Returns
+    ----------
+    Terms, pairs of adjacent words when
+    there are two words or more.
+    """
+    words = tokenize(query)
+    if len(words) < 2:
+        return words
+    return [" ".join(pair) for pair in zip(words, words[1:])]
+
+
+class TextIndex:
+    """
+    Map words and pairs of adjacent words
+    to the lines of all indexed tracks.
+
+    Note
+    ----------
+    Every posting is three int64 values:
+    track number, line number and start time
+    in milliseconds, sorted by track and line.
+    """
+
+    def __init__(self) -> None:
+        """
+        Construct an empty index.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        ----------
+        None
+        """
+        self.tracks = []
+        self.postings = {}
+
+    @classmethod
+    def from_subtitle(cls, subtitle, track: str = None) -> "TextIndex":
+        """
+        Construct an index of a single subtitle.
+
+        Parameters
+        ----------
+        subtitle
+            Subtitle object of a specific format.
+        track
+            Track name, subtitle path when omitted.
+
+        Returns
+        ----------
+        New index.
+        """
+        index = cls()
+        index.add_subtitle(subtitle, track)
+        return index
+
+    def __len__(self) -> int:
+        """
+        Specifies what len() return.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        ----------
+        Number of indexed tracks.
+        """
+        return len(self.tracks)
+
+    def add_subtitle(self, subtitle, track: str = None) -> int:
+        """
+        Index lines of a subtitle.
+
+        Parameters
+        ----------
+        subtitle
+            Subtitle object of a specific format.
+        track
+            Track name, subtitle path when omitted.
+
+        Returns
+        ----------
+        Track number.
+        """
+        if track is None:
+            track = subtitle.path
+        return self.add(subtitle._cached_table(), track)
+
+    def add(self, lines, track: str) -> int:
+        """
+        Index lines in general format.
+
+        Parameters
+        ----------
+        lines
+            Lines in general format or a CueTable.
+        track
+            Track name.
+
+        Returns
+        ----------
+        Track number.
+        """
+        if not isinstance(lines, CueTable):
+            lines = CueTable(lines)
+        number = len(self.tracks)
+        self.tracks.append(track)
+        for line, (start, _, text) in enumerate(lines.iter_ms()):
+            for term in _terms(text):
+                postings = self.postings.get(term)
+                if postings is None:
+                    postings = self.postings[term] = array("q")
+                postings.extend((number, line, start))
+        return number
+
+    def merge(self, other) -> None:
+        """
+        Add all tracks of another index.
+
+        Parameters
+        ----------
+        other
+            TextIndex or MappedTextIndex.
+
+        Returns
+        ----------
+        None
+        """
+        offset = len(self.tracks)
+        self.tracks.extend(other.tracks)
+        for term, postings in other.items():
+            mine = self.postings.get(term)
+            if mine is None:
+                mine = self.postings[term] = array("q")
+            moved = array("q", postings)
+            for position in range(0, len(moved), 3):
+                moved[position] += offset
+            mine.extend(moved)
+
+    def items(self):
+        """
+        Iterate over terms and their postings.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        ----------
+        Iterator of (term, postings) pairs.
+        """
+        return iter(self.postings.items())
+
+    def search(self, query: str) -> list:
+        """
+        Find lines containing all words of the
+        query, adjacent words stay adjacent.
+
+        Parameters
+        ----------
+        query
+            Searched words or phrase.
+
+        Returns
+        ----------
+        Hits sorted by track and line.
+        """
+        terms = _query_terms(query)
+        if not terms:
+            return []
+        found = None
+        for postings in sorted(
+            (self._postings(term) for term in terms), key=len
+        ):
+            keys = {}
+            for position in range(0, len(postings), 3):
+                key = (postings[position], postings[position + 1])
+                if found is None or key in found:
+                    keys[key] = postings[position + 2]
+            found = keys
+            if not found:
+                return []
+        return [
+            Hit(self.tracks[track], line, from_ms(start))
+            for (track, line), start in sorted(found.items())
+        ]
+
+    def save(self, path: str) -> None:
+        """
+        Write the index to a file,
+        which MappedTextIndex can open.
+
+        Parameters
+        ----------
+        path
+            Path of the file to write.
+
+        Returns
+        ----------
+        None
+        """
+        terms = sorted(self.postings)
+        tracks = [track.encode("utf-8") for track in self.tracks]
+        words = [term.encode("utf-8") for term in terms]
+        track_offsets = _offsets(len(blob) for blob in tracks)
+        term_offsets = _offsets(len(blob) for blob in words)
+        posting_offsets = _offsets(len(self.postings[t]) for t in terms)
+        with open(path, "wb") as f:
+            f.write(_HEADER.pack(
+                _MAGIC, _VERSION, _BYTE_ORDER, len(tracks), len(terms)
+            ))
+            track_offsets.tofile(f)
+            term_offsets.tofile(f)
+            posting_offsets.tofile(f)
+            _write_padded(f, b"".join(tracks))
+            _write_padded(f, b"".join(words))
+            for term in terms:
+                self.postings[term].tofile(f)
+
+    def _postings(self, term: str):
+        """
+        Get postings of a term.
+
+        Parameters
+        ----------
+        term
+            Indexed term.
+
+        Returns
+        ----------
+        Flat sequence of int64 postings.
+        """
+        return self.postings.get(term, ())
+
+
+class MappedTextIndex(TextIndex):
+    """
+    Index saved by TextIndex.save(), read
+    through mmap so it opens instantly.
+
+    Note
+    ----------
+    Terms are found by binary search in the
+    mapped file and postings are memoryview
+    slices of it, nothing is read up front.
+    """
+
+    def __init__(self, path: str) -> None:
+        """
+        Construct a class instance.
+
+        Parameters
+        ----------
+        path
+            Path to a saved index.
+
+        Returns
+        ----------
+        None
+        """
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._views = []
+        try:
+            self._read(path)
+        except BaseException:
+            self.close()
+            raise
+
+    def close(self) -> None:
+        """
+        Release the mapped file.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        ----------
+        None
+        """
+        for view in reversed(self._views):
+            view.release()
+        self._views = []
+        self._map.close()
+
+    def _read(self, path: str) -> None:
+        """
+        Validate the mapped file and take views of its sections.
+
+        Parameters
+        ----------
+        path
+            Path to a saved index.
+
+        Returns
+        ----------
+        None
+        """
+        size = len(self._map)
+        if size < _HEADER.size:
+            raise ValueError(f"Not a sublib text index: '{path}'")
+        magic, version, order, tracks, terms = _HEADER.unpack_from(self._map)
+        if magic != _MAGIC or version != _VERSION or order != _BYTE_ORDER:
+            raise ValueError(
+                f"Not a sublib text index of this platform: '{path}'"
+            )
+        position = _HEADER.size + (tracks + 2 * terms + 3) * 8
+        if position > size:
+            raise ValueError(
+                f"Truncated text index: {tracks} tracks and "
+                f"{terms} terms expected"
+            )
+        view = memoryview(self._map)
+        self._views.append(view)
+        ints = view[_HEADER.size:position].cast("q")
+        self._views.append(ints)
+        self._track_offsets = ints[:tracks + 1]
+        self._term_offsets = ints[tracks + 1:tracks + terms + 2]
+        self._posting_offsets = ints[tracks + terms + 2:]
+        self._views.extend((
+            self._track_offsets, self._term_offsets, self._posting_offsets
+        ))
+        track_size = self._track_offsets[-1]
+        term_size = self._term_offsets[-1]
+        posting_count = self._posting_offsets[-1]
+        if self._track_offsets[0] != 0 or self._term_offsets[0] != 0 \
+                or self._posting_offsets[0] != 0 or track_size < 0 \
+                or term_size < 0 or posting_count < 0 \
+                or position + _padded(track_size) + _padded(term_size) \
+                + posting_count * 8 > size:
+            raise ValueError("Truncated text index: offsets out of range")
+        self._track_blob = view[position:position + track_size]
+        position += _padded(track_size)
+        self._term_blob = view[position:position + term_size]
+        position += _padded(term_size)
+        self._postings_view = view[
+            position:position + posting_count * 8
+        ].cast("q")
+        self._views.extend((
+            self._track_blob, self._term_blob, self._postings_view
+        ))
+        self._terms = terms
+        self.tracks = [
+            bytes(self._track_blob[start:end]).decode("utf-8")
+            for start, end in zip(self._track_offsets, self._track_offsets[1:])
+        ]
+
+    def add(self, lines, track: str) -> int:
+        """
+        Not supported, merge into a TextIndex.
+        """
+        raise TypeError("MappedTextIndex is read-only")
+
+    def merge(self, other) -> None:
+        """
+        Not supported, merge into a TextIndex.
+        """
+        raise TypeError("MappedTextIndex is read-only")
+
+    def items(self):
+        """
+        Iterate over terms and their postings.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        ----------
+        Iterator of (term, postings) pairs.
+        """
+        for number in range(self._terms):
+            yield self._term(number).decode("utf-8"), self._slice(number)
+
+    def save(self, path: str) -> None:
+        """
+        Not supported, merge into a TextIndex.
+        """
+        raise TypeError("MappedTextIndex is already saved")
+
+    def _term(self, number: int) -> bytes:
+        """
+        Get an encoded term by its number.
+        """
+        offsets = self._term_offsets
+        return bytes(self._term_blob[offsets[number]:offsets[number + 1]])
+
+    def _slice(self, number: int):
+        """
+        Get postings of a term by its number.
+        """
+        offsets = self._posting_offsets
+        return self._postings_view[offsets[number]:offsets[number + 1]]
+
+    def _postings(self, term: str):
+        """
+        Get postings of a term.
+
+        Parameters
+        ----------
+        term
+            Indexed term.
+
+        Returns
+        ----------
+        Flat sequence of int64 postings.
+        """
+        encoded = term.encode("utf-8")
+        number = bisect_left(_TermList(self), encoded)
+        if number < self._terms and self._term(number) == encoded:
+            return self._slice(number)
+        return ()
+
+
+class _TermList:
+    """
+    Sequence view of mapped terms for bisect.
+    """
+
+    def __init__(self, index: MappedTextIndex) -> None:
+        self.index = index
+
+    def __len__(self) -> int:
+        return self.index._terms
+
+    def __getitem__(self, number: int) -> bytes:
+        return self.index._term(number)
+
+
+def _offsets(lengths) -> array:
+    """
+    Get running offsets from lengths,
+    starting with zero.
+    """
+    offsets = array("q", [0])
+    for length in lengths:
+        offsets.append(offsets[-1] + length)
+    return offsets
+
+
+def _padded(length: int) -> int:
+    """
+    Round a length up to a multiple of 8.
+    """
+    return (length + 7) // 8 * 8
+
+
+def _write_padded(f, blob: bytes) -> None:
+    """
+    Write bytes followed by zero padding
+    up to a multiple of 8.
+    """
+    f.write(blob)
+    f.write(bytes(_padded(len(blob)) - len(blob)))
@@ -0,0 +1,476 @@
+"""
+Immutable, hashable snapshots of lines
+in general format, edited by copy-on-write.
+"""
+
+from array import array
+from bisect import bisect_right
+
+from sublib.cuetable import CueTable, iter_ms
+from sublib.timestamp import from_ms
+
+
+CHUNK_SIZE = 1024
+
+
+class _Chunk:
+    """
+    Read-only run of consecutive lines.
+    """
+
+    __slots__ = ("starts", "ends", "texts")
+
+    def __init__(self, starts, ends, texts) -> None:
+        self.starts = memoryview(array("q", starts).tobytes()).cast("q")
+        self.ends = memoryview(array("q", ends).tobytes()).cast("q")
+        self.texts = tuple(texts)
+
+    def __len__(self) -> int:
+        return len(self.texts)
+
+    def rows(self, start: int = 0, stop: int = None):
+        """
+        Yield (start ms, end ms, text) tuples of a range.
+        """
+        return zip(
+            self.starts[start:stop], self.ends[start:stop],
+            self.texts[start:stop]
+        )
+
+
+class TrackSnapshot:
+    """
+    Represent lines in general format
+    as an immutable, hashable value.
+
+    Note
+    ----------
+    Lines are kept in read-only chunks of up to
+    CHUNK_SIZE lines. Editing methods return a new
+    snapshot which shares every chunk the edit does
+    not touch, so an edit copies only the affected
+    range. Nothing is ever changed in place, so a
+    snapshot can be shared between threads without
+    locks.
+    """
+
+    __slots__ = ("_chunks", "_offsets", "_hash")
+
+    def __init__(self, lines=()) -> None:
+        """
+        Construct a class instance.
+
+        Parameters
+        ----------
+        lines
+            Lines in general format, a CueTable
+            or another snapshot.
+
+        Returns
+        ----------
+        None
+        """
+        if isinstance(lines, TrackSnapshot):
+            chunks = lines._chunks
+        else:
+            chunks = _split(iter_ms(lines))
+        self._set(chunks)
+
+    @classmethod
+    def _from_chunks(cls, chunks) -> "TrackSnapshot":
+        """
+        Construct a snapshot sharing given chunks.
+
+        Parameters
+        ----------
+        chunks
+            Non-empty _Chunk objects in order.
+
+        Returns
+        ----------
+        New snapshot.
+        """
+        snapshot = cls.__new__(cls)
+        snapshot._set(chunks)
+        return snapshot
+
+    def _set(self, chunks) -> None:
+        """
+        Initialize chunks and their offsets.
+
+        Parameters
+        ----------
+        chunks
+            _Chunk objects in order.
+
+        Returns
+        ----------
+        None
+        """
+        self._chunks = tuple(chunk for chunk in chunks if len(chunk))
+        offsets = [0]
+        for chunk in self._chunks:
+            offsets.append(offsets[-1] + len(chunk))
+        self._offsets = tuple(offsets)
+        self._hash = None
+
+    def __repr__(self) -> str:
+        """
+        Specifies how repr() is displayed.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        ----------
+        TrackSnapshot(lines=number of lines)
+        """
+        return f"{self.__class__.__name__}(lines={len(self)})"
+
+    def __len__(self) -> int:
+        """
+        Specifies what len() return.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        ----------
+        Number of lines.
+        """
+        return self._offsets[-1]
+
+    def __getitem__(self, index):
+        """
+        Get a line or a slice of lines.
+
+        Parameters
+        ----------
+        index
+            Line number or slice.
+
+        Returns
+        ----------
+        Line in general format or a new snapshot,
+        which shares whole chunks of a contiguous slice.
+        """
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step != 1:
+                return TrackSnapshot(
+                    self[number] for number in range(start, stop, step)
+                )
+            return self._from_chunks(self._range(start, max(start, stop)))
+        chunk, position = self._locate(index)
+        return [
+            from_ms(chunk.starts[position]),
+            from_ms(chunk.ends[position]),
+            chunk.texts[position]
+        ]
+
+    def __iter__(self):
+        """
+        Iterate over lines in general format.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        ----------
+        Iterator of lines in general format.
+        """
+        for start, end, text in self.iter_ms():
+            yield [from_ms(start), from_ms(end), text]
+
+    def __eq__(self, other) -> bool:
+        """
+        Specifies whether snapshots are equal,
+        lists of lines in general format
+        and CueTable objects are compared too.
+
+        Parameters
+        ----------
+        other
+            Object to compare.
+
+        Returns
+        ----------
+        Whether all lines are equal.
+        """
+        if isinstance(other, TrackSnapshot):
+            if self._chunks == other._chunks:
+                return True
+            return len(self) == len(other) and self._columns() == \
+                other._columns()
+        try:
+            if len(other) != len(self):
+                return False
+            return all(a == b for a, b in zip(self, other))
+        except TypeError:
+            return NotImplemented
+
+    def __reduce__(self) -> tuple:
+        """
+        Specifies how pickle stores a snapshot.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        ----------
+        Class and its arguments.
+        """
+        return self.__class__, (self.to_table(),)
+
+    def __hash__(self) -> int:
+        """
+        Specifies what hash() return,
+        computed once per snapshot.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        ----------
+        Hash of all lines.
+        """
+        if self._hash is None:
+            self._hash = hash(self._columns())
+        return self._hash
+
+    def iter_ms(self):
+        """
+        Yield lines with times in milliseconds.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        ----------
+        Iterator of (start ms, end ms, text) tuples.
+        """
+        for chunk in self._chunks:
+            yield from chunk.rows()
+
+    def to_table(self) -> CueTable:
+        """
+        Get an editable copy of all lines.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        ----------
+        Lines in general format as a CueTable.
+        """
+        table = CueTable()
+        for chunk in self._chunks:
+            table.starts.frombytes(chunk.starts.tobytes())
+            table.ends.frombytes(chunk.ends.tobytes())
+            table.texts.extend(chunk.texts)
+        return table
+
+    def replace(self, start: int, stop: int, lines=()) -> "TrackSnapshot":
+        """
+        Get a snapshot with a range of lines
+        replaced by other lines.
+
+        Parameters
+        ----------
+        start
+            First replaced line number.
+        stop
+            Line number after the last replaced one.
+        lines
+            New lines in general format.
+
+        Returns
+        ----------
+        New snapshot, chunks outside
+        the range are shared.
+        """
+        start, stop, _ = slice(start, stop).indices(len(self))
+        stop = max(start, stop)
+        chunks, offsets = self._chunks, self._offsets
+        first = bisect_right(offsets, start) - 1
+        last = bisect_right(offsets, stop - 1) - 1 if stop > start else first
+        if first == len(chunks) and chunks:
+            first = last = first - 1
+        rows = []
+        if first < len(chunks):
+            rows.extend(chunks[first].rows(0, start - offsets[first]))
+        rows.extend(iter_ms(lines))
+        if last < len(chunks):
+            rows.extend(chunks[last].rows(stop - offsets[last]))
+        return self._from_chunks(
+            chunks[:first] + _split(rows) + chunks[last + 1:]
+        )
+
+    def set(self, index: int, line) -> "TrackSnapshot":
+        """
+        Get a snapshot with one line replaced.
+
+        Parameters
+        ----------
+        index
+            Line number.
+        line
+            New line in general format.
+
+        Returns
+        ----------
+        New snapshot.
+        """
+        index = range(len(self))[index]
+        return self.replace(index, index + 1, [line])
+
+    def insert(self, index: int, lines) -> "TrackSnapshot":
+        """
+        Get a snapshot with lines inserted.
+
+        Parameters
+        ----------
+        index
+            Line number of the first inserted line.
+        lines
+            New lines in general format.
+
+        Returns
+        ----------
+        New snapshot.
+        """
+        return self.replace(index, index, lines)
+
+    def delete(self, start: int, stop: int = None) -> "TrackSnapshot":
+        """
+        Get a snapshot without a range of lines.
+
+        Parameters
+        ----------
+        start
+            First removed line number.
+        stop
+            Line number after the last removed one,
+            only the first one is removed when omitted.
+
+        Returns
+        ----------
+        New snapshot.
+        """
+        if stop is None:
+            start = range(len(self))[start]
+            stop = start + 1
+        return self.replace(start, stop)
+
+    def append(self, lines) -> "TrackSnapshot":
+        """
+        Get a snapshot with lines added at the end.
+
+        Parameters
+        ----------
+        lines
+            New lines in general format.
+
+        Returns
+        ----------
+        New snapshot, only the last chunk is copied.
+        """
+        return self.replace(len(self), len(self), lines)
+
+    def _locate(self, index: int) -> tuple:
+        """
+        Find the chunk of a line.
+
+        Parameters
+        ----------
+        index
+            Line number, negative ones included.
+
+        Returns
+        ----------
+        (chunk, position in chunk) tuple.
+        """
+        index = range(len(self))[index]
+        number = bisect_right(self._offsets, index) - 1
+        return self._chunks[number], index - self._offsets[number]
+
+    def _range(self, start: int, stop: int) -> list:
+        """
+        Get chunks of a range of lines, whole
+        chunks are shared, partial ones copied.
+
+        Parameters
+        ----------
+        start
+            First line number.
+        stop
+            Line number after the last one.
+
+        Returns
+        ----------
+        _Chunk objects.
+        """
+        chunks = []
+        for number, chunk in enumerate(self._chunks):
+            offset = self._offsets[number]
+            low, high = max(start - offset, 0), min(stop - offset, len(chunk))
+            if low >= high:
+                continue
+            if low == 0 and high == len(chunk):
+                chunks.append(chunk)
+            else:
+                chunks.extend(_split(chunk.rows(low, high)))
+        return chunks
+
+    def _columns(self) -> tuple:
+        """
+        Get all lines as three
+        hashable columns.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        ----------
+        (starts bytes, ends bytes, texts tuple) tuple.
+        """
+        return (
+            b"".join(chunk.starts.tobytes() for chunk in self._chunks),
+            b"".join(chunk.ends.tobytes() for chunk in self._chunks),
+            tuple(text for chunk in self._chunks for text in chunk.texts)
+        )
+
+
+def _split(rows) -> tuple:
+    """
+    Pack rows into chunks of up to CHUNK_SIZE lines.
+
+    Parameters
+    ----------
+    rows
+        Iterable of (start ms, end ms, text) tuples.
+
+    Returns
+    ----------
+    _Chunk objects.
+    """
+    chunks = []
+    starts, ends, texts = [], [], []
+    for start, end, text in rows:
+        starts.append(start)
+        ends.append(end)
+        texts.append(text)
+        if len(texts) == CHUNK_SIZE:
+            chunks.append(_Chunk(starts, ends, texts))
+            starts, ends, texts = [], [], []
+    if texts:
+        chunks.append(_Chunk(starts, ends, texts))
+    return tuple(chunks)
@@ -1,46 +1,361 @@
+import asyncio
+import concurrent.futures
+import copy
+import functools
+import io
+import os
 import re
 import sys
-import datetime
+from fractions import Fraction
+
+from sublib import charset, markup, metrics
+from sublib.cuetable import CueTable, iter_ms
+from sublib.fingerprint import Fingerprint, fingerprint
+from sublib.intervals import CueIndex
+from sublib.snapshot import TrackSnapshot
+from sublib.timestamp import (
+    from_ms, parse_srt, format_srt, parse_hms, format_hms,
+    frames_to_ms, ms_to_frames, deciseconds_to_ms, ms_to_deciseconds
+)
 
 
 # Functions
 
 
-def detect(path: str, encoding: str) -> str:
+_SNIFF_SIZE = 64 * 1024
+
+_CONFIDENT_MATCHES = 3
+
+_CHUNK_LINES = 50000
+
+_FORMAT_PATTERN = re.compile(
+    r"^(?:"
+    r"(?P<mpl>\[[0-9]+\]\[[0-9]+\] .*)"
+    r"|(?P<srt>[0-9]+\r?\n[0-9]{2}:[0-9]{2}:[0-9]{2},[0-9]{3} "
+    r"--> [0-9]{2}:[0-9]{2}:[0-9]{2},[0-9]{3}.*)"
+    r"|(?P<sub>{[0-9]+}{[0-9]*}.*)"
+    r"|(?P<tmp>[0-9]+:[0-9]+:[0-9]+:.*)"
+    r")$",
+    re.MULTILINE
+)
+
+
+def _read_sample(path, encoding: str, size: int) -> str:
+    """
+    Read and decode a bounded prefix of the source.
+
+    Parameters
+    ----------
+    path
+        Path, raw bytes or an open file object.
+    encoding
+        Representation of encoding type,
+        "auto" to detect it from the prefix.
+    size
+        Maximum number of bytes to read.
+
+    Returns
+    ----------
+    Decoded prefix of the source.
+    """
+    if isinstance(path, (bytes, bytearray, memoryview)):
+        sample = bytes(path[:size])
+    elif hasattr(path, "read"):
+        sample = path.read(size)
+    else:
+        with open(path, "rb") as f:
+            sample = f.read(size)
+    if isinstance(sample, bytes):
+        if encoding == "auto":
+            encoding = charset.sniff(sample, size=size)
+        sample = sample.decode(encoding, errors="ignore")
+    return sample.lstrip("\ufeff")
+
+
+def detect_scores(path, encoding: str = "utf-8",
+                  size: int = _SNIFF_SIZE) -> dict:
+    """
+    Score every known format against
+    a bounded prefix of the source.
+
+    Parameters
+    ----------
+    path
+        Path, raw bytes or an open file object.
+    encoding
+        Representation of encoding type,
+        "auto" to detect it from the prefix.
+    size
+        Maximum number of bytes to inspect.
+
+    Returns
+    ----------
+    Confidence from 0.0 to 1.0 for each format.
+    """
+    with metrics.stage("detect") as record:
+        sample = _read_sample(path, encoding, size)
+        counts = dict.fromkeys(FORMATS, 0)
+        for match in _FORMAT_PATTERN.finditer(sample):
+            found = match.lastgroup
+            counts[found] += 1
+            if counts[found] >= _CONFIDENT_MATCHES:
+                break
+        total = sum(counts.values())
+        record.add(cues=total)
+    return {
+        name: count / total if total else 0.0
+        for name, count in counts.items()
+    }
+
+
+def detect(path, encoding: str = "utf-8", size: int = _SNIFF_SIZE) -> str:
     """
     Specifies the subtitle format.
 
     Parameters
     ----------
     path
-        Path to a textual subtitle file.
+        Path to a textual subtitle file,
+        its raw bytes or an open file object.
     encoding
-        Representation of encoding type.
+        Representation of encoding type,
+        "auto" to detect it from the prefix.
+    size
+        Maximum number of bytes to inspect.
 
     Returns
     ----------
     Detected format.
     """
-    with open(path, "rt", encoding=encoding, errors="ignore") as f:
-        content = f.read()
-    regex_mpl = "\\[[0-9]+\\]\\[[0-9]+\\] .*\n"
-    regex_srt = "[0-9]+\n[0-9]{2}:[0-9]{2}:[0-9]{2},[0-9]{3} "\
-                "--> [0-9]{2}:[0-9]{2}:[0-9]{2},[0-9]{3}\n.*\n\n"
-    regex_sub = "{[0-9]+}{[0-9]+}.*\n"
-    regex_tmp = "[0-9]+:[0-9]+:[0-9]+:.*\n"
-    if re.findall(regex_mpl, content):
-        found = "mpl"
-    elif re.findall(regex_srt, content):
-        found = "srt"
-    elif re.findall(regex_sub, content):
-        found = "sub"
-    elif re.findall(regex_tmp, content):
-        found = "tmp"
-    else:
+    scores = detect_scores(path, encoding, size)
+    found = max(FORMATS, key=lambda name: scores[name])
+    if not scores[found]:
         found = "undefined"
     return found
 
 
+def convert(source: str, target: str, to, encoding: str = "utf-8",
+            target_encoding: str = "", source_format=None) -> int:
+    """
+    Convert a subtitle file to another format
+    line by line, without loading it whole.
+
+    Parameters
+    ----------
+    source
+        Path to a textual subtitle file.
+    target
+        Path of the file to write.
+    to
+        Target format name, class or instance,
+        e.g. "srt", SubRip or MicroDVD(fps=25).
+    encoding
+        Representation of source encoding type,
+        "auto" to detect it.
+    target_encoding
+        Representation of target encoding type,
+        same as source when omitted.
+    source_format
+        Source format name, class or instance,
+        detected when omitted.
+
+    Returns
+    ----------
+    Number of converted lines.
+    """
+    if _same_file(source, target):
+        raise ValueError("target would overwrite the source file")
+    if encoding == "auto" or source_format is None:
+        with open(source, "rb") as f:
+            sample = f.read(_SNIFF_SIZE)
+        if encoding == "auto":
+            encoding = charset.sniff(sample)
+        if source_format is None:
+            source_format = detect(sample, encoding)
+    reader = _format_instance(source_format, encoding)
+    writer = _format_instance(to, target_encoding or encoding)
+    with open(source, "rt", encoding=encoding, errors="ignore") as src, \
+            open(target, "wt", encoding=target_encoding or encoding) as dst, \
+            metrics.stage("convert", type(reader).__name__) as record:
+        count = writer.write_cues(reader._iter_parsed(src), dst)
+        record.add(cues=count, bytes=os.fstat(src.fileno()).st_size)
+        return count
+
+
+def _same_file(source: str, target: str) -> bool:
+    """
+    Check whether two paths name the same file.
+
+    Parameters
+    ----------
+    source
+        Path to an existing file.
+    target
+        Path of a file, possibly not existing yet.
+
+    Returns
+    ----------
+    True when writing target would truncate source.
+    """
+    if os.path.abspath(source) == os.path.abspath(target):
+        return True
+    return os.path.exists(target) and os.path.samefile(source, target)
+
+
+def load(path: str, encoding: str = "auto", fmt=None,
+         **kwargs) -> "Subtitle":
+    """
+    Read a subtitle file once, detecting its
+    encoding and format from the same bytes.
+
+    Parameters
+    ----------
+    path
+        Path to a textual subtitle file.
+    encoding
+        Representation of encoding type,
+        "auto" to detect it.
+    fmt
+        Format name or class, detected when omitted.
+    kwargs
+        Format options, e.g. fps of MicroDVD.
+
+    Returns
+    ----------
+    Subtitle object of the format.
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+    if encoding == "auto":
+        encoding = charset.sniff(data)
+    if fmt is None:
+        fmt = detect(data, encoding)
+    if isinstance(fmt, str):
+        if fmt not in FORMATS:
+            raise ValueError(f"Unsupported subtitle format: '{fmt}'")
+        fmt = FORMATS[fmt]
+    subtitle = fmt(**kwargs)
+    subtitle.path = path
+    subtitle.encoding = encoding
+    with metrics.stage("read", fmt.__name__) as record:
+        subtitle.content = _content(
+            io.StringIO(charset.decode(data, encoding), newline=None)
+        )
+        record.add(bytes=len(data))
+    return subtitle
+
+
+def _content(f) -> list:
+    """
+    Split text into content entries,
+    empty lines are kept as line breaks.
+
+    Parameters
+    ----------
+    f
+        Open text file or stream.
+
+    Returns
+    ----------
+    Content entries.
+    """
+    return [
+        line.rstrip("\n") if line != "\n" else line
+        for line in f.readlines()
+    ]
+
+
+def _format_instance(fmt, encoding: str) -> "Subtitle":
+    """
+    Get an empty object of the given format.
+
+    Parameters
+    ----------
+    fmt
+        Format name, class or instance.
+    encoding
+        Representation of encoding type.
+
+    Returns
+    ----------
+    Subtitle object.
+    """
+    if isinstance(fmt, Subtitle):
+        return fmt
+    if isinstance(fmt, str):
+        if fmt not in FORMATS:
+            raise ValueError(f"Unsupported subtitle format: '{fmt}'")
+        fmt = FORMATS[fmt]
+    return fmt(encoding=encoding)
+
+
+def _with_line_breaks(entries):
+    """
+    Yield content entries, each ending
+    with exactly one line break.
+
+    Parameters
+    ----------
+    entries
+        Iterable of content entries.
+
+    Returns
+    ----------
+    Iterator of entries.
+    """
+    for entry in entries:
+        yield entry if entry.endswith("\n") else entry + "\n"
+
+
+def _writelines(f, entries, encoding: str) -> None:
+    """
+    Write content entries to a text
+    or binary file in a single call.
+
+    Parameters
+    ----------
+    f
+        File open for writing.
+    entries
+        Iterable of content entries.
+    encoding
+        Representation of encoding type,
+        used for binary files.
+
+    Returns
+    ----------
+    None
+    """
+    entries = _with_line_breaks(entries)
+    if isinstance(f, (io.RawIOBase, io.BufferedIOBase)) or \
+            "b" in getattr(f, "mode", ""):
+        entries = (entry.encode(encoding) for entry in entries)
+    f.writelines(entries)
+
+
+def _parse_chunk(reader: "Subtitle", first: int, lines: list) -> bytes:
+    """
+    Parse a chunk of raw lines in a worker process.
+
+    Parameters
+    ----------
+    reader
+        Subtitle object without content,
+        carrying format settings.
+    first
+        Number of raw lines before the chunk,
+        so errors report lines of the file.
+    lines
+        Raw lines of the chunk.
+
+    Returns
+    ----------
+    Serialized CueTable.
+    """
+    reader._first_line = first
+    return CueTable.from_ms(reader._styled(reader._parse(lines))).to_bytes()
+
+
 # Classes
 
 
@@ -59,7 +374,11 @@ class Subtitle:
 
     encoding = ""
 
-    content = []
+    dialect = None
+
+    _cache = None
+
+    _first_line = 0
 
     def __init__(self, path: str = "", encoding: str = "") -> None:
         """
@@ -70,7 +389,8 @@ class Subtitle:
         path
             Path to a textual subtitle file.
         encoding
-            Representation of encoding type.
+            Representation of encoding type,
+            "auto" to detect it.
 
         Returns
         ----------
@@ -78,16 +398,74 @@ class Subtitle:
         """
         self.path = path
         self.encoding = encoding
+        self.content = []
         if self.path != "" and self.encoding != "":
-            try:
-                with open(path, "rt", encoding=encoding, errors="ignore") as f:
-                    self.content = [
-                        line.rstrip("\n")
-                        if line != "\n" else line
-                        for line in f.readlines()
-                    ]
-            except Exception:
-                print(sys.exc_info())
+            with metrics.stage("read", type(self).__name__) as record:
+                try:
+                    if encoding == "auto":
+                        with open(path, "rb") as f:
+                            data = f.read()
+                        self.encoding = charset.sniff(data)
+                        self.content = _content(io.StringIO(
+                            charset.decode(data, self.encoding),
+                            newline=None
+                        ))
+                        record.add(bytes=len(data))
+                    else:
+                        with open(path, "rt", encoding=encoding,
+                                  errors="ignore") as f:
+                            self.content = _content(f)
+                            record.add(bytes=os.fstat(f.fileno()).st_size)
+                except Exception:
+                    record.add(errors=1)
+                    print(sys.exc_info())
+
+    @classmethod
+    async def aload(cls, path: str, encoding: str, executor=None,
+                    **kwargs) -> "Subtitle":
+        """
+        Construct a class instance in an executor,
+        without blocking the event loop.
+
+        Parameters
+        ----------
+        path
+            Path to a textual subtitle file.
+        encoding
+            Representation of encoding type,
+            "auto" to detect it.
+        executor
+            concurrent.futures executor,
+            default one of the loop when omitted.
+        kwargs
+            Other arguments of the class, e.g. fps.
+
+        Returns
+        ----------
+        Class instance.
+        """
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(
+            executor, functools.partial(cls, path, encoding, **kwargs)
+        )
+
+    async def aget_general_format(self, executor=None) -> CueTable:
+        """
+        Get object content converted to general
+        format, parsing it in an executor.
+
+        Parameters
+        ----------
+        executor
+            concurrent.futures executor,
+            default one of the loop when omitted.
+
+        Returns
+        ----------
+        Lines in general format as a CueTable.
+        """
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(executor, self.get_general_format)
 
     def __str__(self) -> str:
         """
@@ -158,9 +536,32 @@ class Subtitle:
 
         Returns
         ----------
-        Number of lines in file.
+        Number of lines in general format,
+        number of content entries for
+        the generic class.
+        """
+        if self._generic():
+            return len(self.content)
+        return len(self._cached_table())
+
+    def __getitem__(self, index):
+        """
+        Get a line or a slice of lines,
+        parsing the content only once.
+
+        Parameters
+        ----------
+        index
+            Line number or slice.
+
+        Returns
+        ----------
+        Line in general format or a CueTable,
+        content entries for the generic class.
         """
-        return len(self.content)
+        if self._generic():
+            return self.content[index]
+        return self._cached_table()[index]
 
     def __contains__(self, item: str) -> bool:
         """
@@ -176,16 +577,244 @@ class Subtitle:
         ----------
         Whether the string is found.
         """
-        for line in self.content:
-            if item not in line:
-                continue
-            else:
-                return True
+        return any(item in line for line in self.content)
+
+    def __iter__(self):
+        """
+        Iterate over lines in general format,
+        every call gives an independent iterator.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        ----------
+        Iterator of lines in general format,
+        of content entries for the generic class.
+        """
+        if self._generic():
+            return iter(self.content)
+        return iter(self._cached_table())
+
+    def iter_cues(self, source=None, spans: bool = False):
+        """
+        Parse lines lazily and yield
+        them one by one in general format.
+
+        Parameters
+        ----------
+        source
+            Path or open text file to stream from,
+            object content is used when omitted.
+        spans
+            Whether to keep styling as a fourth
+            item, a list of markup.Span objects
+            indexing the line text.
+
+        Returns
+        ----------
+        Iterator of lines in general format.
+        """
+        if spans:
+            for start, end, text, found in self._iter_parsed(source, True):
+                yield [from_ms(start), from_ms(end), text, found]
+        else:
+            for start, end, text in self._iter_parsed(source):
+                yield [from_ms(start), from_ms(end), text]
+
+    def get_general_format(self, workers: int = None) -> CueTable:
+        """
+        Get object content and return
+        converted to general format.
+
+        Parameters
+        ----------
+        workers
+            Number of processes parsing chunks
+            of large content in parallel,
+            one process when omitted.
+
+        Returns
+        ----------
+        Lines in general format as a CueTable.
+
+        Note
+        ----------
+        Unlike the list returned before, items of the
+        table are copies: changing a line in place does
+        not change the table, assign it back instead,
+        or use to_list() for a list of lists.
+        """
+        chunks = self._chunks(workers or 1)
+        if len(chunks) < 2:
+            return CueTable.from_ms(self._iter_parsed())
+        reader = copy.copy(self)
+        reader.content = []
+        reader._cache = None
+        firsts = [0]
+        for chunk in chunks[:-1]:
+            firsts.append(firsts[-1] + len(chunk))
+        table = CueTable()
+        with metrics.stage("parse", type(self).__name__) as record, \
+                concurrent.futures.ProcessPoolExecutor(workers) as executor:
+            for data in executor.map(
+                functools.partial(_parse_chunk, reader), firsts, chunks
+            ):
+                part = CueTable.from_bytes(data)
+                table.starts.extend(part.starts)
+                table.ends.extend(part.ends)
+                table.texts.extend(part.texts)
+            record.add(cues=len(table))
+        return table
+
+    def set_from_general_format(self, lines: list) -> None:
+        """
+        Convert given lines to specified
+        format and set as object content.
+
+        Parameters
+        ----------
+        lines
+            Lines in general format or a CueTable,
+            they are left unchanged.
+
+        Returns
+        ----------
+        None
+        """
+        self.content = self._header() + list(metrics.iterate(
+            "render", type(self).__name__, (
+                self._render(num, start, end, text)
+                for num, (start, end, text) in enumerate(iter_ms(lines), 1)
+            )
+        ))
+        self._cache = None
+
+    def index(self) -> CueIndex:
+        """
+        Get the time index of object lines,
+        built once and cached until the content
+        is replaced.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        ----------
+        Time index of lines in general format.
+        """
+        return self._cached(
+            "index", lambda: CueIndex(self._cached_table())
+        )
+
+    def snapshot(self) -> TrackSnapshot:
+        """
+        Get an immutable copy of object lines,
+        built once and cached until the content
+        is replaced.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        ----------
+        Lines in general format as a TrackSnapshot,
+        safe to share between threads.
+        """
+        return self._cached(
+            "snapshot", lambda: TrackSnapshot(self._cached_table())
+        )
+
+    def fingerprint(self) -> Fingerprint:
+        """
+        Get the fingerprint of object lines,
+        computed once and cached until the content
+        is replaced.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        ----------
+        Fingerprint of lines in general format, equal
+        for the same subtitles in any format.
+        """
+        return self._cached(
+            "fingerprint", lambda: fingerprint(self._cached_table())
+        )
+
+    def at(self, time) -> list:
+        """
+        Get lines displayed at a given time.
+
+        Parameters
+        ----------
+        time
+            Timedelta or milliseconds.
+
+        Returns
+        ----------
+        Lines in general format.
+        """
+        table = self._cached_table()
+        return [table[num] for num in self.index().at(time)]
+
+    def between(self, start, end) -> list:
+        """
+        Get lines displayed at any moment
+        of a given time range.
+
+        Parameters
+        ----------
+        start
+            Timedelta or milliseconds, inclusive.
+        end
+            Timedelta or milliseconds, exclusive.
 
-    def __iter__(self) -> "Subtitle":
+        Returns
+        ----------
+        Lines in general format.
+        """
+        table = self._cached_table()
+        return [table[num] for num in self.index().between(start, end)]
+
+    def _cached(self, name: str, build):
+        """
+        Get a value derived from object content,
+        building it when missing or outdated.
+
+        Parameters
+        ----------
+        name
+            Name of the value.
+        build
+            Function building the value.
+
+        Returns
+        ----------
+        Cached value.
+
+        Note
+        ----------
+        Values are dropped when "content" is replaced,
+        changing it in place is not detected.
         """
-        Specifies preparations for
-        being an iterator.
+        if self._cache is None or self._cache[0] is not self.content:
+            self._cache = (self.content, {})
+        values = self._cache[1]
+        if name not in values:
+            values[name] = build()
+        return values[name]
+
+    def _generic(self) -> bool:
+        """
+        Check whether the object defines no
+        subtitle format, so its content
+        cannot be parsed.
 
         Parameters
         ----------
@@ -193,15 +822,14 @@ class Subtitle:
 
         Returns
         ----------
-        Iterator of itself.
+        Whether the class has no _parse().
         """
-        self.__line__ = 0
-        return self
+        return type(self)._parse is Subtitle._parse
 
-    def __next__(self) -> str:
+    def _cached_table(self) -> CueTable:
         """
-        Specifies the behavior of
-        an object as an iterator.
+        Get the cached general format, which
+        must not be changed by the caller.
 
         Parameters
         ----------
@@ -209,11 +837,305 @@ class Subtitle:
 
         Returns
         ----------
-        Specified line.
+        Lines in general format as a CueTable.
         """
-        line = self.content[self.__line__]
-        self.__line__ += 1
-        return line
+        return self._cached("table", self.get_general_format)
+
+    def write_to(self, f) -> None:
+        """
+        Write object content to an open file.
+
+        Parameters
+        ----------
+        f
+            Text or binary file open for writing,
+            e.g. io.StringIO or io.BytesIO.
+
+        Returns
+        ----------
+        None
+        """
+        with metrics.stage("write", type(self).__name__):
+            _writelines(f, self.content, self.encoding or "utf-8")
+
+    def save(self, path: str, encoding: str = "",
+             newline: str = None) -> None:
+        """
+        Write object content to a file.
+
+        Parameters
+        ----------
+        path
+            Path of the file to write.
+        encoding
+            Representation of encoding type,
+            object encoding is used when omitted.
+        newline
+            Line break written, system default when omitted.
+
+        Returns
+        ----------
+        None
+        """
+        with open(path, "wt", encoding=encoding or self.encoding or "utf-8",
+                  newline=newline) as f:
+            self.write_to(f)
+
+    def write_cues(self, lines, target, encoding: str = "") -> int:
+        """
+        Convert lines to specified format and write
+        them one by one, without setting object content.
+
+        Parameters
+        ----------
+        lines
+            Iterable of lines in general format.
+        target
+            Path or file open for writing.
+        encoding
+            Representation of encoding type,
+            object encoding is used when omitted.
+
+        Returns
+        ----------
+        Number of written lines.
+        """
+        encoding = encoding or self.encoding or "utf-8"
+        if not hasattr(target, "write"):
+            with open(target, "wt", encoding=encoding) as f:
+                return self.write_cues(lines, f, encoding)
+        count = 0
+
+        def entries():
+            nonlocal count
+            yield from self._header()
+            for count, (start, end, text) in enumerate(iter_ms(lines), 1):
+                yield self._render(count, start, end, text)
+
+        with metrics.stage("write", type(self).__name__) as record:
+            _writelines(target, entries(), encoding)
+            record.add(cues=count)
+        return count
+
+    def _iter_parsed(self, source=None, spans: bool = False):
+        """
+        Yield parsed lines from the object
+        content, a path or an open text file.
+
+        Parameters
+        ----------
+        source
+            Path or open text file to stream from,
+            object content is used when omitted.
+        spans
+            Whether to split styling into spans
+            instead of removing it.
+
+        Returns
+        ----------
+        Iterator of (start ms, end ms, text) tuples,
+        with spans as a fourth item if requested.
+        """
+        if source is None:
+            yield from self._styled(self._parse(self._raw_lines()), spans)
+        elif hasattr(source, "read"):
+            yield from self._styled(self._parse(source), spans)
+        else:
+            with open(source, "rt", encoding=self.encoding or "utf-8",
+                      errors="ignore") as f:
+                yield from self._styled(self._parse(f), spans)
+
+    def _styled(self, parsed, spans: bool = False):
+        """
+        Remove styling from texts of parsed
+        lines in one pass per text.
+
+        Parameters
+        ----------
+        parsed
+            Iterator of (start ms, end ms, raw text).
+        spans
+            Whether to split styling into spans
+            instead of removing it.
+
+        Returns
+        ----------
+        Iterator of (start ms, end ms, text) tuples,
+        with spans as a fourth item if requested.
+        """
+        dialect = self.dialect
+        if spans:
+            parsed = (
+                (start, end) + markup.spans(text, dialect)
+                for start, end, text in parsed
+            )
+        elif dialect is not None:
+            strip = self._strip_styles
+            parsed = (
+                (start, end, strip(text)) for start, end, text in parsed
+            )
+        return metrics.iterate("parse", type(self).__name__, parsed)
+
+    def _chunks(self, workers: int) -> list:
+        """
+        Split object content into chunks
+        parsed independently of each other.
+
+        Parameters
+        ----------
+        workers
+            Number of processes.
+
+        Returns
+        ----------
+        Lists of raw lines, one list when the
+        content is too small to be split.
+        """
+        content = self._raw_lines()
+        count = min(workers * 4, len(content) // _CHUNK_LINES)
+        if workers < 2 or count < 2:
+            return [content]
+        for line in content:
+            if line.rstrip("\r\n"):
+                self._read_header(line)
+                break
+        chunks = []
+        start = 0
+        for number in range(1, count):
+            stop = self._boundary(content, len(content) * number // count)
+            if stop > start:
+                chunks.append(content[start:stop])
+                start = stop
+        chunks.append(content[start:])
+        return chunks
+
+    def _raw_lines(self) -> list:
+        """
+        Get object content as raw lines, as if
+        it was read from a file.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        ----------
+        Content itself, or its entries split
+        on line breaks when some of them hold
+        several lines, e.g. SubRip blocks set
+        by set_from_general_format().
+        """
+        content = self.content
+        if not any("\n" in entry[:-1] for entry in content):
+            return content
+        return [line for entry in content for line in entry.split("\n")]
+
+    def _boundary(self, lines: list, index: int) -> int:
+        """
+        Find where content can be split
+        without breaking a line apart.
+
+        Parameters
+        ----------
+        lines
+            Raw lines.
+        index
+            Position to split at or after.
+
+        Returns
+        ----------
+        Position of the split, any raw
+        line boundary by default.
+        """
+        return index
+
+    def _read_header(self, line: str) -> bool:
+        """
+        Take settings from the first raw line,
+        before the rest is parsed in chunks.
+
+        Parameters
+        ----------
+        line
+            First non-empty raw line.
+
+        Returns
+        ----------
+        Whether the line is a header,
+        never by default.
+        """
+        return False
+
+    def _parse(self, lines):
+        """
+        Parse raw lines of the format.
+
+        Parameters
+        ----------
+        lines
+            Iterable of raw lines.
+
+        Returns
+        ----------
+        Iterator of (start ms, end ms, text) tuples,
+        texts still contain styling markup.
+        """
+        raise NotImplementedError(
+            f"{self.__class__.__name__} does not define a subtitle format"
+        )
+
+    @staticmethod
+    def _strip_styles(text: str) -> str:
+        """
+        Remove styling tags from line text.
+
+        Parameters
+        ----------
+        text
+            Line text.
+
+        Returns
+        ----------
+        Text without styling tags.
+        """
+        return text
+
+    def _header(self) -> list:
+        """
+        Get entries written before the first line.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        ----------
+        Content entries, none by default.
+        """
+        return []
+
+    def _render(self, num: int, start: int, end: int, text: str) -> str:
+        """
+        Format a single line of the format.
+
+        Parameters
+        ----------
+        num
+            Line number, counted from 1.
+        start
+            Start time in milliseconds.
+        end
+            End time in milliseconds.
+        text
+            Line text.
+
+        Returns
+        ----------
+        Content entry.
+        """
+        raise NotImplementedError(
+            f"{self.__class__.__name__} does not define a subtitle format"
+        )
 
 
 class MPlayer2(Subtitle):
@@ -221,52 +1143,54 @@ class MPlayer2(Subtitle):
     Represent MPlayer2 subtitle format.
     """
 
+    extension = ".txt"
+
     pattern = r"\\[[0-9]+\\]\\[[0-9]+\\] .*\n"
 
-    def get_general_format(self) -> list:
+    def _parse(self, lines):
         """
-        Get object content and return
-        converted to general format.
+        Parse raw lines of the format.
 
         Parameters
         ----------
-        None
+        lines
+            Iterable of raw lines.
 
         Returns
         ----------
-        Lines in general format.
+        Iterator of (start ms, end ms, text) tuples.
         """
-        lines = [line.rstrip("\n") for line in self.content]
-        lines = [line.split("]", 2) for line in lines]
         for line in lines:
-            seconds = float(line[0].replace("[", "")) / 10.0
-            line[0] = datetime.timedelta(seconds=round(seconds, 1))
-            seconds = float(line[1].replace("[", "")) / 10.0
-            line[1] = datetime.timedelta(seconds=round(seconds, 1))
-            line[2] = line[2].lstrip()
-        return lines
+            line = line.rstrip("\r\n")
+            if not line:
+                continue
+            start, end, text = line.split("]", 2)
+            yield (
+                deciseconds_to_ms(int(start.lstrip("["))),
+                deciseconds_to_ms(int(end.lstrip("["))),
+                text.lstrip()
+            )
 
-    def set_from_general_format(self, lines: list) -> None:
+    def _render(self, num: int, start: int, end: int, text: str) -> str:
         """
-        Convert given lines to specified
-        format and set as object content.
+        Format a single line of the format.
 
         Parameters
         ----------
-        lines
-            Lines in general format.
+        num
+            Line number, counted from 1.
+        start
+            Start time in milliseconds.
+        end
+            End time in milliseconds.
+        text
+            Line text.
 
         Returns
         ----------
-        None
+        Content entry.
         """
-        for line in lines:
-            line[0] = round(line[0].total_seconds() * 10)
-            line[1] = round(line[1].total_seconds() * 10)
-        self.content = [
-            f"[{line[0]}][{line[1]}] {line[2]}"
-            for line in lines
-        ]
+        return f"[{ms_to_deciseconds(start)}][{ms_to_deciseconds(end)}] {text}"
 
 
 class SubRip(Subtitle):
@@ -274,81 +1198,113 @@ class SubRip(Subtitle):
     Represent SubRip subtitle format.
     """
 
+    extension = ".srt"
+
+    dialect = "srt"
+
     pattern = r"[0-9]+\n[0-9]{2}:[0-9]{2}:[0-9]{2},[0-9]{3} "\
               r"--> [0-9]{2}:[0-9]{2}:[0-9]{2},[0-9]{3}\n*\n"
 
-    def get_general_format(self) -> list:
+    def _parse(self, lines):
         """
-        Get object content and return
-        converted to general format.
+        Parse raw lines of the format
+        block by block.
 
         Parameters
         ----------
-        None
+        lines
+            Iterable of raw lines.
 
         Returns
         ----------
-        Lines in general format.
+        Iterator of (start ms, end ms, text) tuples.
         """
-        lines, temp = [], []
-        for line in self.content:
-            if line != "\n":
-                temp.append(line)
-            else:
-                lines.append(temp)
-                temp = []
-        lines = [
-            [*line[1].split(" --> "), "|".join(line[2:])]
-            for line in lines
-        ]
+        block = []
         for line in lines:
-            line[0] = datetime.datetime.strptime(line[0], "%H:%M:%S,%f")
-            line[1] = datetime.datetime.strptime(line[1], "%H:%M:%S,%f")
-            for n in range(2):
-                line[n] = datetime.timedelta(
-                    hours=line[n].hour,
-                    minutes=line[n].minute,
-                    seconds=line[n].second,
-                    microseconds=line[n].microsecond
-                )
-            for style in re.findall(r"</.*>", line[2]):
-                line[2] = line[2].replace(style, "")
-            for style in re.findall(r"<.*>", line[2]):
-                line[2] = line[2].replace(style, "")
-        return lines
-
-    def set_from_general_format(self, lines: list) -> None:
+            line = line.rstrip("\r\n")
+            if line:
+                block.append(line)
+            elif block:
+                yield self._parse_block(block)
+                block = []
+        if block:
+            yield self._parse_block(block)
+
+    def _boundary(self, lines: list, index: int) -> int:
         """
-        Convert given lines to specified
-        format and set as object content.
+        Find where content can be split
+        without breaking a block apart.
 
         Parameters
         ----------
         lines
-            Lines in general format.
+            Raw lines.
+        index
+            Position to split at or after.
 
         Returns
         ----------
-        None
+        Position after the next empty line.
         """
-        for line in lines:
-            line[0] = str(line[0])
-            line[1] = str(line[1])
-            if len(line[0]) == 7:
-                line[0] = line[0] + "." + "".zfill(6)
-            if len(line[1]) == 7:
-                line[1] = line[1] + "." + "".zfill(6)
-            line[0] = datetime.datetime.strptime(line[0], "%H:%M:%S.%f")
-            line[1] = datetime.datetime.strptime(line[1], "%H:%M:%S.%f")
-            line[0] = line[0].strftime("%H:%M:%S.%f").replace(".", ",")
-            line[1] = line[1].strftime("%H:%M:%S.%f").replace(".", ",")
-            line[0] = line[0][:len(line[0]) - 3]
-            line[1] = line[1][:len(line[1]) - 3]
-            line[2] = line[2].replace("|", "\n")
-        self.content = [
-            f"{num}\n{line[0]} --> {line[1]}\n{line[2]}\n\n"
-            for num, line in enumerate(lines, 1)
-        ]
+        while index < len(lines) and lines[index].rstrip("\r\n"):
+            index += 1
+        return min(index + 1, len(lines))
+
+    @staticmethod
+    def _parse_block(block: list) -> tuple:
+        """
+        Parse a single block of lines.
+
+        Parameters
+        ----------
+        block
+            Number, timing and text lines.
+
+        Returns
+        ----------
+        (start ms, end ms, text) tuple.
+        """
+        start, end = block[1].split(" --> ")
+        text = "|".join(block[2:])
+        return parse_srt(start.strip()), parse_srt(end.split()[0]), text
+
+    @staticmethod
+    def _strip_styles(text: str) -> str:
+        """
+        Remove styling tags from line text.
+
+        Parameters
+        ----------
+        text
+            Line text.
+
+        Returns
+        ----------
+        Text without styling tags.
+        """
+        return markup.strip(text, "srt")
+
+    def _render(self, num: int, start: int, end: int, text: str) -> str:
+        """
+        Format a single block of the format.
+
+        Parameters
+        ----------
+        num
+            Block number, counted from 1.
+        start
+            Start time in milliseconds.
+        end
+            End time in milliseconds.
+        text
+            Block text.
+
+        Returns
+        ----------
+        Content entry.
+        """
+        text = text.replace("|", "\n")
+        return f"{num}\n{format_srt(start)} --> {format_srt(end)}\n{text}\n\n"
 
 
 class MicroDVD(Subtitle):
@@ -356,53 +1312,156 @@ class MicroDVD(Subtitle):
     Represent MicroDVD subtitle format.
     """
 
+    extension = ".sub"
+
+    dialect = "sub"
+
     pattern = r"{[0-9]+}{[0-9]+}.*\n"
 
-    def get_general_format(self) -> list:
+    default_fps = Fraction("23.976")
+
+    default_duration = 1000
+
+    _header_pattern = re.compile(r"{[01]}{[01]}([0-9]+(?:[.,][0-9]+)?)\s*")
+
+    def __init__(self, path: str = "", encoding: str = "",
+                 fps=None) -> None:
         """
-        Get object content and return
-        converted to general format.
+        Construct a class instance.
 
         Parameters
         ----------
+        path
+            Path to a textual subtitle file.
+        encoding
+            Representation of encoding type,
+            "auto" to detect it.
+        fps
+            Frames per second, taken from the
+            {1}{1}fps header line when omitted.
+
+        Returns
+        ----------
         None
+        """
+        self.fixed_fps = fps is not None
+        self.fps = self.default_fps if fps is None else Fraction(str(fps))
+        self.header = False
+        super().__init__(path, encoding)
+
+    def _parse(self, lines):
+        """
+        Parse raw lines of the format,
+        the header line sets the framerate.
+
+        Parameters
+        ----------
+        lines
+            Iterable of raw lines.
 
         Returns
         ----------
-        Lines in general format.
+        Iterator of (start ms, end ms, text) tuples,
+        lines without an end frame last
+        default_duration milliseconds.
         """
-        lines = [line.rstrip("\n") for line in self.content]
-        lines = [line.split("}", 2) for line in lines]
+        first = True
         for line in lines:
-            seconds = float(line[0].replace("{", "")) / 23.976
-            line[0] = datetime.timedelta(seconds=round(seconds, 3))
-            seconds = float(line[1].replace("{", "")) / 23.976
-            line[1] = datetime.timedelta(seconds=round(seconds, 3))
-            for style in re.findall(r"{.*}", line[2]):
-                line[2] = line[2].replace(style, "")
-        return lines
+            line = line.rstrip("\r\n")
+            if not line:
+                continue
+            if first:
+                first = False
+                if self._read_header(line):
+                    continue
+            start, end, text = line.split("}", 2)
+            start = frames_to_ms(int(start.lstrip("{")), self.fps)
+            end = end.lstrip("{")
+            if end:
+                end = frames_to_ms(int(end), self.fps)
+            else:
+                end = start + self.default_duration
+            yield start, end, text
 
-    def set_from_general_format(self, lines: list) -> None:
+    def _read_header(self, line: str) -> bool:
         """
-        Convert given lines to specified
-        format and set as object content.
+        Take the framerate from the
+        {1}{1}fps header line, if present.
 
         Parameters
         ----------
-        lines
-            Lines in general format.
+        line
+            First non-empty raw line.
+
+        Returns
+        ----------
+        Whether the line is a header.
+        """
+        header = self._header_pattern.fullmatch(line.rstrip("\r\n"))
+        if header:
+            self.header = True
+            if not self.fixed_fps:
+                self.fps = Fraction(header.group(1).replace(",", "."))
+        return header is not None
+
+    @staticmethod
+    def _strip_styles(text: str) -> str:
+        """
+        Remove styling codes from line text.
+
+        Parameters
+        ----------
+        text
+            Line text.
 
         Returns
         ----------
+        Text without styling codes.
+        """
+        return markup.strip(text, "sub")
+
+    def _header(self) -> list:
+        """
+        Get the {1}{1}fps header line, written when
+        one was read, or when the framerate was given
+        or differs from the default one, so that
+        frames are read back with it.
+
+        Parameters
+        ----------
         None
+
+        Returns
+        ----------
+        Content entries.
         """
-        for line in lines:
-            line[0] = round(line[0].total_seconds() * 23.976)
-            line[1] = round(line[1].total_seconds() * 23.976)
-        self.content = [
-            f"{{{line[0]}}}{{{line[1]}}}{line[2]}"
-            for line in lines
-        ]
+        if not (self.header or self.fixed_fps
+                or self.fps != self.default_fps):
+            return []
+        return [f"{{1}}{{1}}{float(self.fps):.3f}"]
+
+    def _render(self, num: int, start: int, end: int, text: str) -> str:
+        """
+        Format a single line of the format.
+
+        Parameters
+        ----------
+        num
+            Line number, counted from 1.
+        start
+            Start time in milliseconds.
+        end
+            End time in milliseconds.
+        text
+            Line text.
+
+        Returns
+        ----------
+        Content entry.
+        """
+        start = ms_to_frames(start, self.fps)
+        end = ms_to_frames(end, self.fps)
+        return f"{{{start}}}{{{end}}}{text}"
 
 
 class TMPlayer(Subtitle):
@@ -410,66 +1469,65 @@ class TMPlayer(Subtitle):
     Represent TMPlayer subtitle format.
     """
 
+    extension = ".txt"
+
     pattern = r"[0-9]+:[0-9]+:[0-9]+:.*\n"
 
-    def get_general_format(self) -> list:
+    def _parse(self, lines):
         """
-        Get object content and return
-        converted to general format.
+        Parse raw lines of the format,
+        every line lasts one second.
 
         Parameters
         ----------
-        None
+        lines
+            Iterable of raw lines.
 
         Returns
         ----------
-        Lines in general format.
+        Iterator of (start ms, end ms, text) tuples.
         """
-        lines = [line.rstrip("\n") for line in self.content]
-        lines = [line.split(":", 3) for line in lines]
-        for idx, line in enumerate(lines):
+        for idx, line in enumerate(lines, self._first_line):
+            line = line.rstrip("\r\n")
+            if not line:
+                continue
+            line = line.split(":", 3)
             if len(line) < 4:
                 raise IndexError(
                     f"Please fix line #{idx} as it doesn't adhere to TMPlayer "
                     f"format: '%H:%M:%S:text' -> {line}"
                 )
-        lines = [
-            [f"{line[0]}:{line[1]}:{line[2]}", line[3]]
-            for line in lines
-        ]
-        for line in lines:
-            line[0] = datetime.datetime.strptime(line[0], "%H:%M:%S")
-            line[0] = datetime.timedelta(
-                hours=line[0].hour,
-                minutes=line[0].minute,
-                seconds=line[0].second,
-                microseconds=line[0].microsecond
-            )
-            line.insert(1, line[0] + datetime.timedelta(seconds=1))
-        return lines
+            start = parse_hms(":".join(line[:3]))
+            yield start, start + 1000, line[3]
 
-    def set_from_general_format(self, lines: list) -> None:
+    def _render(self, num: int, start: int, end: int, text: str) -> str:
         """
-        Convert given lines to specified
-        format and set as object content.
+        Format a single line of the format.
 
         Parameters
         ----------
-        lines
-            Lines in general format.
+        num
+            Line number, counted from 1.
+        start
+            Start time in milliseconds.
+        end
+            End time in milliseconds, unused.
+        text
+            Line text.
 
         Returns
         ----------
-        None
+        Content entry.
         """
-        for line in lines:
-            line[0] = str(line[0])
-            if len(line[0]) == 7:
-                line[0] = line[0] + "." + "".zfill(6)
-            line[0] = datetime.datetime.strptime(line[0], "%H:%M:%S.%f")
-            line[0] = line[0].strftime("%H:%M:%S.%f")
-            line[0] = line[0][:len(line[0]) - 7]
-        self.content = [
-            f"{line[0]}:{line[2]}"
-            for line in lines
-        ]
+        return f"{format_hms(start)}:{text}"
+
+
+# Formats
+
+
+FORMATS = {
+    "mpl": MPlayer2,
+    "srt": SubRip,
+    "sub": MicroDVD,
+    "tmp": TMPlayer
+}
@@ -0,0 +1,187 @@
+"""
+Integer-millisecond codec for the timestamps
+used by the supported subtitle formats.
+"""
+
+import datetime
+
+
+_ONE_MS = datetime.timedelta(milliseconds=1)
+
+
+def to_ms(value) -> int:
+    """
+    Convert a time value to milliseconds.
+
+    Parameters
+    ----------
+    value
+        Timedelta or number of milliseconds.
+
+    Returns
+    ----------
+    Whole milliseconds, truncated.
+    """
+    if isinstance(value, datetime.timedelta):
+        return value // _ONE_MS
+    return int(value)
+
+
+def from_ms(ms: int) -> datetime.timedelta:
+    """
+    Convert milliseconds to a timedelta.
+
+    Parameters
+    ----------
+    ms
+        Number of milliseconds.
+
+    Returns
+    ----------
+    Equivalent timedelta.
+    """
+    return datetime.timedelta(milliseconds=ms)
+
+
+def parse_srt(text: str) -> int:
+    """
+    Parse a "HH:MM:SS,mmm" timestamp.
+
+    Parameters
+    ----------
+    text
+        Timestamp, a dot is accepted
+        as the decimal separator too.
+
+    Returns
+    ----------
+    Number of milliseconds.
+    """
+    hours, minutes, seconds = text.split(":")
+    seconds, _, fraction = seconds.replace(".", ",").partition(",")
+    return (
+        (int(hours) * 60 + int(minutes)) * 60 + int(seconds)
+    ) * 1000 + int(fraction.ljust(3, "0")[:3])
+
+
+def format_srt(ms: int) -> str:
+    """
+    Format milliseconds as "HH:MM:SS,mmm".
+
+    Parameters
+    ----------
+    ms
+        Number of milliseconds.
+
+    Returns
+    ----------
+    Timestamp.
+    """
+    hours, ms = divmod(ms, 3600000)
+    minutes, ms = divmod(ms, 60000)
+    seconds, ms = divmod(ms, 1000)
+    return "%02d:%02d:%02d,%03d" % (hours, minutes, seconds, ms)
+
+
+def parse_hms(text: str) -> int:
+    """
+    Parse a "HH:MM:SS" timestamp.
+
+    Parameters
+    ----------
+    text
+        Timestamp.
+
+    Returns
+    ----------
+    Number of milliseconds.
+    """
+    hours, minutes, seconds = text.split(":")
+    return ((int(hours) * 60 + int(minutes)) * 60 + int(seconds)) * 1000
+
+
+def format_hms(ms: int) -> str:
+    """
+    Format milliseconds as "HH:MM:SS".
+
+    Parameters
+    ----------
+    ms
+        Number of milliseconds,
+        the fraction is truncated.
+
+    Returns
+    ----------
+    Timestamp.
+    """
+    hours, ms = divmod(ms, 3600000)
+    minutes, ms = divmod(ms, 60000)
+    return "%02d:%02d:%02d" % (hours, minutes, ms // 1000)
+
+
+def frames_to_ms(frames: int, fps) -> int:
+    """
+    Convert a frame number to milliseconds.
+
+    Parameters
+    ----------
+    frames
+        Frame number.
+    fps
+        Frames per second.
+
+    Returns
+    ----------
+    Number of milliseconds, rounded.
+    """
+    return round(frames * 1000 / fps)
+
+
+def ms_to_frames(ms: int, fps) -> int:
+    """
+    Convert milliseconds to a frame number.
+
+    Parameters
+    ----------
+    ms
+        Number of milliseconds.
+    fps
+        Frames per second.
+
+    Returns
+    ----------
+    Frame number, rounded.
+    """
+    return round(ms * fps / 1000)
+
+
+def deciseconds_to_ms(deciseconds: int) -> int:
+    """
+    Convert deciseconds to milliseconds.
+
+    Parameters
+    ----------
+    deciseconds
+        Number of deciseconds.
+
+    Returns
+    ----------
+    Number of milliseconds.
+    """
+    return deciseconds * 100
+
+
+def ms_to_deciseconds(ms: int) -> int:
+    """
+    Convert milliseconds to deciseconds.
+
+    Parameters
+    ----------
+    ms
+        Number of milliseconds.
+
+    Returns
+    ----------
+    Number of deciseconds, rounded.
+    """
+    return round(ms / 100)
@@ -0,0 +1,65 @@
+import asyncio
+import threading
+import time
+
+import pytest
+import sublib
+from sublib import aio
+
+
+class TestAsyncio:
+
+    srt_data = "1\n00:01:00,000 --> 00:01:03,000\nLine 01\n\n"
+
+    @pytest.fixture
+    def run(self):
+        loop = asyncio.new_event_loop()
+        yield loop.run_until_complete
+        loop.close()
+
+    @pytest.fixture
+    def source(self, tmp_path):
+        path = tmp_path / "file.srt"
+        path.write_text(self.srt_data, encoding="utf-8")
+        return str(path)
+
+    def test_aload(self, run, source):
+        subtitle = run(sublib.SubRip.aload(source, "utf-8"))
+        assert isinstance(subtitle, sublib.SubRip)
+        assert subtitle == sublib.SubRip(source, "utf-8")
+        general = run(subtitle.aget_general_format())
+        assert general == subtitle.get_general_format()
+
+    def test_aload_keyword_arguments(self, run, tmp_path):
+        path = tmp_path / "file.sub"
+        path.write_text("{25}{50}Line 01\n", encoding="utf-8")
+        subtitle = run(sublib.MicroDVD.aload(str(path), "utf-8", fps=25))
+        assert subtitle.fps == 25
+
+    def test_aconvert(self, run, source, tmp_path):
+        target = tmp_path / "file.txt"
+        assert run(aio.aconvert(source, str(target), "tmp")) == 1
+        assert target.read_text() == "00:01:00:Line 01\n"
+
+    def test_aconvert_all(self, run, source, tmp_path, mocker):
+        running, peak = [0], [0]
+        lock = threading.Lock()
+
+        def convert(*args):
+            with lock:
+                running[0] += 1
+                peak[0] = max(peak[0], running[0])
+            time.sleep(0.01)
+            with lock:
+                running[0] -= 1
+            if args[0] == "missing.srt":
+                raise FileNotFoundError(args[0])
+            return 1
+
+        mocker.patch.object(aio, "convert", convert)
+        pairs = [(source, f"{n}.txt") for n in range(8)]
+        pairs.append(("missing.srt", "missing.txt"))
+        results = run(aio.aconvert_all(pairs, "tmp", concurrency=2))
+        assert results[:8] == [1] * 8
+        assert isinstance(results[8], FileNotFoundError)
+        assert peak[0] <= 2
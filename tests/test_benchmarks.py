@@ -0,0 +1,24 @@
+import pytest
+import sublib
+from benchmarks import generate, suite
+
+
+class TestBenchmarks:
+
+    @pytest.mark.parametrize("fmt", list(sublib.FORMATS))
+    def test_generated_files_parse(self, fmt, tmp_path):
+        path = str(tmp_path / f"file{sublib.FORMATS[fmt].extension}")
+        generate.write(path, fmt, 50, seed=7)
+        assert sublib.detect(path, "utf-8") == fmt
+        general = sublib.FORMATS[fmt](path, "utf-8").get_general_format()
+        assert len(general) == 50
+        assert list(general.starts) == sorted(general.starts)
+
+    def test_suite_report(self):
+        report = suite.run(["srt", "sub"], [20], repeat=1)
+        assert [(r["format"], r["stage"]) for r in report["results"]] == [
+            (fmt, stage)
+            for fmt in ("srt", "sub")
+            for stage in ("detect", "parse", "write", "convert")
+        ]
+        assert all(r["peak_bytes"] > 0 for r in report["results"])
@@ -0,0 +1,101 @@
+import io
+from array import array
+from datetime import timedelta
+
+import pytest
+import sublib
+from sublib import binary
+from sublib.cuetable import CueTable
+
+
+class TestBinaryModule:
+
+    lines = [
+        [timedelta(seconds=1), timedelta(seconds=3), "Line 01"],
+        [timedelta(seconds=4), timedelta(seconds=6), "Żółw|Line 02"],
+        [timedelta(seconds=7), timedelta(seconds=9), ""]
+    ]
+
+    def test_binary_round_trip(self, tmp_path):
+        path = str(tmp_path / "track.slbt")
+        binary.dump(self.lines, path)
+        table = binary.load(path)
+        assert table == self.lines
+        assert table == CueTable(self.lines)
+        assert binary.load(path, copy=True) == self.lines
+
+    def test_binary_zero_copy_columns(self):
+        table = binary.load(binary.dumps(self.lines))
+        assert isinstance(table.starts, memoryview)
+        assert isinstance(table.texts, binary.TextColumn)
+        assert list(table.starts) == [1000, 4000, 7000]
+        assert table.texts[-1] == ""
+        assert table.texts[1:] == ["Żółw|Line 02", ""]
+        assert table[1:2] == self.lines[1:2]
+        with pytest.raises(IndexError):
+            table.texts[3]
+
+    def test_binary_copy_on_write(self):
+        data = binary.dumps(self.lines)
+        table = binary.load(data)
+        table.append([timedelta(seconds=10), timedelta(seconds=11), "New"])
+        table[0] = [timedelta(0), timedelta(seconds=1), "First"]
+        assert isinstance(table.starts, array)
+        assert isinstance(table.texts, list)
+        assert len(table) == 4
+        assert binary.load(data) == self.lines
+
+    def test_binary_close(self, tmp_path):
+        path = tmp_path / "track.slbt"
+        binary.dump(self.lines, str(path))
+        with binary.load(str(path)) as table:
+            assert isinstance(table, binary.MappedTable)
+            assert table == self.lines
+            edited = table.shift(1000)
+        assert table._map is None
+        assert list(edited.starts) == [2000, 5000, 8000]
+        path.unlink()
+
+    def test_binary_truncated(self, tmp_path):
+        data = binary.dumps(self.lines)
+        for size in (20, 40, len(data) - 1):
+            with pytest.raises(ValueError):
+                binary.load(data[:size])
+            path = tmp_path / "truncated.slbt"
+            path.write_bytes(data[:size])
+            with pytest.raises(ValueError):
+                binary.load(str(path))
+            with pytest.raises(ValueError):
+                binary.load(str(path), copy=True)
+
+    def test_binary_decreasing_offsets(self):
+        data = bytearray(binary.dumps(self.lines))
+        offset = 16 + 16 * len(self.lines) + 8
+        data[offset:offset + 8] = (100).to_bytes(8, "little")
+        with pytest.raises(ValueError, match="text offsets out of range"):
+            binary.load(data, copy=True)
+
+    def test_binary_file_objects(self):
+        buffer = io.BytesIO()
+        binary.dump(CueTable(self.lines), buffer)
+        buffer.seek(0)
+        assert binary.load(buffer) == self.lines
+
+    def test_binary_subtitle(self, tmp_path):
+        path = tmp_path / "file.srt"
+        path.write_text(
+            "1\n00:00:01,000 --> 00:00:03,000\n<i>Line 01</i>\n\n",
+            encoding="utf-8"
+        )
+        table = sublib.SubRip(str(path), "utf-8").get_general_format()
+        assert binary.load(binary.dumps(table)) == table
+
+    def test_binary_bad_data(self, tmp_path):
+        with pytest.raises(ValueError):
+            binary.load(b"SLC1" + bytes(12))
+        with pytest.raises(ValueError):
+            binary.load(b"SLBT\x09\x00\x00\x00" + bytes(8))
+        path = tmp_path / "empty.slbt"
+        path.write_bytes(b"")
+        with pytest.raises(ValueError):
+            binary.load(str(path))
@@ -0,0 +1,86 @@
+import os
+
+import pytest
+import sublib
+from sublib.cache import ParseCache
+
+
+class TestParseCacheClass:
+
+    srt_data = "1\n00:01:00,000 --> 00:01:03,000\n<i>Line 01</i>\n\n"
+
+    @pytest.fixture
+    def source(self, tmp_path):
+        path = tmp_path / "file.srt"
+        path.write_text(self.srt_data, encoding="utf-8")
+        return str(path)
+
+    @pytest.fixture
+    def cache(self, tmp_path):
+        return ParseCache(str(tmp_path / "cache"))
+
+    def test_parsecache_hit_skips_parsing(self, cache, source, mocker):
+        fmt, table = cache.load(source)
+        assert fmt == "srt"
+        assert table == sublib.SubRip(source, "utf-8").get_general_format()
+        detect = mocker.patch("sublib.cache.detect")
+        assert cache.load(source) == (fmt, table)
+        assert not detect.called
+
+    def test_parsecache_changed_file(self, cache, source):
+        cache.load(source)
+        with open(source, "a", encoding="utf-8") as f:
+            f.write("2\n00:01:04,000 --> 00:01:05,000\nLine 02\n\n")
+        fmt, table = cache.load(source)
+        assert len(table) == 2
+        assert len(os.listdir(cache.directory)) == 2
+        cache.load(source, "cp1250")
+        assert len(os.listdir(cache.directory)) == 3
+        cache.clear()
+        assert cache.size() == 0
+
+    def test_parsecache_evicts_least_recently_used(self, cache, tmp_path):
+        sources = []
+        for number in range(3):
+            path = tmp_path / f"{number}.txt"
+            path.write_text(f"[{number}][10] Line\n", encoding="utf-8")
+            sources.append(str(path))
+        cache.load(sources[0])
+        cache.load(sources[1])
+        cache.max_bytes = cache.size()
+        os.utime(cache._entry(sources[0], "utf-8"), ns=(2, 2))
+        os.utime(cache._entry(sources[1], "utf-8"), ns=(1, 1))
+        cache.load(sources[2])
+        assert sorted(os.listdir(cache.directory)) == sorted(
+            os.path.basename(cache._entry(path, "utf-8"))
+            for path in (sources[0], sources[2])
+        )
+
+    def test_parsecache_unsupported_format(self, cache, tmp_path):
+        path = tmp_path / "file.txt"
+        path.write_text("Line\n", encoding="utf-8")
+        with pytest.raises(ValueError):
+            cache.load(str(path))
+        assert cache.size() == 0
+
+    @pytest.mark.parametrize("data", [
+        b"SLC1srtgarbage",
+        b"SLC1srt\x05\x00\x00\x00\x00\x00\x00\x00",
+        b"SLC1ass" + sublib.CueTable([[0, 1000, "Line"]]).to_bytes(),
+        b"SLC1\xff\xfe\xfd",
+        b"SLC2"
+    ])
+    def test_parsecache_corrupt_entry(self, cache, source, data):
+        fmt, table = cache.load(source)
+        entry = cache._entry(source, "utf-8")
+        with open(entry, "wb") as f:
+            f.write(data)
+        assert cache.load(source) == (fmt, table)
+        with open(entry, "rb") as f:
+            assert f.read()[:7] == b"SLC1srt"
+
+    def test_parsecache_failed_store(self, cache, source, mocker):
+        mocker.patch("sublib.cache.os.replace", side_effect=OSError)
+        with pytest.raises(OSError):
+            cache.load(source)
+        assert os.listdir(cache.directory) == []
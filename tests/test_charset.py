@@ -0,0 +1,63 @@
+import builtins
+import codecs
+
+import pytest
+import sublib
+from sublib import charset
+
+
+class TestCharsetModule:
+
+    polish = "Zażółć gęślą jaźń, świetnie! Łódź, źdźbło."
+
+    @pytest.mark.parametrize("encoding", ["utf-8", "cp1250", "iso-8859-2"])
+    def test_charset_sniff_polish(self, encoding):
+        assert charset.sniff(self.polish.encode(encoding)) == encoding
+
+    def test_charset_sniff_candidates(self):
+        text = "Grüße aus München, schöne Straße."
+        data = text.encode("cp1252")
+        assert charset.sniff(data, ("utf-8", "cp1252")) == "cp1252"
+        assert charset.sniff("Всё хорошо".encode("cp1251")) == "cp1251"
+        assert charset.sniff(b"\x81\x82\x83", ("utf-8",)) == "utf-8"
+
+    def test_charset_sniff_boms(self):
+        assert charset.sniff(codecs.BOM_UTF8 + b"Line") == "utf-8-sig"
+        assert charset.sniff("Line".encode("utf-16")) == "utf-16"
+        assert charset.sniff("Line".encode("utf-32")) == "utf-32"
+        assert charset.sniff(b"Line") == "utf-8"
+
+    def test_charset_sniff_bounded(self):
+        data = b"Line " * 10 + "ą".encode("utf-8")
+        assert charset.sniff(data, size=51) == "utf-8"
+        assert charset.sniff(data[:51]) == "cp1250"
+
+    def test_charset_decode(self):
+        assert charset.decode(self.polish.encode("cp1250"), "auto") == \
+            self.polish
+        assert charset.decode(b"Line \xff", "utf-8") == "Line �"
+
+    def test_charset_load(self, tmp_path, mocker):
+        path = tmp_path / "file.srt"
+        path.write_bytes(
+            "1\n00:01:00,000 --> 00:01:03,000\n<i>Żółw</i>\n\n"
+            .encode("cp1250")
+        )
+        read = mocker.spy(builtins, "open")
+        subtitle = sublib.load(str(path))
+        assert read.call_count == 1
+        assert isinstance(subtitle, sublib.SubRip)
+        assert subtitle.encoding == "cp1250"
+        assert subtitle[0][2] == "Żółw"
+        assert sublib.SubRip(str(path), "auto").content == subtitle.content
+        assert sublib.detect(str(path), "auto") == "srt"
+        with pytest.raises(ValueError):
+            sublib.load(str(path), fmt="txt")
+
+    def test_charset_convert(self, tmp_path):
+        source = tmp_path / "file.sub"
+        source.write_bytes("{1}{1}25\n{25}{50}Żółw\n".encode("cp1250"))
+        target = str(tmp_path / "file.txt")
+        assert sublib.convert(str(source), target, "tmp", "auto") == 1
+        with open(target, encoding="cp1250") as f:
+            assert f.read() == "00:00:01:Żółw\n"
@@ -0,0 +1,60 @@
+import pytest
+from sublib import cli
+
+
+class TestCommandLine:
+
+    @pytest.fixture
+    def sources(self, tmp_path):
+        (tmp_path / "in" / "season").mkdir(parents=True)
+        (tmp_path / "in" / "season" / "episode.srt").write_text(
+            "1\n00:01:00,000 --> 00:01:03,000\nLine 01\n\n"
+            "2\n00:01:03,200 --> 00:01:05,400\nLine 02\n\n"
+        )
+        (tmp_path / "in" / "movie.txt").write_text("[600][630] Line 01\n")
+        (tmp_path / "in" / "notes.md").write_text("Skipped\n")
+        return tmp_path / "in"
+
+    @pytest.mark.parametrize("jobs", ["1", "2"])
+    def test_cli_converts_directory(self, sources, tmp_path, capsys, jobs):
+        output = tmp_path / "out"
+        status = cli.main([str(sources), "-t", "srt", "-o", str(output),
+                           "-j", jobs])
+        assert status == 0
+        assert (output / "season" / "episode.srt").read_text() == \
+            (sources / "season" / "episode.srt").read_text()
+        assert (output / "movie.srt").read_text() == \
+            "1\n00:01:00,000 --> 00:01:03,000\nLine 01\n\n"
+        assert not (output / "notes.srt").exists()
+        assert capsys.readouterr().out.startswith(
+            "2 converted, 0 failed, 3 lines"
+        )
+
+    def test_cli_reports_failed_files(self, sources, tmp_path, capsys):
+        (sources / "broken.sub").write_text("Not a subtitle\n")
+        status = cli.main([str(sources / "broken.sub"), str(sources),
+                           "-t", "tmp", "-o", str(tmp_path / "out"),
+                           "-j", "1"])
+        captured = capsys.readouterr()
+        assert status == 1
+        assert captured.err.count("broken.sub: ValueError") == 2
+        assert captured.out.startswith("2 converted, 2 failed")
+
+    def test_cli_refuses_to_overwrite_source(self, sources, capsys):
+        status = cli.main([str(sources / "movie.txt"), "-t", "mpl",
+                           "-o", str(sources), "-j", "1"])
+        assert status == 1
+        assert "overwrite" in capsys.readouterr().err
+
+    @pytest.mark.parametrize("jobs", ["1", "2"])
+    def test_cli_reports_target_collisions(self, sources, tmp_path, capsys,
+                                           jobs):
+        (sources / "movie.sub").write_text("{10}{21}From sub\n")
+        output = tmp_path / "out"
+        status = cli.main([str(sources), "-t", "mpl", "-o", str(output),
+                           "-j", jobs])
+        captured = capsys.readouterr()
+        assert status == 1
+        assert captured.err.count("already written from") == 1
+        assert captured.out.startswith("2 converted, 1 failed")
+        assert (output / "movie.txt").read_text() == "[4][9] From sub\n"
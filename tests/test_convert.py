@@ -0,0 +1,71 @@
+import datetime
+
+import pytest
+import sublib
+
+
+class TestConvertFunction:
+
+    srt_data = "1\n"\
+               "00:01:00,000 --> 00:01:03,000\n"\
+               "Line 01\n"\
+               "Line 02\n\n"\
+               "2\n"\
+               "00:01:03,200 --> 00:01:05,400\n"\
+               "<i>Line 03</i>\n\n"
+
+    @pytest.fixture
+    def source(self, tmp_path):
+        path = tmp_path / "file.srt"
+        path.write_text(self.srt_data, encoding="utf-8")
+        return path
+
+    def test_convert_srt_to_mpl(self, source, tmp_path):
+        target = tmp_path / "file.txt"
+        assert sublib.convert(str(source), str(target), "mpl") == 2
+        assert target.read_text(encoding="utf-8") == \
+            "[600][630] Line 01|Line 02\n"\
+            "[632][654] Line 03\n"
+
+    def test_convert_matches_set_from_general_format(self, source, tmp_path):
+        target = tmp_path / "file.sub"
+        sublib.convert(str(source), str(target), sublib.MicroDVD(fps=25))
+        subtitle = sublib.MicroDVD(fps=25)
+        subtitle.set_from_general_format(
+            sublib.SubRip(str(source), "utf-8").get_general_format()
+        )
+        assert target.read_text(encoding="utf-8").splitlines() == \
+            subtitle.content
+
+    def test_convert_round_trip(self, source, tmp_path):
+        middle = tmp_path / "file.sub"
+        target = tmp_path / "copy.srt"
+        sublib.convert(str(source), str(middle), sublib.MicroDVD(fps=25))
+        assert middle.read_text(encoding="utf-8").startswith(
+            "{1}{1}25.000\n"
+        )
+        sublib.convert(str(middle), str(target), sublib.SubRip)
+        assert sublib.SubRip(str(target), "utf-8")[1][:2] == [
+            datetime.timedelta(seconds=63, microseconds=200000),
+            datetime.timedelta(seconds=65, microseconds=400000)
+        ]
+        assert target.read_text(encoding="utf-8") == \
+            self.srt_data.replace("<i>", "").replace("</i>", "")
+
+    def test_convert_unknown_format(self, source, tmp_path):
+        with pytest.raises(ValueError):
+            sublib.convert(str(source), str(tmp_path / "file"), "ass")
+        with pytest.raises(ValueError):
+            sublib.convert(
+                str(source), str(tmp_path / "file"), "srt",
+                source_format="undefined"
+            )
+
+    def test_convert_same_file(self, source, tmp_path):
+        with pytest.raises(ValueError):
+            sublib.convert(str(source), str(source), "srt")
+        link = tmp_path / "link.srt"
+        link.symlink_to(source)
+        with pytest.raises(ValueError):
+            sublib.convert(str(source), str(link), "mpl")
+        assert source.read_text(encoding="utf-8") == self.srt_data
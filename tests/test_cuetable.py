@@ -0,0 +1,176 @@
+import datetime
+
+import pytest
+import sublib
+
+
+class TestCueTableClass:
+
+    general_lines = [
+        [
+            datetime.timedelta(seconds=60, microseconds=100000),
+            datetime.timedelta(seconds=63, microseconds=100000),
+            'Line 01|Line 02'
+        ],
+        [
+            datetime.timedelta(seconds=63, microseconds=300000),
+            datetime.timedelta(seconds=65, microseconds=400000),
+            'Line 03|Line 04'
+        ],
+        [
+            datetime.timedelta(seconds=65, microseconds=600000),
+            datetime.timedelta(seconds=66, microseconds=800000),
+            'Line 04'
+        ]
+    ]
+
+    @pytest.fixture
+    def table(self):
+        return sublib.CueTable(self.general_lines)
+
+    def test_cuetable_columns(self, table):
+        assert list(table.starts) == [60100, 63300, 65600]
+        assert list(table.ends) == [63100, 65400, 66800]
+        assert table.texts == ['Line 01|Line 02', 'Line 03|Line 04', 'Line 04']
+
+    def test_cuetable_list_access(self, table):
+        assert len(table) == 3
+        assert table == self.general_lines
+        assert self.general_lines == table
+        assert table[-1] == self.general_lines[-1]
+        assert table[1:] == self.general_lines[1:]
+        assert list(table) == self.general_lines
+        assert table != self.general_lines[:2]
+        assert table != ["x", "y", "z"]
+        assert not table == [["x", "y", "z"]] * 3
+        assert sublib.CueTable([[0, 1000, "a"]]) != ["x"]
+
+    def test_cuetable_edit(self, table):
+        table[0] = [datetime.timedelta(seconds=1), 2000, "Edited"]
+        table.append(self.general_lines[0])
+        del table[1]
+        assert list(table.iter_ms()) == [
+            (1000, 2000, "Edited"),
+            (65600, 66800, "Line 04"),
+            (60100, 63100, "Line 01|Line 02")
+        ]
+
+    def test_cuetable_copy_is_independent(self, table):
+        other = table.copy()
+        other[0] = [0, 0, ""]
+        assert table == self.general_lines
+
+    def test_cuetable_as_numpy(self, table):
+        numpy = pytest.importorskip("numpy")
+        starts, ends = table.as_numpy()
+        assert starts.dtype == numpy.int64
+        assert (ends - starts).tolist() == [3000, 2100, 1200]
+
+    def test_general_format_is_cuetable(self, mocker):
+        mocker.patch(
+            "builtins.open",
+            mocker.mock_open(read_data="[601][631] Line 01|Line 02\n")
+        )
+        general = sublib.MPlayer2("file.txt", "utf-8").get_general_format()
+        assert isinstance(general, sublib.CueTable)
+        assert general == self.general_lines[:1]
+
+    @pytest.fixture(params=[True, False], ids=["numpy", "python"])
+    def engine(self, request, monkeypatch):
+        if request.param:
+            pytest.importorskip("numpy")
+        else:
+            monkeypatch.setattr(sublib.cuetable, "numpy", None)
+
+    def test_cuetable_shift(self, table, engine):
+        shifted = table.shift(datetime.timedelta(seconds=-61))
+        assert list(shifted.starts) == [0, 2300, 4600]
+        assert list(shifted.ends) == [2100, 4400, 5800]
+        assert shifted.texts == table.texts
+        assert table == self.general_lines
+
+    def test_cuetable_scale(self, table, engine):
+        scaled = table.scale(0.5, origin=60100)
+        assert list(scaled.starts) == [60100, 61700, 62850]
+        assert list(scaled.ends) == [61600, 62750, 63450]
+
+    def test_cuetable_sync(self, table, engine):
+        synced = table.sync(60100, 0, 65600, 11000)
+        assert list(synced.starts) == [0, 6400, 11000]
+        assert list(synced.ends) == [6000, 10600, 13400]
+        with pytest.raises(ValueError):
+            table.sync(1, 2, 1, 3)
+
+    def test_cuetable_retime(self, table, engine):
+        retimed = table.retime(25, 23.976)
+        assert list(retimed.starts) == [62667, 66004, 68402]
+        assert retimed.retime(23.976, 25).starts == table.starts
+
+    def test_cuetable_bytes_round_trip(self, table):
+        table.append([0, 1, "Żółw|<i>ü</i>"])
+        data = table.to_bytes()
+        assert len(data) == 8 + 4 * 8 * 3 + 8 + len(
+            "".join(table.texts).encode("utf-8")
+        )
+        assert sublib.CueTable.from_bytes(data) == table
+        assert sublib.CueTable.from_bytes(
+            sublib.CueTable().to_bytes()
+        ) == []
+
+
+class TestCueTableSync:
+
+    @pytest.fixture
+    def rows(self):
+        rows, start = [], 0
+        for number in range(200):
+            start += 1500 + number * 37 % 4000
+            rows.append((start, start + 800 + number * 53 % 2000, "Line"))
+        return rows
+
+    @pytest.fixture
+    def reference(self, rows):
+        pytest.importorskip("numpy")
+        return sublib.CueTable.from_ms(rows)
+
+    def test_sync_to_offset(self, rows, reference):
+        table = sublib.CueTable.from_ms(
+            (start + 2345, end + 2345, text) for start, end, text in rows
+        )
+        synced, fit = table.sync_to(reference)
+        assert fit.factor == 1.0
+        assert abs(fit.offset + 2345) <= 50
+        assert fit.score > 0.9
+        assert all(
+            abs(a - b) <= 50 for a, b in zip(synced.starts, reference.starts)
+        )
+
+    def test_sync_to_framerate(self, rows, reference):
+        factor = 25 / 23.976
+        table = sublib.CueTable.from_ms(
+            (round(start * factor) - 4000, round(end * factor) - 4000, text)
+            for start, end, text in rows
+        )
+        synced, fit = table.sync_to(
+            reference, ratios=sublib.cuetable.FRAMERATE_RATIOS
+        )
+        assert fit.factor == pytest.approx(23.976 / 25)
+        assert all(
+            abs(a - b) <= 100 for a, b in zip(synced.starts, reference.starts)
+        )
+
+    def test_sync_to_max_offset(self, rows, reference):
+        table = sublib.CueTable.from_ms(
+            (start + 5000, end + 5000, text) for start, end, text in rows
+        )
+        _, fit = table.sync_to(
+            reference, max_offset=datetime.timedelta(seconds=1)
+        )
+        assert abs(fit.offset) <= 1000
+
+    def test_sync_to_errors(self, reference, monkeypatch):
+        with pytest.raises(ValueError):
+            sublib.CueTable().sync_to(reference)
+        monkeypatch.setattr(sublib.cuetable, "numpy", None)
+        with pytest.raises(ImportError):
+            reference.sync_to(reference)
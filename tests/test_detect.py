@@ -1,4 +1,5 @@
 import builtins
+import io
 
 import pytest
 import pytest_mock
@@ -84,3 +85,34 @@ class TestDetectFunction:
         assert "sub" != sublib.detect("file.txt", "utf-8")
         assert "tmp" != sublib.detect("file.txt", "utf-8")
         assert "undefined" == sublib.detect("file.txt", "utf-8")
+
+    def test_detect_bytes_and_file_object(self):
+        test_data = b"{1440}{1513}Line 01|Line 02\n"\
+                    b"{1517}{1569}Line 03|Line 04\n"
+        assert "sub" == sublib.detect(test_data, "utf-8")
+        assert "sub" == sublib.detect(io.BytesIO(test_data), "utf-8")
+        assert "sub" == sublib.detect(io.StringIO(test_data.decode()))
+
+    def test_detect_reads_bounded_prefix(self):
+        test_data = b"Line 01\n" * 100 + b"00:01:00:Line 02\n"
+        assert "undefined" == sublib.detect(test_data, "utf-8", size=800)
+        assert "tmp" == sublib.detect(test_data, "utf-8", size=900)
+
+    def test_detect_scores(self, mocker):
+        test_data = "﻿[601][631] Line 01|Line 02\n"\
+                    "00:01:03:Line 03|Line 04\n"\
+                    "[656][668] Line 04\n"
+        mocker.patch(
+            "builtins.open",
+            mocker.mock_open(read_data=test_data)
+        )
+        scores = sublib.detect_scores("file.txt", "utf-8")
+        assert scores["mpl"] == pytest.approx(2 / 3)
+        assert scores["tmp"] == pytest.approx(1 / 3)
+        assert scores["srt"] == scores["sub"] == 0.0
+        assert "mpl" == sublib.detect("file.txt", "utf-8")
+
+    def test_detect_srt_with_crlf_and_coordinates(self):
+        test_data = b"1\r\n00:01:00,060 --> 00:01:03,105\r\nLine 01\r\n\r\n"\
+                    b"2\n00:01:03,272 --> 00:01:05,440 X1:10 X2:20\nLine 02\n"
+        assert sublib.detect_scores(test_data)["srt"] == 1.0
@@ -0,0 +1,124 @@
+import random
+
+import pytest
+import sublib
+from sublib import fingerprint
+from sublib.fingerprint import Duplicate, DuplicateIndex
+
+
+class TestFingerprint:
+
+    @staticmethod
+    def track(seed, count=300):
+        rng = random.Random(seed)
+        rows, start = [], 0
+        for _ in range(count):
+            start += rng.randrange(1500, 5000)
+            size = rng.randrange(3, 8)
+            text = " ".join(f"word{rng.randrange(2000)}" for _ in range(size))
+            rows.append((start, start + 1500, text))
+        return rows
+
+    @pytest.fixture
+    def library(self):
+        original = self.track(1)
+        return {
+            "original": original,
+            "styled": [
+                (start + 7, end, f"{text.upper()}!")
+                for start, end, text in original
+            ],
+            "shifted": [
+                (start + 30000, end + 30000, text)
+                for start, end, text in original
+            ],
+            "retimed": [
+                (start * 2, end * 2, text) for start, end, text in original
+            ],
+            "edited": original[:270] + self.track(2, 30),
+            "other": self.track(3)
+        }
+
+    @pytest.fixture
+    def index(self, library):
+        index = DuplicateIndex()
+        for name, rows in library.items():
+            index.add(
+                fingerprint.fingerprint(sublib.CueTable.from_ms(rows)), name
+            )
+        return index
+
+    def test_fingerprint_similarity(self, library):
+        prints = {
+            name: fingerprint.fingerprint(sublib.CueTable.from_ms(rows))
+            for name, rows in library.items()
+        }
+        original = prints["original"]
+        assert prints["styled"].digest == original.digest
+        assert prints["retimed"].digest == original.digest
+        assert prints["edited"].digest != original.digest
+        assert fingerprint.similarity(original, prints["shifted"]) == 1.0
+        assert fingerprint.similarity(original, prints["styled"]) > 0.9
+        assert 0.3 < fingerprint.similarity(original, prints["retimed"]) < 0.8
+        assert 0.6 < fingerprint.similarity(original, prints["edited"]) < 0.95
+        assert fingerprint.similarity(original, prints["other"]) < 0.1
+
+    def test_fingerprint_python_matches_numpy(self, library, monkeypatch):
+        pytest.importorskip("numpy")
+        lines = sublib.CueTable.from_ms(library["original"])
+        expected = fingerprint.fingerprint(lines)
+        monkeypatch.setattr(fingerprint, "numpy", None)
+        assert fingerprint.fingerprint(lines) == expected
+        assert fingerprint.fingerprint([]).signature == \
+            fingerprint.fingerprint([[0, 1, "..."]]).signature
+
+    def test_duplicateindex_duplicates(self, index):
+        assert len(index) == 6
+        found = index.duplicates()
+        assert [pair[:2] for pair in found] == [
+            ("original", "styled"), ("original", "shifted"),
+            ("original", "retimed"), ("styled", "shifted"),
+            ("styled", "retimed"), ("shifted", "retimed")
+        ]
+        assert all(pair.exact for pair in found)
+        assert ("original", "edited") in [
+            pair[:2] for pair in index.duplicates(threshold=0.6)
+        ]
+
+    def test_duplicateindex_similar(self, index, library):
+        found = index.similar(fingerprint.fingerprint(library["original"]))
+        assert found[:3] == [
+            ("original", 1.0), ("styled", 1.0), ("shifted", 1.0)
+        ]
+        assert found[3][0] == "retimed" and found[3][1] < 0.8
+        assert len(found) == 4
+        with pytest.raises(ValueError):
+            DuplicateIndex(bands=3)
+
+    def test_duplicateindex_across_formats(self, mocker):
+        mocker.patch(
+            "builtins.open",
+            mocker.mock_open(
+                read_data="1\n00:01:00,000 --> 00:01:03,000\n"
+                "<b>Line 01</b>|Line 02\n\n"
+                "2\n00:01:03,300 --> 00:01:05,400\nLine 03\n\n"
+            )
+        )
+        subrip = sublib.SubRip("file.srt", "utf-8")
+        mocker.patch(
+            "builtins.open",
+            mocker.mock_open(
+                read_data="{1440}{1512}{y:b}Line 01|Line 02\n"
+                "{1519}{1570}Line 03\n"
+            )
+        )
+        microdvd = sublib.MicroDVD("file.sub", "utf-8")
+        build = mocker.spy(sublib.sublib, "fingerprint")
+        index = DuplicateIndex()
+        index.add_subtitle(subrip)
+        index.add_subtitle(microdvd)
+        assert subrip.fingerprint() is subrip.fingerprint()
+        assert build.call_count == 2
+        assert index.duplicates() == [
+            Duplicate("file.srt", "file.sub", 1.0, True)
+        ]
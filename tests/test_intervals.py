@@ -0,0 +1,85 @@
+import datetime
+import random
+import time
+
+import sublib
+from sublib.intervals import CueIndex
+
+
+class TestCueIndexClass:
+
+    lines = [
+        [1000, 5000, "Long"],
+        [2000, 3000, "Inner"],
+        [3000, 4000, "Next"],
+        [0, 500, "First"],
+        [6000, 6000, "Empty"]
+    ]
+
+    def test_cueindex_at(self):
+        index = CueIndex(self.lines)
+        assert len(index) == 5
+        assert index.at(0) == [3]
+        assert index.at(500) == []
+        assert index.at(datetime.timedelta(seconds=2)) == [0, 1]
+        assert index.at(3000) == [0, 2]
+        assert index.at(6000) == []
+
+    def test_cueindex_between(self):
+        index = CueIndex(self.lines)
+        assert index.between(400, 2000) == [0, 3]
+        assert index.between(2500, 3500) == [0, 1, 2]
+        assert index.between(5000, 7000) == [4]
+        assert index.between(7000, 8000) == []
+
+    def test_cueindex_matches_linear_scan(self):
+        generator = random.Random(1)
+        lines = []
+        for _ in range(500):
+            start = generator.randrange(100000)
+            lines.append([start, start + generator.randrange(1, 5000), ""])
+        index = CueIndex(lines)
+        for _ in range(200):
+            start = generator.randrange(-1000, 110000)
+            end = start + generator.randrange(1, 3000)
+            assert index.at(start) == [
+                num for num, line in enumerate(lines)
+                if line[0] <= start < line[1]
+            ]
+            assert index.between(start, end) == [
+                num for num, line in enumerate(lines)
+                if line[0] < end and line[1] > start
+            ]
+
+    def test_cueindex_spanning_line(self):
+        lines = [[0, 10 ** 9, "Spanning"]] + [
+            [1000 * n, 1000 * n + 500, f"Line {n}"] for n in range(1, 50001)
+        ]
+        index = CueIndex(lines)
+        assert index.at(30000200) == [0, 30000]
+        assert index.at(30000700) == [0]
+        assert index.between(30000700, 30002100) == [0, 30001, 30002]
+        started = time.perf_counter()
+        for n in range(1000):
+            index.at(40000000 + n)
+        assert time.perf_counter() - started < 0.5
+
+    def test_subtitle_index_is_cached(self, mocker):
+        mocker.patch(
+            "builtins.open",
+            mocker.mock_open(
+                read_data="00:01:00:Line 01\n00:01:03:Line 02\n"
+            )
+        )
+        subtitle = sublib.TMPlayer("file.txt", "utf-8")
+        index = subtitle.index()
+        assert subtitle.index() is index
+        assert subtitle.at(datetime.timedelta(seconds=63.5)) == [[
+            datetime.timedelta(seconds=63),
+            datetime.timedelta(seconds=64),
+            "Line 02"
+        ]]
+        assert len(subtitle.between(0, 120000)) == 2
+        subtitle.set_from_general_format([[0, 1000, "New"]])
+        assert subtitle.index() is not index
+        assert subtitle.at(500)[0][2] == "New"
@@ -0,0 +1,94 @@
+import datetime
+
+import pytest
+import sublib
+from sublib.mapped import MappedTrack
+
+
+class TestMappedTrackClass:
+
+    data = {
+        "srt": "﻿1\r\n"
+               "00:01:00,000 --> 00:01:03,000\r\n"
+               "<i>Line 01</i>\r\n"
+               "Line 02\r\n\r\n"
+               "2\n00:01:03,272 --> 00:01:05,440 X1:10\n"
+               "Żółw 03\n",
+        "mpl": "[600][630] Line 01|Line 02\n"
+               "[632][654]Żółw 03\n",
+        "sub": "{1}{1}25.000\n"
+               "{1500}{1575}{y:i}Line 01|Line 02\n"
+               "{1581}{1636}Żółw 03",
+        "tmp": "00:01:00:Line 01|Line 02\n"
+               "00:01:03:Żółw 03\n"
+    }
+
+    @pytest.fixture(params=sorted(data))
+    def path(self, request, tmp_path):
+        path = tmp_path / f"file.{request.param}"
+        path.write_text(self.data[request.param], encoding="utf-8")
+        return str(path)
+
+    def test_mappedtrack_matches_parser(self, path):
+        expected = sublib.FORMATS[path[-3:]](path, "utf-8")
+        with MappedTrack(path) as track:
+            assert track.format == path[-3:]
+            assert len(track) == 2
+            assert track[1][2] == "Żółw 03"
+            assert track.table() == expected.get_general_format()
+
+    def test_mappedtrack_raw_text(self, tmp_path):
+        path = tmp_path / "file.srt"
+        path.write_text(self.data["srt"], encoding="utf-8")
+        with MappedTrack(str(path)) as track:
+            raw = track.raw(0)
+            assert isinstance(raw, memoryview)
+            assert raw.tobytes() == b"<i>Line 01</i>\r\nLine 02"
+            assert track.text(0) == "Line 01|Line 02"
+            assert track[-1][1] == datetime.timedelta(
+                seconds=65, microseconds=440000
+            )
+            raw.release()
+
+    def test_mappedtrack_stats(self, tmp_path):
+        path = tmp_path / "file.txt"
+        path.write_text(self.data["mpl"], encoding="utf-8")
+        with MappedTrack(str(path), fmt="mpl") as track:
+            assert track.stats() == {
+                "lines": 2,
+                "first_start": 60000,
+                "last_end": 65400,
+                "total_duration": 5200,
+                "min_duration": 2200,
+                "max_duration": 3000,
+                "mean_duration": 2600.0
+            }
+
+    def test_mappedtrack_fps(self, tmp_path):
+        path = tmp_path / "file.sub"
+        path.write_text(self.data["sub"], encoding="utf-8")
+        with MappedTrack(str(path), fps=50) as track:
+            assert track.starts[0] == 30000
+
+    @pytest.mark.parametrize("encoding", ["utf-8", "cp1250"])
+    def test_mappedtrack_sub_without_header(self, tmp_path, encoding):
+        path = tmp_path / "file.sub"
+        path.write_text("{10}{50}Zażółć\n{60}{90}Line 02\n", encoding=encoding)
+        expected = sublib.MicroDVD(str(path), encoding)
+        with MappedTrack(str(path), encoding) as track:
+            assert track.text(0) == "Zażółć"
+            assert track.table() == expected.get_general_format()
+
+    def test_mappedtrack_empty_end_frame(self, tmp_path):
+        path = tmp_path / "file.sub"
+        path.write_text("{1440}{}Line 01\n{1517}{1569}Line 02\n")
+        expected = sublib.MicroDVD(str(path), "utf-8", fps=24)
+        with MappedTrack(str(path), fps=24) as track:
+            assert track.ends[0] == 61000
+            assert track.table() == expected.get_general_format()
+
+    def test_mappedtrack_unsupported(self, tmp_path):
+        path = tmp_path / "file.txt"
+        path.write_text("", encoding="utf-8")
+        with pytest.raises(ValueError):
+            MappedTrack(str(path))
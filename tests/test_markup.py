@@ -0,0 +1,49 @@
+import io
+
+import pytest
+import sublib
+from sublib import markup
+from sublib.markup import Span
+
+
+class TestMarkupModule:
+
+    @pytest.mark.parametrize("text, dialect, expected", [
+        ("<i>Line 01</i> and <b>Line 02</b>", "srt", "Line 01 and Line 02"),
+        ('{\\an8}<font color="red">Top</font>', "srt", "Top"),
+        ("1 < 2 > 0|{y:i}", "srt", "1 < 2 > 0|{y:i}"),
+        ("{Y:b}{y:i}Line 01|{c:$0000FF}Line 02", "sub", "Line 01|Line 02"),
+        ("{b}Line 01 <i>", "sub", "Line 01 <i>"),
+        ("<i>Line 01</i>", "tmp", "<i>Line 01</i>")
+    ])
+    def test_markup_strip(self, text, dialect, expected):
+        assert markup.strip(text, dialect) == expected
+        assert markup.spans(text, dialect)[0] == expected
+
+    def test_markup_srt_spans(self):
+        text = '{\\an8}<font color="red">Top</font>|<b>x<I>y</i></b>|<u>z'
+        assert markup.spans(text, "srt") == ("Top|xy|z", [
+            Span(0, 3, "font", 'color="red"'),
+            Span(0, 8, "override", "an8"),
+            Span(4, 6, "b", ""),
+            Span(5, 6, "i", ""),
+            Span(7, 8, "u", "")
+        ])
+
+    def test_markup_microdvd_spans(self):
+        text = "{Y:b}Line 01|{y:i}{c:$0000FF}Line 02|Line 03"
+        assert markup.spans(text, "sub") == ("Line 01|Line 02|Line 03", [
+            Span(0, 23, "y", "b"),
+            Span(8, 15, "c", "$0000FF"),
+            Span(8, 15, "y", "i")
+        ])
+
+    def test_markup_iter_cues_spans(self):
+        subtitle = sublib.SubRip()
+        data = "1\n00:01:00,000 --> 00:01:03,000\n<i>Line 01</i>\nLine 02\n\n"
+        line = next(subtitle.iter_cues(io.StringIO(data), spans=True))
+        assert line[2:] == ["Line 01|Line 02", [Span(0, 7, "i", "")]]
+        line = next(sublib.MPlayer2().iter_cues(
+            io.StringIO("[0][10] <i>Line</i>\n"), spans=True
+        ))
+        assert line[2:] == ["<i>Line</i>", []]
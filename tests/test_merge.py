@@ -0,0 +1,99 @@
+import datetime
+
+import pytest
+import sublib
+from sublib.merge import merge, merge_to
+
+
+class TestMerge:
+
+    english = [
+        [0, 2000, "Hello."],
+        [3000, 5000, "Where were you?"],
+        [9000, 10000, "Bye."]
+    ]
+
+    polish = [
+        [100, 1900, "Cześć."],
+        [3000, 5200, "Gdzie byłeś?"],
+        [6000, 7000, "W domu."]
+    ]
+
+    @staticmethod
+    def ms(lines):
+        return [
+            [start // datetime.timedelta(milliseconds=1),
+             end // datetime.timedelta(milliseconds=1), text]
+            for start, end, text in lines
+        ]
+
+    def test_merge_by_time(self):
+        merged = list(merge(self.english, sublib.CueTable(self.polish)))
+        assert self.ms(merged) == [
+            [0, 2000, "Hello."],
+            [100, 1900, "Cześć."],
+            [3000, 5000, "Where were you?"],
+            [3000, 5200, "Gdzie byłeś?"],
+            [6000, 7000, "W domu."],
+            [9000, 10000, "Bye."]
+        ]
+        assert isinstance(merged[0][0], datetime.timedelta)
+
+    def test_merge_fuse(self):
+        merged = merge(self.polish, self.english, fuse=True)
+        assert self.ms(merged) == [
+            [0, 2000, "Cześć.|Hello."],
+            [3000, 5200, "Gdzie byłeś?|Where were you?"],
+            [6000, 7000, "W domu."],
+            [9000, 10000, "Bye."]
+        ]
+        chained = [[0, 1000, "A"], [900, 2000, "B"], [1900, 3000, "C"]]
+        assert self.ms(merge(chained, [[500, 600, "x"]], fuse=True)) == [
+            [0, 3000, "A|B|C|x"]
+        ]
+        assert list(merge(fuse=True)) == []
+
+    def test_merge_unsorted(self):
+        with pytest.raises(ValueError):
+            list(merge(self.english, self.polish[::-1]))
+
+    def test_merge_to(self, mocker, tmp_path):
+        mocker.patch(
+            "builtins.open",
+            mocker.mock_open(read_data="[0][20] Hello.\n[90][100] Bye.\n")
+        )
+        subtitle = sublib.MPlayer2("file.txt", "utf-8")
+        mocker.stopall()
+        target = tmp_path / "merged.srt"
+        count = merge_to(
+            [subtitle, self.polish], str(target), "srt", fuse=True
+        )
+        assert count == 4
+        assert target.read_text(encoding="utf-8") == (
+            "1\n00:00:00,000 --> 00:00:02,000\nHello.\nCześć.\n\n"
+            "2\n00:00:03,000 --> 00:00:05,200\nGdzie byłeś?\n\n"
+            "3\n00:00:06,000 --> 00:00:07,000\nW domu.\n\n"
+            "4\n00:00:09,000 --> 00:00:10,000\nBye.\n\n"
+        )
+
+    def test_merge_paths(self, tmp_path):
+        first, second = tmp_path / "first.txt", tmp_path / "second.sub"
+        first.write_text("[0][20] Hello.\n", encoding="utf-8")
+        second.write_text("{0}{25}Cześć.\n", encoding="utf-8")
+        merged = merge(str(first), str(second), fuse=True)
+        assert [line[2] for line in merged] == ["Hello.|Cześć."]
+
+    def test_merge_paths_stream(self, tmp_path, mocker):
+        path = tmp_path / "first.sub"
+        path.write_bytes("{1}{1}25\n{0}{25}Zażółć\n".encode("cp1250"))
+        read = mocker.spy(sublib.sublib, "_content")
+        parse = mocker.spy(sublib.MicroDVD, "_parse")
+        merged = merge(str(path), self.english)
+        assert self.ms(merged)[:2] == [
+            [0, 1000, "Zażółć"], [0, 2000, "Hello."]
+        ]
+        assert hasattr(parse.call_args[0][1], "read")
+        assert read.call_count == 0
+        (tmp_path / "notes.txt").write_text("Not a subtitle\n")
+        with pytest.raises(ValueError):
+            list(merge(str(tmp_path / "notes.txt")))
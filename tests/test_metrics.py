@@ -0,0 +1,90 @@
+import io
+
+import pytest
+import sublib
+from sublib import metrics
+
+
+class TestMetricsModule:
+
+    srt_data = (
+        "1\n00:01:00,000 --> 00:01:03,000\n<i>Line 01</i>\n\n"
+        "2\n00:01:04,000 --> 00:01:05,000\nLine 02\n\n"
+    )
+
+    @pytest.fixture
+    def source(self, tmp_path):
+        path = tmp_path / "file.srt"
+        path.write_text(self.srt_data, encoding="utf-8")
+        return str(path)
+
+    def test_metrics_disabled(self):
+        lines = iter([1, 2])
+        assert metrics.iterate("parse", "SubRip", lines) is lines
+        assert metrics.stage("read") is metrics.stage("write")
+
+    def test_metrics_collect_stages(self, source):
+        with metrics.collect() as collected:
+            subtitle = sublib.SubRip(source, "utf-8")
+            subtitle.get_general_format()
+            subtitle.write_to(io.StringIO())
+        stages = collected.as_dict()
+        assert stages["read"]["SubRip"]["bytes"] == len(self.srt_data)
+        assert stages["parse"]["SubRip"]["cues"] == 2
+        assert stages["write"]["SubRip"]["calls"] == 1
+        assert not metrics._hooks
+
+    def test_metrics_convert(self, source, tmp_path):
+        target = str(tmp_path / "file.txt")
+        with metrics.collect() as collected:
+            sublib.convert(source, target, "tmp")
+        stages = collected.as_dict()
+        assert stages["detect"][""]["cues"] == 2
+        assert stages["convert"]["SubRip"]["cues"] == 2
+        assert stages["parse"]["SubRip"]["cues"] == 2
+        assert stages["write"]["TMPlayer"]["cues"] == 2
+        assert all(
+            totals["seconds"] >= 0
+            for formats in stages.values() for totals in formats.values()
+        )
+
+    def test_metrics_errors(self):
+        def broken():
+            yield 1
+            raise ValueError
+
+        with metrics.collect() as collected:
+            with pytest.raises(ValueError):
+                list(metrics.iterate("parse", "SubRip", broken()))
+            with pytest.raises(KeyError):
+                with metrics.stage("write", "SubRip"):
+                    raise KeyError
+        stages = collected.as_dict()
+        assert stages["parse"]["SubRip"]["cues"] == 1
+        assert stages["parse"]["SubRip"]["errors"] == 1
+        assert stages["write"]["SubRip"]["errors"] == 1
+
+    def test_metrics_hooks(self, mocker):
+        hook = mocker.Mock()
+        metrics.add_hook(hook)
+        try:
+            with metrics.stage("render", "MicroDVD") as record:
+                record.add(cues=3)
+        finally:
+            metrics.remove_hook(hook)
+        name, fmt, _, cues, size, errors = hook.call_args[0]
+        assert (name, fmt, cues, size, errors) == ("render", "MicroDVD",
+                                                   3, 0, 0)
+
+    def test_metrics_prometheus(self):
+        collected = metrics.Metrics()
+        collected("parse", "SubRip", 0.5, 10, 0, 0)
+        collected("parse", "SubRip", 0.25, 5, 0, 1)
+        text = collected.to_prometheus()
+        assert "# TYPE sublib_stage_seconds_total counter" in text
+        assert 'sublib_stage_seconds_total{stage="parse",format="SubRip"}'\
+               ' 0.75' in text
+        assert 'sublib_stage_cues_total{stage="parse",format="SubRip"}'\
+               ' 15' in text
+        collected.reset()
+        assert collected.as_dict() == {}
@@ -1,5 +1,6 @@
 import builtins
 import datetime
+import fractions
 
 import pytest
 import pytest_mock
@@ -49,3 +50,68 @@ class TestMicroDVDClass:
         subtitle = sublib.MicroDVD()
         subtitle.set_from_general_format(self.general_lines)
         assert test_data == subtitle.content
+
+    def test_microdvd_header_sets_fps(self, mocker):
+        test_data = "{1}{1}25.000\n"\
+                    "{1500}{1575}Line 01|Line 02\n"
+        mocker.patch(
+            "builtins.open",
+            mocker.mock_open(read_data=test_data)
+        )
+        subtitle = sublib.MicroDVD("file.txt", "utf-8")
+        assert subtitle.get_general_format() == [[
+            datetime.timedelta(seconds=60),
+            datetime.timedelta(seconds=63),
+            'Line 01|Line 02'
+        ]]
+        assert subtitle.fps == 25
+        assert subtitle.header
+        subtitle.set_from_general_format(subtitle.get_general_format())
+        assert subtitle.content == ["{1}{1}25.000", "{1500}{1575}Line 01|Line 02"]
+
+    def test_microdvd_empty_end_frame(self, mocker):
+        mocker.patch(
+            "builtins.open",
+            mocker.mock_open(
+                read_data="{1440}{}Line 01\n{1517}{1569}Line 02\n"
+            )
+        )
+        subtitle = sublib.MicroDVD("file.txt", "utf-8", fps=24)
+        assert subtitle.get_general_format() == [
+            [
+                datetime.timedelta(seconds=60),
+                datetime.timedelta(seconds=61),
+                "Line 01"
+            ],
+            [
+                datetime.timedelta(seconds=63, microseconds=208000),
+                datetime.timedelta(seconds=65, microseconds=375000),
+                "Line 02"
+            ]
+        ]
+
+    def test_microdvd_fps_parameter_overrides_header(self, mocker):
+        test_data = "{1}{1}25.000\n"\
+                    "{1500}{1575}Line 01|Line 02\n"
+        mocker.patch(
+            "builtins.open",
+            mocker.mock_open(read_data=test_data)
+        )
+        subtitle = sublib.MicroDVD("file.txt", "utf-8", fps=50)
+        assert subtitle.get_general_format()[0][1] == datetime.timedelta(
+            seconds=31, microseconds=500000
+        )
+        assert subtitle.fps == 50
+
+    @pytest.mark.parametrize("fps", [23.976, 25, fractions.Fraction(24000, 1001)])
+    def test_microdvd_round_trip_is_lossless(self, fps):
+        test_data = [
+            f"{{{frame}}}{{{frame + 7}}}Line"
+            for frame in range(0, 200000, 997)
+        ]
+        subtitle = sublib.MicroDVD(fps=fps)
+        subtitle.content = test_data
+        subtitle.set_from_general_format(subtitle.get_general_format())
+        assert subtitle.content == [
+            f"{{1}}{{1}}{float(fps):.3f}"
+        ] + test_data
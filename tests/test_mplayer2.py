@@ -49,3 +49,9 @@ class TestMPlayer2Class:
         subtitle = sublib.MPlayer2()
         subtitle.set_from_general_format(self.general_lines)
         assert test_data == subtitle.content
+
+    def test_mplayer2_set_from_general_format_keeps_lines(self):
+        lines = [list(line) for line in self.general_lines]
+        subtitle = sublib.MPlayer2()
+        subtitle.set_from_general_format(lines)
+        assert lines == self.general_lines
@@ -0,0 +1,90 @@
+import datetime
+
+import pytest
+import sublib
+from sublib.search import Hit, MappedTextIndex, TextIndex
+
+
+class TestTextIndexClass:
+
+    pilot = [
+        [0, 1000, "Where were you|last night?"],
+        [2000, 3000, "I was at <b>home</b>."],
+        [4000, 5000, "Night night, you."]
+    ]
+
+    finale = [
+        [1000, 2000, "You were at home last night"],
+        [3000, 4000, "Home, sweet home"]
+    ]
+
+    @pytest.fixture
+    def index(self):
+        index = TextIndex()
+        index.add(self.pilot, "pilot")
+        other = TextIndex()
+        other.add(self.finale, "finale")
+        index.merge(other)
+        return index
+
+    def test_textindex_search_words(self, index):
+        assert len(index) == 2
+        assert index.search("HOME") == [
+            Hit("pilot", 1, datetime.timedelta(seconds=2)),
+            Hit("finale", 0, datetime.timedelta(seconds=1)),
+            Hit("finale", 1, datetime.timedelta(seconds=3))
+        ]
+        assert index.search("missing") == []
+        assert index.search("...") == []
+
+    def test_textindex_search_phrase(self, index):
+        assert [hit[:2] for hit in index.search("last night")] == [
+            ("pilot", 0), ("finale", 0)
+        ]
+        assert [hit[:2] for hit in index.search("night you")] == [
+            ("pilot", 2)
+        ]
+        assert index.search("home night") == []
+
+    def test_textindex_from_subtitle(self, mocker):
+        mocker.patch(
+            "builtins.open",
+            mocker.mock_open(read_data="00:01:00:Line 01|Line 02\n")
+        )
+        subtitle = sublib.TMPlayer("file.txt", "utf-8")
+        index = TextIndex.from_subtitle(subtitle)
+        assert index.search("line 02") == [
+            Hit("file.txt", 0, datetime.timedelta(seconds=60))
+        ]
+
+    def test_mappedtextindex(self, index, tmp_path):
+        path = str(tmp_path / "library.idx")
+        index.save(path)
+        mapped = MappedTextIndex(path)
+        assert mapped.tracks == ["pilot", "finale"]
+        for query in ("home", "last night", "you", "zzz", "a"):
+            assert mapped.search(query) == index.search(query)
+        merged = TextIndex()
+        merged.merge(mapped)
+        merged.merge(mapped)
+        assert len(merged.search("sweet")) == 2
+        with pytest.raises(TypeError):
+            mapped.add([], "track")
+        mapped.close()
+
+    def test_mappedtextindex_rejects_other_files(self, tmp_path):
+        path = tmp_path / "file.srt"
+        path.write_bytes(b"1\n00:00:00,000 --> 00:00:01,000\nText\n\n")
+        with pytest.raises(ValueError):
+            MappedTextIndex(str(path))
+
+    def test_mappedtextindex_truncated(self, index, tmp_path, mocker):
+        path = tmp_path / "library.idx"
+        index.save(str(path))
+        data = path.read_bytes()
+        close = mocker.spy(MappedTextIndex, "close")
+        for size in range(1, len(data)):
+            path.write_bytes(data[:size])
+            with pytest.raises(ValueError):
+                MappedTextIndex(str(path))
+        assert close.call_count == len(data) - 1
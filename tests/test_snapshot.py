@@ -0,0 +1,107 @@
+import pickle
+import threading
+from datetime import timedelta
+
+import pytest
+import sublib
+from sublib.cuetable import CueTable
+from sublib.snapshot import TrackSnapshot
+
+
+def line(n: int, text: str = "") -> list:
+    return [
+        timedelta(seconds=n), timedelta(seconds=n + 1), text or f"Line {n}"
+    ]
+
+
+class TestTrackSnapshotClass:
+
+    @pytest.fixture(autouse=True)
+    def small_chunks(self, mocker):
+        mocker.patch("sublib.snapshot.CHUNK_SIZE", 4)
+
+    @pytest.fixture
+    def lines(self):
+        return [line(n) for n in range(10)]
+
+    def test_snapshot_sequence(self, lines):
+        track = TrackSnapshot(lines)
+        assert len(track) == 10
+        assert track[3] == lines[3]
+        assert track[-1] == lines[-1]
+        assert track == lines
+        assert track[2:7] == lines[2:7]
+        assert track[::4] == lines[::4]
+        assert track[8:2] == []
+        assert repr(track) == "TrackSnapshot(lines=10)"
+        with pytest.raises(IndexError):
+            track[10]
+
+    def test_snapshot_hash(self, lines):
+        track = TrackSnapshot(lines)
+        same = TrackSnapshot(CueTable(lines[1:])).insert(0, lines[:1])
+        assert len(same._chunks) != len(track._chunks)
+        assert track == same and hash(track) == hash(same)
+        assert {track: 1}[same] == 1
+        assert track != track.set(0, line(0, "Other"))
+        assert pickle.loads(pickle.dumps(track)) == track
+
+    def test_snapshot_copy_on_write(self, lines):
+        track = TrackSnapshot(lines)
+        edited = track.set(5, line(5, "Edited"))
+        assert track[5] == lines[5]
+        assert edited[5][2] == "Edited"
+        assert edited._chunks[0] is track._chunks[0]
+        assert edited._chunks[2] is track._chunks[2]
+        assert track[4:8]._chunks[0] is track._chunks[1]
+
+    @pytest.mark.parametrize("edit, expected", [
+        (lambda t: t.insert(0, [line(99)]), lambda l: [line(99)] + l),
+        (
+            lambda t: t.insert(6, [line(99)]),
+            lambda l: l[:6] + [line(99)] + l[6:]
+        ),
+        (lambda t: t.delete(-1), lambda l: l[:-1]),
+        (lambda t: t.delete(3, 9), lambda l: l[:3] + l[9:]),
+        (lambda t: t.replace(2, 5, []), lambda l: l[:2] + l[5:]),
+        (
+            lambda t: t.replace(7, 100, [line(99)]),
+            lambda l: l[:7] + [line(99)]
+        ),
+        (lambda t: t.append([line(99)]), lambda l: l + [line(99)])
+    ])
+    def test_snapshot_edits(self, lines, edit, expected):
+        track = TrackSnapshot(lines)
+        assert edit(track) == expected(lines)
+        assert track == lines
+
+    def test_snapshot_tables(self, lines):
+        track = TrackSnapshot(lines)
+        table = track.to_table()
+        table.append(line(10))
+        assert len(track) == 10
+        assert CueTable(track) == lines
+        subtitle = sublib.MPlayer2()
+        subtitle.set_from_general_format(track)
+        assert subtitle.snapshot() == track
+        assert subtitle.snapshot() is subtitle.snapshot()
+
+    def test_snapshot_threads(self, lines):
+        track = TrackSnapshot(lines)
+        results = []
+
+        def work(n):
+            results.append(track.set(n, line(n, "Thread"))[n][2])
+
+        threads = [threading.Thread(target=work, args=(n,)) for n in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert results == ["Thread"] * 8
+        assert track == lines
+
+    def test_subtitle_content_not_shared(self):
+        subtitle = sublib.SubRip()
+        subtitle.content.append("1")
+        assert sublib.SubRip().content == []
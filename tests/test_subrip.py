@@ -1,5 +1,6 @@
 import builtins
 import datetime
+import io
 
 import pytest
 import pytest_mock
@@ -47,6 +48,32 @@ class TestSubRipClass:
         subtitle = sublib.SubRip("file.txt", "utf-8")
         assert self.general_lines == subtitle.get_general_format()
 
+    def test_subrip_iter_cues_from_file_object(self):
+        test_data = "1\r\n"\
+                    "00:01:00,000 --> 00:01:03,000\r\n"\
+                    "Line 01\r\n"\
+                    "Line 02\r\n\r\n"\
+                    "2\n00:01:03,272 --> 00:01:05,440\n"\
+                    "Line 03\n"\
+                    "Line 04\n\n\n"\
+                    "3\n"\
+                    "00:01:05,607 --> 00:01:06,775\n"\
+                    "<b>Line 05</b>"
+        subtitle = sublib.SubRip()
+        cues = subtitle.iter_cues(io.StringIO(test_data))
+        assert next(cues) == self.general_lines[0]
+        assert list(cues) == self.general_lines[1:]
+
+    def test_subrip_iter_cues_from_path(self, tmp_path):
+        path = tmp_path / "file.srt"
+        path.write_text(
+            "1\n00:01:05,607 --> 00:01:06,775\nLine 05\n\n",
+            encoding="utf-8"
+        )
+        subtitle = sublib.SubRip(encoding="utf-8")
+        assert list(subtitle.iter_cues(str(path))) == self.general_lines[2:]
+        assert subtitle.content == []
+
     def test_subrip_set_from_general_format(self):
         test_data = [
             "1\n"
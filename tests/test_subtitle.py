@@ -1,4 +1,6 @@
 import builtins
+import datetime
+import io
 
 import pytest
 import pytest_mock
@@ -21,6 +23,16 @@ class TestSubtitleClass:
         )
         return sublib.Subtitle("file.txt", "utf-8")
 
+    @pytest.fixture
+    def subtitle_srt(self):
+        subtitle = sublib.SubRip()
+        subtitle.content = [
+            "1", "00:01:00,000 --> 00:01:03,000", "Line 01", "\n",
+            "2", "00:01:04,000 --> 00:01:05,000", "Line 02", "\n",
+            "3", "00:01:06,000 --> 00:01:08,000", "Line 03", "\n"
+        ]
+        return subtitle
+
     def test_subtitle__init__(self, subtitle_empty, subtitle_valid):
         subtitle_1 = subtitle_empty
         subtitle_2 = subtitle_valid
@@ -60,20 +72,138 @@ class TestSubtitleClass:
         assert len(subtitle_1) == 0
         assert len(subtitle_2) == 2
 
+    def test_subtitle__len__parsed(self, subtitle_srt):
+        assert len(sublib.SubRip()) == 0
+        assert len(subtitle_srt) == 3
+
+    def test_subtitle_set_from_general_format_read_back(self, subtitle_srt):
+        general = subtitle_srt.get_general_format()
+        for cls in (sublib.MPlayer2, sublib.SubRip,
+                    sublib.MicroDVD, sublib.TMPlayer):
+            subtitle = cls()
+            subtitle.set_from_general_format(general)
+            assert len(subtitle) == 3
+            assert [line[2] for line in subtitle.get_general_format()] == [
+                "Line 01", "Line 02", "Line 03"
+            ]
+            assert subtitle[1][2] == "Line 02"
+
+    def test_subtitle__getitem__(self, subtitle_srt, mocker):
+        parse = mocker.spy(subtitle_srt, "_parse")
+        assert subtitle_srt[1] == [
+            datetime.timedelta(seconds=64),
+            datetime.timedelta(seconds=65),
+            "Line 02"
+        ]
+        assert subtitle_srt[-1][2] == "Line 03"
+        assert subtitle_srt[1:] == subtitle_srt.get_general_format()[1:]
+        assert [line[2] for line in subtitle_srt[::2]] == [
+            "Line 01", "Line 03"
+        ]
+        with pytest.raises(IndexError):
+            subtitle_srt[3]
+        assert parse.call_count == 2
+
     def test_subtitle__contains__(self, subtitle_valid):
         subtitle = subtitle_valid
         assert "line" not in subtitle
         assert "Line" in subtitle
+        assert subtitle.__contains__("line") is False
 
-    def test_subtitle__iter__(self, subtitle_valid):
-        subtitle = subtitle_valid
-        assert iter(subtitle) == subtitle
-        assert hasattr(subtitle, "__line__")
+    def test_subtitle__iter__content(self, subtitle_valid):
+        assert list(subtitle_valid) == ["Line 01", "Line 02"]
+        assert subtitle_valid[-1] == "Line 02"
 
-    def test_subtitle__next__(self, subtitle_valid):
-        subtitle = subtitle_valid
-        iter(subtitle)
-        assert next(subtitle) == "Line 01"
-        assert next(subtitle) == "Line 02"
-        with pytest.raises(IndexError):
-            assert next(subtitle)
+    def test_subtitle__iter__(self, subtitle_srt):
+        first, second = iter(subtitle_srt), iter(subtitle_srt)
+        assert next(first)[2] == "Line 01"
+        assert next(first)[2] == "Line 02"
+        assert next(second)[2] == "Line 01"
+        assert [line[2] for line in first] == ["Line 03"]
+        with pytest.raises(StopIteration):
+            next(first)
+        assert list(subtitle_srt) == subtitle_srt.get_general_format()
+
+    def test_subtitle_write_to(self, mocker):
+        mocker.patch(
+            "builtins.open",
+            mocker.mock_open(
+                read_data="1\n00:01:00,000 --> 00:01:03,000\nLine 01\n\n"
+            )
+        )
+        subtitle_1 = sublib.SubRip("file.txt", "utf-8")
+        subtitle_2 = sublib.SubRip()
+        subtitle_2.set_from_general_format(subtitle_1.get_general_format())
+        text, binary = io.StringIO(), io.BytesIO()
+        subtitle_1.write_to(text)
+        subtitle_2.write_to(binary)
+        assert text.getvalue() == binary.getvalue().decode() == \
+            "1\n00:01:00,000 --> 00:01:03,000\nLine 01\n\n"
+
+    def test_subtitle_save(self, tmp_path):
+        subtitle = sublib.MPlayer2()
+        subtitle.content = ["[601][631] Line 01", "[633][654] Łine 02"]
+        subtitle.save(str(tmp_path / "file.txt"), "cp1250", newline="\r\n")
+        assert (tmp_path / "file.txt").read_bytes() == \
+            "[601][631] Line 01\r\n[633][654] Łine 02\r\n".encode("cp1250")
+
+    def test_subtitle_write_cues(self, tmp_path):
+        lines = (
+            [
+                datetime.timedelta(seconds=n),
+                datetime.timedelta(seconds=n + 1),
+                f"Line {n}"
+            ]
+            for n in range(3)
+        )
+        subtitle = sublib.TMPlayer(encoding="utf-8")
+        assert subtitle.write_cues(lines, str(tmp_path / "file.txt")) == 3
+        assert subtitle.content == []
+        assert (tmp_path / "file.txt").read_text() == \
+            "00:00:00:Line 0\n00:00:01:Line 1\n00:00:02:Line 2\n"
+
+    @pytest.mark.parametrize("fmt", ["mpl", "srt", "sub", "tmp"])
+    def test_subtitle_get_general_format_workers(self, fmt, tmp_path, mocker):
+        path = str(tmp_path / "file")
+        lines = [
+            [
+                datetime.timedelta(seconds=2 * n),
+                datetime.timedelta(seconds=2 * n + 1),
+                f"<i>Line {n}</i>|{{y:i}}Line"
+            ]
+            for n in range(200)
+        ]
+        writer = sublib.MicroDVD(fps=25) if fmt == "sub" \
+            else sublib.FORMATS[fmt]()
+        writer.write_cues(lines, path, "utf-8")
+        mocker.patch("sublib.sublib._CHUNK_LINES", 10)
+        subtitle = sublib.FORMATS[fmt](path, "utf-8")
+        chunks = subtitle._chunks(3)
+        assert len(chunks) == 12
+        assert sum(chunks, []) == subtitle.content
+        parallel = subtitle.get_general_format(workers=3)
+        assert parallel == sublib.FORMATS[fmt](path, "utf-8")\
+            .get_general_format()
+        assert len(parallel) == 200
+        assert len(subtitle._chunks(1)) == 1
+
+    def test_subtitle_get_general_format_workers_error(self, tmp_path,
+                                                       mocker):
+        path = tmp_path / "file.txt"
+        lines = [f"00:00:{n % 60:02}:Line {n}\n" for n in range(200)]
+        lines[150] = "Broken line\n"
+        path.write_text("".join(lines), encoding="utf-8")
+        mocker.patch("sublib.sublib._CHUNK_LINES", 10)
+        subtitle = sublib.TMPlayer(str(path), "utf-8")
+        with pytest.raises(IndexError, match="line #150 ") as serial:
+            subtitle.get_general_format()
+        with pytest.raises(IndexError) as parallel:
+            subtitle.get_general_format(workers=3)
+        assert str(parallel.value) == str(serial.value)
+
+    def test_subtitle_boundary(self):
+        subtitle = sublib.SubRip()
+        lines = ["1", "00:00:01,000 --> 00:00:02,000", "Line", "\n", "2"]
+        assert subtitle._boundary(lines, 1) == 4
+        assert subtitle._boundary(lines, 4) == 5
+        assert sublib.MPlayer2()._boundary(lines, 1) == 1
@@ -0,0 +1,36 @@
+import datetime
+
+from sublib import timestamp
+
+
+class TestTimestampCodec:
+
+    def test_to_ms_and_from_ms(self):
+        delta = datetime.timedelta(hours=1, seconds=5, microseconds=607999)
+        assert timestamp.to_ms(delta) == 3605607
+        assert timestamp.to_ms(3605607) == 3605607
+        assert timestamp.from_ms(3605607) == datetime.timedelta(
+            hours=1, seconds=5, microseconds=607000
+        )
+
+    def test_srt_timestamps(self):
+        assert timestamp.parse_srt("01:02:03,045") == 3723045
+        assert timestamp.parse_srt("01:02:03.045") == 3723045
+        assert timestamp.parse_srt("00:00:01,5") == 1500
+        assert timestamp.parse_srt("00:00:01") == 1000
+        assert timestamp.format_srt(3723045) == "01:02:03,045"
+        assert timestamp.format_srt(0) == "00:00:00,000"
+
+    def test_hms_timestamps(self):
+        assert timestamp.parse_hms("01:02:03") == 3723000
+        assert timestamp.format_hms(3723999) == "01:02:03"
+
+    def test_frames(self):
+        assert timestamp.frames_to_ms(1440, 23.976) == 60060
+        assert timestamp.ms_to_frames(60060, 23.976) == 1440
+        assert timestamp.frames_to_ms(25, 25) == 1000
+
+    def test_deciseconds(self):
+        assert timestamp.deciseconds_to_ms(601) == 60100
+        assert timestamp.ms_to_deciseconds(60149) == 601
+        assert timestamp.ms_to_deciseconds(60151) == 602